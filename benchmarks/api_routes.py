@@ -0,0 +1,462 @@
+"""
+End-to-end benchmark of every `/api/v1` route and the JWKS document.
+
+Builds the real application with `create_app`, seeds a local sqlite database
+(or whatever `DATABASE_URL` points to) and drives each route in-process,
+reporting throughput and latency percentiles per route.
+
+    python -m benchmarks.api_routes
+    python -m benchmarks.api_routes --save-baseline benchmarks/baseline.json
+    python -m benchmarks.api_routes --compare benchmarks/baseline.json
+
+Password hashing routes (login, signup, user creation) run `--hash-requests`
+times, every other route `--requests` times, with `--concurrency` requests in
+flight. Bulk routes send `BULK_SIZE` items per request.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from benchmarks.common import ASGIClient, print_table, summarize
+
+os.environ.setdefault("DEFAULT_USER_ROLE_ID", "2")
+os.environ.setdefault("ACCESS_LOG_SAMPLE_RATE", "0")
+# every request comes from one client IP, the login route must not throttle it
+os.environ.setdefault("THROTTLE_LOGIN_IP_LIMIT", "1000000000")
+
+from project.config import settings  # noqa: E402
+from project.core.asgi import create_app  # noqa: E402
+from project.core.session import engines, session_factory  # noqa: E402
+from project.models import Model, Permission, Role, User  # noqa: E402
+from project.utils.password import DefaultPasswordHelper  # noqa: E402
+
+ADMIN_EMAIL = "admin@benchmark.local"
+ADMIN_PASSWORD = "benchmark-password"
+RESOURCES = ("users", "roles", "permissions")
+ACTIONS = ("create", "read", "update", "delete")
+BULK_SIZE = 5
+# users kept out of the DELETE targets, so bulk updates always find them
+STABLE_USERS = BULK_SIZE
+
+Call = Callable[[], Awaitable[tuple[int, dict[str, str], bytes]]]
+
+
+async def seed(users: int) -> dict[str, Any]:
+    async with engines["writer"].begin() as conn:
+        await conn.run_sync(Model.metadata.drop_all)
+        await conn.run_sync(Model.metadata.create_all)
+
+    hashed_password = DefaultPasswordHelper().hash(ADMIN_PASSWORD)
+    async with session_factory() as session:
+        permissions = [
+            Permission(resource=resource, action=action)
+            for resource in RESOURCES
+            for action in ACTIONS
+        ]
+        admin = Role(name="admin", permissions=permissions)
+        member = Role(name="member", permissions=[])
+        session.add_all([admin, member])
+        await session.flush()
+
+        admin_user = User(
+            email=ADMIN_EMAIL,
+            hashed_password=hashed_password,
+            is_active=True,
+            is_verified=True,
+            role_id=admin.id,
+        )
+        members = [
+            User(
+                email=f"user{idx}@benchmark.local",
+                hashed_password=hashed_password,
+                is_active=True,
+                is_verified=True,
+                role_id=member.id,
+            )
+            for idx in range(users)
+        ]
+        session.add(admin_user)
+        session.add_all(members)
+        await session.commit()
+
+        return {
+            "admin_id": str(admin_user.id),
+            "stable_member_ids": [str(user.id) for user in members[:STABLE_USERS]],
+            # targets for the DELETE routes, user creation hashes too slowly to keep up
+            "member_ids": [str(user.id) for user in members[STABLE_USERS:]],
+            "admin_role_id": admin.id,
+            "member_role_id": member.id,
+            "permission_id": permissions[0].id,
+            "permissions": {
+                permission.id: permission.resource for permission in permissions
+            },
+        }
+
+
+def build_cases(client: ASGIClient, ids: dict[str, Any]) -> dict[str, tuple[Call, bool]]:
+    """
+    Returns `name -> (call, uses_password_hash)` for every API route.
+    """
+    counter = itertools.count()
+    created: dict[str, list[Any]] = {
+        "roles": [],
+        "permissions": [],
+        "users": list(ids["member_ids"]),
+    }
+
+    def track(kind: str, call: Call) -> Call:
+        async def _call():
+            status, headers, body = await call()
+            if status == 200:
+                payload = json.loads(body)
+                created[kind].extend(
+                    item["id"] for item in (payload if isinstance(payload, list) else [payload])
+                )
+            return status, headers, body
+
+        return _call
+
+    def pop(kind: str) -> Any:
+        return created[kind].pop() if created[kind] else 0
+
+    def pop_many(kind: str) -> str:
+        ids = [created[kind].pop() for _ in range(min(BULK_SIZE, len(created[kind])))]
+        return "&".join(f"ids={id}" for id in ids or [0])
+
+    def user_payload(idx: int) -> dict[str, Any]:
+        return {
+            "email": f"new{idx}@benchmark.local",
+            "password": ADMIN_PASSWORD,
+            "is_active": True,
+            "is_verified": True,
+            "role_id": ids["member_role_id"],
+        }
+
+    request = client.request
+    login_form = {"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD}
+    # rotated refresh tokens, one per session; a token is never sent twice, as a
+    # replay would revoke its session, so a worker without one logs in first
+    refresh_tokens: list[str] = []
+    logout_token: list[str] = []
+
+    async def login() -> str:
+        _, _, body = await request("POST", "/api/v1/auth/login", form=login_form)
+        return json.loads(body)["refresh_token"]
+
+    async def refresh():
+        token = refresh_tokens.pop() if refresh_tokens else await login()
+        status, headers, body = await request(
+            "POST", "/api/v1/auth/refresh", json_body={"refresh_token": token}
+        )
+        if status == 200:
+            refresh_tokens.append(json.loads(body)["refresh_token"])
+        return status, headers, body
+
+    async def logout():
+        # logging out an ended session again runs the same queries
+        if not logout_token:
+            logout_token.append(await login())
+        return await request(
+            "POST", "/api/v1/auth/logout", json_body={"refresh_token": logout_token[0]}
+        )
+
+    return {
+        "POST /auth/login": (
+            lambda: request("POST", "/api/v1/auth/login", form=login_form),
+            True,
+        ),
+        "POST /auth/refresh": (refresh, False),
+        "POST /auth/logout": (logout, False),
+        "POST /auth/signup": (
+            lambda: request(
+                "POST", "/api/v1/auth/signup", json_body=user_payload(next(counter))
+            ),
+            True,
+        ),
+        "GET /users/me": (lambda: request("GET", "/api/v1/users/me"), False),
+        "PATCH /users/me": (
+            lambda: request("PATCH", "/api/v1/users/me", json_body={}),
+            False,
+        ),
+        "GET /users/": (lambda: request("GET", "/api/v1/users/?size=50"), False),
+        "GET /users/cursor": (
+            lambda: request("GET", "/api/v1/users/cursor?size=50"),
+            False,
+        ),
+        "GET /users/{id}": (
+            lambda: request("GET", f"/api/v1/users/{ids['admin_id']}"),
+            False,
+        ),
+        "POST /users/": (
+            track(
+                "users",
+                lambda: request("POST", "/api/v1/users/", json_body=user_payload(next(counter))),
+            ),
+            True,
+        ),
+        "PATCH /users/{id}": (
+            lambda: request(
+                "PATCH", f"/api/v1/users/{ids['admin_id']}", json_body={"is_verified": True}
+            ),
+            False,
+        ),
+        "DELETE /users/{id}": (
+            lambda: request("DELETE", f"/api/v1/users/{pop('users')}"),
+            False,
+        ),
+        "POST /users/bulk": (
+            track(
+                "users",
+                lambda: request(
+                    "POST",
+                    "/api/v1/users/bulk",
+                    json_body=[user_payload(next(counter)) for _ in range(BULK_SIZE)],
+                ),
+            ),
+            True,
+        ),
+        "PATCH /users/bulk": (
+            lambda: request(
+                "PATCH",
+                "/api/v1/users/bulk",
+                json_body={id: {"is_verified": True} for id in ids["stable_member_ids"]},
+            ),
+            False,
+        ),
+        "DELETE /users/bulk": (
+            lambda: request("DELETE", f"/api/v1/users/bulk?{pop_many('users')}"),
+            False,
+        ),
+        "GET /roles/": (lambda: request("GET", "/api/v1/roles/"), False),
+        "GET /roles/cursor": (lambda: request("GET", "/api/v1/roles/cursor"), False),
+        "GET /roles/{id}": (
+            lambda: request("GET", f"/api/v1/roles/{ids['member_role_id']}"),
+            False,
+        ),
+        "POST /roles/": (
+            track(
+                "roles",
+                lambda: request("POST", "/api/v1/roles/", json_body={"name": f"role{next(counter)}"}),
+            ),
+            False,
+        ),
+        "PATCH /roles/{id}": (
+            lambda: request(
+                "PATCH", f"/api/v1/roles/{ids['member_role_id']}", json_body={"name": "member"}
+            ),
+            False,
+        ),
+        "DELETE /roles/{id}": (
+            lambda: request("DELETE", f"/api/v1/roles/{pop('roles')}"),
+            False,
+        ),
+        "POST /roles/bulk": (
+            track(
+                "roles",
+                lambda: request(
+                    "POST",
+                    "/api/v1/roles/bulk",
+                    json_body=[
+                        {"name": f"role{next(counter)}"} for _ in range(BULK_SIZE * 2)
+                    ],
+                ),
+            ),
+            False,
+        ),
+        "PATCH /roles/bulk": (
+            lambda: request(
+                "PATCH",
+                "/api/v1/roles/bulk",
+                json_body={
+                    ids["admin_role_id"]: {"name": "admin"},
+                    ids["member_role_id"]: {"name": "member"},
+                },
+            ),
+            False,
+        ),
+        "DELETE /roles/bulk": (
+            lambda: request("DELETE", f"/api/v1/roles/bulk?{pop_many('roles')}"),
+            False,
+        ),
+        "GET /permissions/": (lambda: request("GET", "/api/v1/permissions/"), False),
+        "GET /permissions/cursor": (
+            lambda: request("GET", "/api/v1/permissions/cursor"),
+            False,
+        ),
+        "GET /permissions/{id}": (
+            lambda: request("GET", f"/api/v1/permissions/{ids['permission_id']}"),
+            False,
+        ),
+        "POST /permissions/": (
+            track(
+                "permissions",
+                lambda: request(
+                    "POST",
+                    "/api/v1/permissions/",
+                    json_body={"resource": "benchmark", "action": str(next(counter))},
+                ),
+            ),
+            False,
+        ),
+        "PATCH /permissions/{id}": (
+            lambda: request(
+                "PATCH",
+                f"/api/v1/permissions/{ids['permission_id']}",
+                json_body={"resource": "users"},
+            ),
+            False,
+        ),
+        "DELETE /permissions/{id}": (
+            lambda: request("DELETE", f"/api/v1/permissions/{pop('permissions')}"),
+            False,
+        ),
+        "POST /permissions/bulk": (
+            track(
+                "permissions",
+                lambda: request(
+                    "POST",
+                    "/api/v1/permissions/bulk",
+                    json_body=[
+                        {"resource": "benchmark", "action": str(next(counter))}
+                        for _ in range(BULK_SIZE * 2)
+                    ],
+                ),
+            ),
+            False,
+        ),
+        "PATCH /permissions/bulk": (
+            lambda: request(
+                "PATCH",
+                "/api/v1/permissions/bulk",
+                json_body={
+                    id: {"resource": resource}
+                    for id, resource in ids["permissions"].items()
+                },
+            ),
+            False,
+        ),
+        "DELETE /permissions/bulk": (
+            lambda: request(
+                "DELETE", f"/api/v1/permissions/bulk?{pop_many('permissions')}"
+            ),
+            False,
+        ),
+        f"GET {settings.JWKS_PATH}": (
+            lambda: request("GET", settings.JWKS_PATH),
+            False,
+        ),
+    }
+
+
+async def run_case(call: Call, requests: int, concurrency: int) -> dict[str, float]:
+    samples: list[float] = []
+    errors = 0
+    remaining = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while next(remaining) < requests:
+            start = time.perf_counter()
+            status, _, _ = await call()
+            samples.append(time.perf_counter() - start)
+            if status >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result = summarize(samples, time.perf_counter() - started)
+    result["errors"] = errors
+    return result
+
+
+def compare(results: dict[str, dict[str, float]], baseline_path: Path, tolerance: float):
+    baseline = json.loads(baseline_path.read_text())["results"]
+    print(f"\nCompared with {baseline_path} (regression threshold {tolerance:.0%}):")
+    regressions = 0
+    for name, row in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"  {name}: no baseline")
+            continue
+        delta = row["p50_ms"] / base["p50_ms"] - 1 if base["p50_ms"] else 0.0
+        flag = "REGRESSION" if delta > tolerance else ""
+        regressions += bool(flag)
+        print(
+            f"  {name}: p50 {base['p50_ms']:.3f}ms -> {row['p50_ms']:.3f}ms ({delta:+.1%}) {flag}"
+        )
+    return regressions
+
+
+async def main(args: argparse.Namespace) -> int:
+    ids = await seed(args.users)
+    app = create_app()
+
+    async with app.router.lifespan_context(app):
+        client = ASGIClient(app)
+        status, _, body = await client.request(
+            "POST",
+            "/api/v1/auth/login",
+            form={"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD},
+        )
+        if status != 200:
+            raise RuntimeError(f"Benchmark login failed: {status} {body!r}")
+        client.headers["authorization"] = f"Bearer {json.loads(body)['access_token']}"
+
+        results = {}
+        for name, (call, hashing) in build_cases(client, ids).items():
+            if args.only and args.only not in name:
+                continue
+            requests = args.hash_requests if hashing else args.requests
+            for _ in range(min(args.warmup, requests)):
+                await call()
+            results[name] = await run_case(call, requests, args.concurrency)
+
+    for engine in engines.values():
+        await engine.dispose()
+
+    print_table(results)
+    for name, row in results.items():
+        if row["errors"]:
+            print(f"warning: {name} returned {row['errors']:.0f} error responses")
+
+    if args.save_baseline:
+        args.save_baseline.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "database": engines["writer"].url.get_backend_name(),
+                    "concurrency": args.concurrency,
+                    "results": results,
+                },
+                indent=2,
+            )
+        )
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--hash-requests", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--users", type=int, default=4000, help="seeded users")
+    parser.add_argument("--only", help="run only routes containing this text")
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    raise SystemExit(asyncio.run(main(parser.parse_args())))
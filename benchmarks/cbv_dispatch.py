@@ -0,0 +1,62 @@
+"""
+Per-request overhead of `View` routes compared with plain FastAPI functions.
+
+    python -m benchmarks.cbv_dispatch [--requests 20000]
+"""
+
+import argparse
+import asyncio
+from typing import Annotated
+
+from benchmarks.common import ASGIClient, measure, print_table
+
+from fastapi import Depends, FastAPI
+from project.core.cbv import View
+
+
+class Service:
+    def get(self, item_id: int):
+        return {"id": item_id}
+
+
+async def get_service():
+    return Service()
+
+
+ServiceDep = Annotated[Service, Depends(get_service)]
+
+
+class ItemView(View):
+    prefix = "/cbv"
+    service: ServiceDep
+
+    @View.get("/{item_id}")
+    async def get_item(self, item_id: int, q: str | None = None):
+        return self.service.get(item_id)
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(ItemView.as_router())
+
+    @app.get("/plain/{item_id}")
+    async def get_item(service: ServiceDep, item_id: int, q: str | None = None):
+        return service.get(item_id)
+
+    return app
+
+
+async def main(requests: int):
+    client = ASGIClient(create_app())
+    rows = {}
+    for name, path in (("plain", "/plain/1?q=x"), ("cbv", "/cbv/1?q=x")):
+        status, _, body = await client.request("GET", path)
+        assert status == 200, body
+        rows[name] = await measure(lambda: client.request("GET", path), requests)
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    asyncio.run(main(parser.parse_args().requests))
@@ -0,0 +1,139 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Scripts are run from the repository root, e.g. `python -m benchmarks.cbv_dispatch`.
+Importing this module points the project at a throwaway sqlite database unless
+`DATABASE_URL` is already set, so it must be imported before `project`.
+"""
+
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./benchmark.sqlite3")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-not-for-production")
+os.environ.setdefault("LOGGER_OUT_IN_FILE", "false")
+os.environ.setdefault("LOGGER_OUT_IN_CONSOLE", "false")
+
+
+class ASGIClient:
+    """
+    Minimal in-process HTTP/1.1 client calling an ASGI app directly.
+    """
+
+    def __init__(self, app, headers: dict[str, str] | None = None):
+        self.app = app
+        self.headers = headers or {}
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json_body: Any = None,
+        form: dict[str, str] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[int, dict[str, str], bytes]:
+        path, _, query = path.partition("?")
+        all_headers = {**self.headers, **(headers or {})}
+        body = b""
+        if json_body is not None:
+            body = json.dumps(json_body).encode()
+            all_headers["content-type"] = "application/json"
+        elif form is not None:
+            from urllib.parse import urlencode
+
+            body = urlencode(form).encode()
+            all_headers["content-type"] = "application/x-www-form-urlencoded"
+        all_headers["content-length"] = str(len(body))
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in all_headers.items()],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return {"type": "http.disconnect"}
+
+        response: dict[str, Any] = {"body": []}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = {
+                    k.decode(): v.decode() for k, v in message.get("headers", [])
+                }
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return response["status"], response["headers"], b"".join(response["body"])
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def summarize(samples: list[float], elapsed: float) -> dict[str, float]:
+    """
+    `samples` are per-request durations in seconds, `elapsed` the wall time.
+    """
+    return {
+        "requests": len(samples),
+        "rps": len(samples) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+
+async def measure(
+    call: Callable[[], Awaitable[Any]], requests: int, warmup: int = 50
+) -> dict[str, float]:
+    for _ in range(warmup):
+        await call()
+
+    samples = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        start = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, time.perf_counter() - started)
+
+
+def print_table(rows: dict[str, dict[str, float]]):
+    width = max(len(name) for name in rows)
+    print(
+        f"{'case'.ljust(width)}  {'rps':>10} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9}"
+    )
+    for name, row in rows.items():
+        print(
+            f"{name.ljust(width)}  {row['rps']:>10.0f} {row['mean_ms']:>8.3f}ms "
+            f"{row['p50_ms']:>7.3f}ms {row['p95_ms']:>7.3f}ms {row['p99_ms']:>7.3f}ms"
+        )
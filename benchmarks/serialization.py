@@ -0,0 +1,108 @@
+"""
+Large list page serialization with the stdlib JSONResponse versus FastJSONResponse.
+
+    python -m benchmarks.serialization [--items 500] [--requests 200]
+
+Serves the same `Page[UserRead]` (users with their role and its permissions)
+through routes that differ only in the response class, plus a render-only
+comparison of the JSON encoders on the already validated content.
+"""
+
+import argparse
+import asyncio
+import json
+import uuid
+
+from benchmarks.common import ASGIClient, measure, print_table
+
+from fastapi import APIRouter, FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi_pagination import Params
+from project.core.responses import FastJSONResponse, get_json_dumps, orjson
+from project.models import Permission, Role, User
+from project.schemas import Page, UserRead
+
+
+def build_page(items: int) -> Page[UserRead]:
+    permissions = [
+        Permission(id=idx, resource=resource, action=action)
+        for idx, (resource, action) in enumerate(
+            (resource, action)
+            for resource in ("users", "roles", "permissions")
+            for action in ("create", "read", "update", "delete")
+        )
+    ]
+    role = Role(id=1, name="admin", permissions=permissions)
+    users = [
+        User(
+            id=uuid.uuid4(),
+            email=f"user{idx}@benchmark.local",
+            hashed_password="-",
+            is_active=True,
+            is_verified=True,
+            role_id=1,
+            role=role,
+        )
+        for idx in range(items)
+    ]
+    return Page[UserRead].create(users, Params(page=1, size=min(items, 100)), total=items)
+
+
+def create_app(page) -> FastAPI:
+    app = FastAPI()
+    router = APIRouter()
+    for name, response_class in (("stdlib", JSONResponse), ("fast", FastJSONResponse)):
+
+        async def endpoint():
+            return page
+
+        router.add_api_route(
+            f"/{name}",
+            endpoint,
+            response_model=Page[UserRead],
+            response_class=response_class,
+        )
+    app.include_router(router)
+    return app
+
+
+async def call(func, *args):
+    return func(*args)
+
+
+async def main(items: int, requests: int):
+    page = build_page(items)
+    client = ASGIClient(create_app(page))
+
+    rows = {}
+    bodies = {}
+    for name in ("stdlib", "fast"):
+        status, _, body = await client.request("GET", f"/{name}")
+        assert status == 200, body
+        bodies[name] = body
+        rows[f"GET page of {items} ({name})"] = await measure(
+            lambda: client.request("GET", f"/{name}"), requests, warmup=5
+        )
+
+    content = jsonable_encoder(page)
+    renderers = ["stdlib", "pydantic"] + (["orjson"] if orjson is not None else [])
+    for renderer in renderers:
+        dumps = get_json_dumps(renderer)
+        rows[f"render only ({renderer})"] = await measure(
+            lambda: call(dumps, content), requests, warmup=5
+        )
+
+    print_table(rows)
+    same = json.loads(bodies["stdlib"]) == json.loads(bodies["fast"])
+    print(f"\nbody: {len(bodies['fast'])} bytes, same JSON from both routes: {same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.requests))
@@ -0,0 +1,63 @@
+"""
+Cold start time of the processes the project runs.
+
+    python -m benchmarks.startup [--runs 5]
+
+Every case starts a fresh interpreter, so nothing is shared between runs:
+importing the ASGI app (what each uvicorn worker does), the Celery worker
+module, the CLI (`manage.py --help`, paid by every management command), and
+the first table name pluralisation, which loads inflect.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import ROOT
+
+CASES = {
+    "import app": ["-c", "import project.manage"],
+    "import worker": ["-c", "import project.worker"],
+    "cli --help": ["-m", "project.manage", "--help"],
+    "first make_plural": [
+        "-c",
+        "from project.utils.string import make_plural; make_plural('user')",
+    ],
+}
+
+
+def run(args: list[str]) -> float:
+    env = {**os.environ, "PYTHONPATH": str(ROOT / "src")}
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, *args], env=env, cwd=ROOT, check=True, capture_output=True
+    )
+    return time.perf_counter() - start
+
+
+def main(runs: int):
+    baseline = [run(["-c", "pass"]) for _ in range(runs)]
+    interpreter = min(baseline)
+
+    width = max(map(len, CASES))
+    print(f"{'case'.ljust(width)}  {'min':>9} {'median':>9} {'max':>9}")
+    print(f"{'python -c pass'.ljust(width)}  {interpreter * 1000:>7.0f}ms")
+    for name, args in CASES.items():
+        samples = [run(args) for _ in range(runs)]
+        print(
+            f"{name.ljust(width)}  {min(samples) * 1000:>7.0f}ms "
+            f"{statistics.median(samples) * 1000:>7.0f}ms "
+            f"{max(samples) * 1000:>7.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.runs)
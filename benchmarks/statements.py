@@ -0,0 +1,107 @@
+"""
+Cost of building hot repository statements per call versus reusing prebuilt ones.
+
+    python -m benchmarks.statements [--requests 20000]
+
+"build" cases construct the login / lookup select like the repositories used
+to and take its cache key, which is what SQLAlchemy does before every execute.
+"prebuilt" cases reuse the statements from `repositories.base`, whose cache key
+is memoized. "compile" shows what a compiled cache miss would cost on top. The
+"execute" cases run both variants against the database.
+"""
+
+import argparse
+import asyncio
+import uuid
+
+from benchmarks.common import measure, print_table
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import noload
+from project.core.session import engines, session_factory
+from project.models import Model, Role, User
+from project.repositories.base import field_lookup_statement
+
+EMAIL = "statements@benchmark.local"
+
+
+def build_login():
+    return (
+        select(User)
+        .where(or_(*[getattr(User, field) == EMAIL for field in ("email",)]))
+        .limit(1)
+        .options(noload(User.role))
+    )
+
+
+def build_lookup():
+    return select(User).filter_by(email=EMAIL).limit(1)
+
+
+async def call(func, *args):
+    return func(*args)
+
+
+async def seed():
+    async with engines["writer"].begin() as conn:
+        await conn.run_sync(Model.metadata.drop_all)
+        await conn.run_sync(Model.metadata.create_all)
+    async with session_factory() as session:
+        role = Role(name="member", permissions=[])
+        session.add(role)
+        await session.flush()
+        session.add(
+            User(id=uuid.uuid4(), email=EMAIL, hashed_password="-", role_id=role.id)
+        )
+        await session.commit()
+
+
+async def main(requests: int):
+    dialect = engines["writer"].dialect
+    login = field_lookup_statement(User, ("email",), ("role",))
+    lookup = field_lookup_statement(User, ("email",))
+
+    rows = {
+        "login: build + cache key": await measure(
+            lambda: call(lambda: build_login()._generate_cache_key()), requests
+        ),
+        "login: prebuilt cache key": await measure(
+            lambda: call(login._generate_cache_key), requests
+        ),
+        "lookup: build + cache key": await measure(
+            lambda: call(lambda: build_lookup()._generate_cache_key()), requests
+        ),
+        "lookup: prebuilt cache key": await measure(
+            lambda: call(lookup._generate_cache_key), requests
+        ),
+        "login: compile (cache miss)": await measure(
+            lambda: call(lambda: build_login().compile(dialect=dialect)), requests // 10
+        ),
+    }
+
+    await seed()
+    async with session_factory() as session:
+
+        async def execute_built():
+            await session.scalar(build_login())
+            session.expunge_all()
+
+        async def execute_prebuilt():
+            await session.scalar(login, {"email": EMAIL})
+            session.expunge_all()
+
+        rows["login: execute built"] = await measure(execute_built, requests // 10)
+        rows["login: execute prebuilt"] = await measure(execute_prebuilt, requests // 10)
+
+    for engine in engines.values():
+        await engine.dispose()
+
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=20000)
+    asyncio.run(main(parser.parse_args().requests))
@@ -1,8 +1,8 @@
 from project.core.cbv import View
-from project.schemas import UserCreate, UserRead, TokenResponse
+from project.schemas import UserCreate, UserRead, TokenResponse, RefreshRequest
 from project.dependencies import AuthServiceDep
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi import Depends
+from fastapi import Depends, Request
 
 
 class AuthView(View):
@@ -13,8 +13,21 @@ class AuthView(View):
     service: AuthServiceDep
 
     @View.post("/login", response_model=TokenResponse)
-    async def login(self, credentials: OAuth2PasswordRequestForm = Depends()):
-        return await self.service.login(credentials.username, credentials.password)
+    async def login(
+        self, request: Request, credentials: OAuth2PasswordRequestForm = Depends()
+    ):
+        client_ip = request.client.host if request.client else None
+        return await self.service.login(
+            credentials.username, credentials.password, client_ip
+        )
+
+    @View.post("/refresh", response_model=TokenResponse)
+    async def refresh(self, payload: RefreshRequest):
+        return await self.service.refresh(payload.refresh_token)
+
+    @View.post("/logout", status_code=204)
+    async def logout(self, payload: RefreshRequest):
+        await self.service.logout(payload.refresh_token)
 
     @View.post("/signup", response_model=UserRead)
     async def signup(self, payload: UserCreate):
@@ -1,8 +1,11 @@
+from project.config import settings
 from project.core.cbv import View
-from project.dependencies import RoleServiceDep, PermissionServiceDep, PaginationDep
+from project.dependencies import RoleServiceDep, PermissionServiceDep
+from project.utils.pagination import PaginationDep, CursorPaginationDep
 from project.schemas import (
     RoleRead,
     Page,
+    CursorPage,
     RoleCreate,
     RoleUpdate,
     PermissionCreate,
@@ -11,6 +14,7 @@ from project.schemas import (
 )
 from project.schemas.filters.rbac import RoleFilter, PermissionFilter
 from fastapi_filter import FilterDepends
+from fastapi import Query
 
 class RoleView(View):
     prefix = "/roles"
@@ -20,7 +24,20 @@ class RoleView(View):
     auto_guard = True
     service: RoleServiceDep
 
-    @View.get("/{role_id}", response_model=RoleRead)
+    @View.get("/cursor", response_model=CursorPage[RoleRead])
+    async def get_cursor_page_of_roles(
+        self,
+        pagination: CursorPaginationDep,
+        filter: RoleFilter = FilterDepends(RoleFilter),
+    ):
+        return await self.service.get_many(pagination, filter)
+
+    @View.get(
+        "/{role_id}",
+        response_model=RoleRead,
+        etag=True,
+        cache_control=settings.READ_CACHE_CONTROL,
+    )
     async def get_role(self, role_id: int):
         return await self.service.get(role_id)
 
@@ -32,6 +49,18 @@ class RoleView(View):
     async def create_role(self, role: RoleCreate):
         return await self.service.create(role)
 
+    @View.post("/bulk", response_model=list[RoleRead])
+    async def bulk_create_roles(self, roles: list[RoleCreate]):
+        return await self.service.create_many(roles)
+
+    @View.patch("/bulk", response_model=list[RoleRead])
+    async def bulk_update_roles(self, roles: dict[int, RoleUpdate]):
+        return await self.service.patch_many(roles)
+
+    @View.delete("/bulk", response_model=list[RoleRead])
+    async def bulk_delete_roles(self, ids: list[int] = Query()):
+        return await self.service.delete_many(ids)
+
     @View.patch("/{role_id}", response_model=RoleRead)
     async def update_role(self, role_id: int, role: RoleUpdate):
         return await self.service.patch(role_id, role)
@@ -49,7 +78,21 @@ class PermissionView(View):
     auto_guard = True
     service: PermissionServiceDep
 
-    @View.get("/{permission_id}", response_model=PermissionRead)
+    @View.get("/cursor", response_model=CursorPage[PermissionRead])
+    async def get_cursor_page_of_permissions(
+        self,
+        pagination: CursorPaginationDep,
+        filter: PermissionFilter = FilterDepends(PermissionFilter),
+    ):
+        return await self.service.get_many(pagination, filter)
+
+    @View.get(
+        "/{permission_id}",
+        response_model=PermissionRead,
+        etag="updated_at",
+        last_modified="updated_at",
+        cache_control=settings.READ_CACHE_CONTROL,
+    )
     async def get_permission(self, permission_id: int):
         return await self.service.get(permission_id)
 
@@ -61,6 +104,18 @@ class PermissionView(View):
     async def create_permission(self, permission: PermissionCreate):
         return await self.service.create(permission)
 
+    @View.post("/bulk", response_model=list[PermissionRead])
+    async def bulk_create_permissions(self, permissions: list[PermissionCreate]):
+        return await self.service.create_many(permissions)
+
+    @View.patch("/bulk", response_model=list[PermissionRead])
+    async def bulk_update_permissions(self, permissions: dict[int, PermissionUpdate]):
+        return await self.service.patch_many(permissions)
+
+    @View.delete("/bulk", response_model=list[PermissionRead])
+    async def bulk_delete_permissions(self, ids: list[int] = Query()):
+        return await self.service.delete_many(ids)
+
     @View.patch("/{permission_id}", response_model=PermissionRead)
     async def update_permission(self, permission_id: int, permission: PermissionUpdate):
         return await self.service.patch(permission_id, permission)
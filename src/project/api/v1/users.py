@@ -1,9 +1,11 @@
+from project.config import settings
 from project.core.cbv import View
 from project.core.security import UserDepends, Authorization, HasRole
 from project.models import User
-from project.schemas import UserRead, UserCreate, UserUpdate, Page
-from project.dependencies import UserServiceDep, PaginationDep, AuthServiceDep
-from fastapi import Depends
+from project.schemas import UserRead, UserCreate, UserUpdate, Page, CursorPage
+from project.dependencies import UserServiceDep, AuthServiceDep
+from project.utils.pagination import PaginationDep, CursorPaginationDep
+from fastapi import Depends, Query
 
 import uuid
 
@@ -29,8 +31,17 @@ class UserView(View):
     ):
         user = await self.auth_service.get_current_user(token.sub)
         return await self.auth_service.update(user, payload)
-    
-    @View.get("/{user_id}", response_model=UserRead)
+
+    @View.get("/cursor", response_model=CursorPage[UserRead])
+    async def get_cursor_page_of_users(self, pagination: CursorPaginationDep):
+        return await self.service.get_many(pagination)
+
+    @View.get(
+        "/{user_id}",
+        response_model=UserRead,
+        etag=True,  # the body embeds the role, updated_at alone is not enough
+        cache_control=settings.READ_CACHE_CONTROL,
+    )
     async def get_user(self, user_id: uuid.UUID):
         return await self.service.get(user_id)
 
@@ -42,6 +53,18 @@ class UserView(View):
     async def create_user(self, user: UserCreate):
         return await self.auth_service.signup(user, False)
 
+    @View.post("/bulk", response_model=list[UserRead])
+    async def bulk_create_users(self, users: list[UserCreate]):
+        return await self.auth_service.signup_many(users, False)
+
+    @View.patch("/bulk", response_model=list[UserRead])
+    async def bulk_update_users(self, payloads: dict[uuid.UUID, UserUpdate]):
+        return await self.service.patch_many(payloads)
+
+    @View.delete("/bulk", response_model=list[UserRead])
+    async def bulk_delete_users(self, ids: list[uuid.UUID] = Query()):
+        return await self.service.delete_many(ids)
+
     @View.patch("/{user_id}", response_model=UserRead)
     async def update_user(self, user_id: uuid.UUID, payload: UserUpdate):
         return await self.service.patch(user_id, payload)
@@ -14,20 +14,62 @@ class Settings(BaseSettings):
 
     # DB
     DATABASE_URL: PostgresDsn | str = ""
+    DATABASE_REPLICA_URLS: list[str] = []
+    DATABASE_REPLICA_MAX_LAG: float = 10.0
+    DATABASE_REPLICA_CHECK_INTERVAL: float = 10.0
+    DATABASE_WRITER_POOL_SIZE: int = 10
+    DATABASE_WRITER_MAX_OVERFLOW: int = 10
+    DATABASE_WRITER_POOL_TIMEOUT: float = 30.0
+    DATABASE_WRITER_POOL_PRE_PING: bool = False
+    DATABASE_WRITER_POOL_RECYCLE: int = 3600
+    DATABASE_WRITER_STATEMENT_CACHE_SIZE: int = 100
+    DATABASE_READER_POOL_SIZE: int = 10
+    DATABASE_READER_MAX_OVERFLOW: int = 10
+    DATABASE_READER_POOL_TIMEOUT: float = 30.0
+    DATABASE_READER_POOL_PRE_PING: bool = True
+    DATABASE_READER_POOL_RECYCLE: int = 3600
+    DATABASE_READER_STATEMENT_CACHE_SIZE: int = 100
+    DATABASE_POOL_WARMUP: bool = False
+    DATABASE_POOL_SLOW_CHECKOUT_MS: float = 100.0
+    DB_UNIT_OF_WORK: bool = True
     DEFAULT_USER_IS_ACTIVE: bool = True
     DEFAULT_USER_IS_VERIFIED: bool = False
     DEFAULT_USER_ROLE_ID: int = 1
+    RBAC_CACHE_TTL: int = 300
+    SQL_INSTRUMENTATION: bool = False
+    SQL_SLOW_QUERY_MS: float = 200.0
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
 
     # AUTH
     LOGIN_FIELDS: list[str] = ["email"]
     ALLOW_INACIVE_USER_LOGIN: bool = True
     ALLOW_UNVERIFIED_USER_LOGIN: bool = True
+    PASSWORD_HASH_WORKERS: int | None = None
+    PASSWORD_HASH_MAX_PENDING: int = 256
+    # memory | redis, memory counters are per process: `prod` refuses to start
+    # more than one worker with them, as every worker would allow the full limit
+    THROTTLE_BACKEND: str = "memory"
+    THROTTLE_REDIS_URL: str = "redis://localhost:6379/0"
+    THROTTLE_MEMORY_MAX_KEYS: int = 100_000
+    THROTTLE_LOGIN_WINDOW: float = 60.0
+    THROTTLE_LOGIN_USERNAME_LIMIT: int = 5
+    THROTTLE_LOGIN_IP_LIMIT: int = 20
 
     # JWT
     SECRET_KEY: str = ""
     JWT_ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_MAX_AGE: int = 60 * 60 * 12
+    JWT_PRIVATE_KEY_FILE: Path | None = None
+    JWT_KEY_ID: str = ""
+    JWT_PUBLIC_KEY_FILES: list[str] = []
+    JWKS_PATH: str = "/.well-known/jwks.json"
+    JWKS_CACHE_CONTROL: str = "public, max-age=3600"
+    ACCESS_TOKEN_MAX_AGE: int = 60 * 15
     ACCESS_TOKEN_AUDIENCE: list[str] = ["auth"]
+    ACCESS_TOKEN_CACHE_SIZE: int = 4096
+    REFRESH_TOKEN_MAX_AGE: int = 60 * 60 * 24 * 30
+    REFRESH_TOKEN_AUDIENCE: list[str] = ["refresh"]
+    TOKEN_REVOCATION_SYNC_INTERVAL: float = 30.0
+    TOKEN_PURGE_INTERVAL: float = 60 * 60
 
     # FS
     PROJECT_DIR: Path = Path(__file__).parent.absolute()
@@ -40,10 +82,44 @@ class Settings(BaseSettings):
     LOGGER_LOG_FILE_PATH: Path = Path(".").joinpath("app.log")
     LOGGER_OUT_IN_CONSOLE: bool = True
     LOGGER_OUT_IN_FILE: bool = True
+    LOGGER_ASYNC: bool = True
+    LOGGER_QUEUE_SIZE: int = 10_000
+    LOGGER_JSON: bool = False
+    LOGGER_SAMPLING: dict[str, float] = {}
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0
+    ACCESS_LOG_SLOW_REQUEST_MS: float = 1000.0
+    ACCESS_LOG_COLORED: bool = True
+
+    # auto | orjson | pydantic | stdlib
+    JSON_RENDERER: str = "auto"
+
+    # HTTP caching, sent with ETag responses of single resource reads
+    READ_CACHE_CONTROL: str = "private, no-cache"
+
+    # METRICS
+    METRICS_ENABLED: bool = False
+    METRICS_PATH: str = "/metrics"
+    # set by the prod server to merge the metrics of its workers
+    METRICS_MULTIPROCESS_DIR: Path | None = None
+    METRICS_WRITE_INTERVAL: float = 5.0
+
+    # MAIL
+    MAIL_DEFAULT_FROM: str = ""
+    MAIL_BATCH_SIZE: int = 50
+    SMTP_HOST: str = "localhost"
+    SMTP_PORT: int = 465
+    SMTP_LOGIN: str = ""
+    SMTP_PASSWORD: str = ""
+    SMTP_USE_SSL: bool = True
+    SMTP_STARTTLS: bool = False
+    SMTP_TIMEOUT: float = 10.0
+    SMTP_POOL_SIZE: int = 4
+    SMTP_MAX_MESSAGES_PER_CONNECTION: int = 100
 
     # CELERY
     CELERY_BACKEND_URL: str = ''
     CELERY_BROKER_URL: str = ''
+    CELERY_EAGER: bool = False
 
 
 settings = Settings()
@@ -1,7 +1,14 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from project.config import settings
 from .exceptions import set_app_exception
-from .middlewares import LoggingMiddleware
+from .metrics import CONTENT_TYPE, REGISTRY, SharedMetrics
+from .responses import FastJSONResponse
+from .middlewares import LoggingMiddleware, MetricsMiddleware, QueryStatsMiddleware
+from .pool import warm_pool
+from .session import engines, replicas, session_factory
+from .logger import log
 
 MIDDLEWARES = [LoggingMiddleware]
 
@@ -16,12 +23,175 @@ def set_middlewares(app: FastAPI):
     for middleware in MIDDLEWARES:
         app.add_middleware(middleware)
 
+    if settings.SQL_INSTRUMENTATION:
+        app.add_middleware(QueryStatsMiddleware)
+
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
+
+def get_shared_metrics() -> SharedMetrics | None:
+    if not settings.METRICS_ENABLED or settings.METRICS_MULTIPROCESS_DIR is None:
+        return None
+    return SharedMetrics(settings.METRICS_MULTIPROCESS_DIR)
+
+
+def set_metrics(app: FastAPI):
+    if not settings.METRICS_ENABLED:
+        return
+
+    shared = get_shared_metrics()
+
+    async def metrics():
+        body = shared.render() if shared is not None else REGISTRY.render()
+        return Response(body, media_type=CONTENT_TYPE)
+
+    app.add_api_route(settings.METRICS_PATH, metrics, include_in_schema=False)
+
+
+def set_jwks(app: FastAPI):
+    from project.utils.jwts import get_key_ring
+
+    async def jwks():
+        return Response(
+            get_key_ring().jwks_json,
+            media_type="application/json",
+            headers={"Cache-Control": settings.JWKS_CACHE_CONTROL},
+        )
+
+    app.add_api_route(settings.JWKS_PATH, jwks, include_in_schema=False)
+
+
+async def warm_rbac_cache():
+    from project.repositories.rbac import RoleRepository
+    from project.services.rbac import rbac_cache
+
+    try:
+        async with session_factory() as session:
+            await rbac_cache.warm(RoleRepository(session))
+    except Exception as e:
+        log.warning(f"RBAC cache warm-up skipped: {e!r}")
+
+
+async def sync_revoked_tokens():
+    from project.repositories.auth import RevokedTokenRepository
+    from project.services.auth import sync_revoked_tokens
+
+    try:
+        async with session_factory() as session:
+            await sync_revoked_tokens(RevokedTokenRepository(session))
+    except Exception as e:
+        log.warning(f"Token revocation list sync failed: {e!r}")
+
+
+async def keep_revoked_tokens_synced():
+    # picks up revocations made by other workers
+    while True:
+        await asyncio.sleep(settings.TOKEN_REVOCATION_SYNC_INTERVAL)
+        await sync_revoked_tokens()
+
+
+async def purge_expired_tokens():
+    from project.repositories.auth import (
+        RefreshTokenRepository,
+        RevokedTokenRepository,
+    )
+    from project.services.auth import purge_expired_tokens
+
+    try:
+        async with session_factory() as session:
+            purged = await purge_expired_tokens(
+                RefreshTokenRepository(session), RevokedTokenRepository(session)
+            )
+        if purged:
+            log.info(f"Purged {purged} expired token rows")
+    except Exception as e:
+        log.warning(f"Expired token purge failed: {e!r}")
+
+
+async def keep_expired_tokens_purged():
+    # every worker purges, the deletes are idempotent
+    while True:
+        await purge_expired_tokens()
+        await asyncio.sleep(settings.TOKEN_PURGE_INTERVAL)
+
+
+async def keep_shared_metrics_written(shared: SharedMetrics):
+    # other workers answering a scrape read this worker's last written state
+    try:
+        while True:
+            shared.write()
+            await asyncio.sleep(settings.METRICS_WRITE_INTERVAL)
+    finally:
+        shared.write()
+
+
+async def warm_pools():
+    for name, engine in engines.items():
+        size = getattr(engine.pool, "size", None)
+        if size is None:
+            continue
+        try:
+            await warm_pool(engine, size())
+        except Exception as e:
+            log.warning(f"Connection pool '{name}' warm-up failed: {e!r}")
+
+
+def prepare_statements():
+    from project.repositories.auth import UserRepository
+
+    # a typo in LOGIN_FIELDS fails the startup instead of every login
+    UserRepository.prepare(settings.LOGIN_FIELDS)
+
+
+def load_jwt_keys():
+    from project.utils.jwts import get_key_ring
+
+    # parses every key once, a missing or broken key file fails the startup
+    get_key_ring()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from project.repositories.celery import close_celery_repository
+    from project.services.auth import default_password_helper
+
+    prepare_statements()
+    load_jwt_keys()
+    if settings.DATABASE_POOL_WARMUP:
+        await warm_pools()
+    replicas.start()
+    await warm_rbac_cache()
+    await sync_revoked_tokens()
+    tasks = [
+        asyncio.create_task(keep_revoked_tokens_synced()),
+        asyncio.create_task(keep_expired_tokens_purged()),
+    ]
+    shared_metrics = get_shared_metrics()
+    if shared_metrics is not None:
+        tasks.append(asyncio.create_task(keep_shared_metrics_written(shared_metrics)))
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await replicas.stop()
+    close_celery_repository()
+    default_password_helper.shutdown()
+    for engine in engines.values():
+        await engine.dispose()
+
 
 def create_app():
-    app = FastAPI(debug=settings.DEBUG)
+    app = FastAPI(
+        debug=settings.DEBUG,
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,
+    )
 
     set_middlewares(app)
     set_app_exception(app)
     set_router(app)
+    set_metrics(app)
+    set_jwks(app)
 
     return app
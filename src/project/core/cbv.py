@@ -3,7 +3,6 @@ from fastapi.datastructures import DefaultPlaceholder
 from fastapi.routing import APIRoute
 from fastapi.params import Depends as DependsClass
 from starlette.routing import BaseRoute
-from makefun import with_signature
 from typing import (
     Any,
     Callable,
@@ -23,6 +22,8 @@ from typing import (
 )
 import inspect
 from project.core.security import Authorization, Action, HasPermission
+from project.core.conditional import ConditionalGet
+from project.core.responses import FastJSONResponse
 from fastapi.types import IncEx
 
 from project.schemas.auth import AccessToken
@@ -30,6 +31,10 @@ from project.schemas.auth import AccessToken
 
 __VIEW_CLASS__ = "__VIEW_CLASS__"
 __VIEW_ROUTE__ = "__VIEW_ROUTE__"
+__VIEW_INIT__ = "__VIEW_INIT__"
+__VIEW_PARAMS__ = "__VIEW_PARAMS__"
+__VIEW_GUARD__ = "_view__guard"
+__VIEW_PARAM_PREFIX__ = "_view__"
 
 
 class RouterParams(TypedDict):
@@ -78,6 +83,7 @@ class View:
         prefix = cls.prefix
         tags = kwargs.get("tags", cls.tags)
 
+        kwargs.setdefault("default_response_class", FastJSONResponse)
         router = APIRouter(prefix=prefix, tags=tags, **kwargs)
         cls._init_view()
         router = cls._load_routes(router)
@@ -86,97 +92,73 @@ class View:
 
     @classmethod
     def _init_view(cls):
-        if getattr(cls, __VIEW_CLASS__, False):
+        if __VIEW_CLASS__ in cls.__dict__:
             return
 
-        old_init = cls.__init__
-        old_sign = inspect.signature(old_init)
-        old_params = list(old_sign.parameters.values())[
-            1:
-        ]  # remove self from __init__ args
-        new_params = [
+        # the class keeps its own __init__, endpoints call it with the init
+        # arguments and set the annotated attributes on the instance directly
+        init = cls.__init__
+        init_params = [
             x
-            for x in old_params
+            for x in list(inspect.signature(init).parameters.values())[1:]  # no self
             if x.kind
             not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
         ]
-
-        dependencies = []
+        attr_params = []
 
         for name, hint in get_type_hints(cls, include_extras=True).items():
             if get_origin(hint) is ClassVar:
                 continue
 
+            annotation = hint
             default = getattr(cls, name, inspect._empty)
             if get_origin(hint) is Annotated:
                 args = get_args(hint)
-                annotated_hint = args[0]
                 depends_param = next(
                     (arg for arg in args[1:] if isinstance(arg, DependsClass)), None
                 )
-
                 if depends_param:
-                    new_params.append(
-                        inspect.Parameter(
-                            name=name,
-                            kind=inspect.Parameter.KEYWORD_ONLY,
-                            annotation=annotated_hint,
-                            default=depends_param,
-                        )
-                    )
-                dependencies.append(name)
-            else:
-                new_params.append(
-                    inspect.Parameter(
-                        name=name,
-                        kind=inspect.Parameter.KEYWORD_ONLY,
-                        annotation=hint,
-                        default=default,
-                    )
-                )
-                dependencies.append(name)
-
-        new_signature = inspect.Signature(new_params)
+                    annotation, default = args[0], depends_param
 
-        def new_init(self: Any, *args: Any, **kwargs: Any) -> None:
-            for dep_name in dependencies:
-                dep_value = kwargs.pop(dep_name)
-                setattr(self, dep_name, dep_value)
-            else:
-                old_init(self, *args, **kwargs)
+            attr_params.append(
+                inspect.Parameter(
+                    name=name,
+                    kind=inspect.Parameter.KEYWORD_ONLY,
+                    annotation=annotation,
+                    default=default,
+                )
+            )
 
-        setattr(cls, "__signature__", new_signature)
-        setattr(cls, "__init__", new_init)
+        setattr(cls, __VIEW_INIT__, None if init is object.__init__ else init)
+        setattr(cls, __VIEW_PARAMS__, (init_params, attr_params))
         setattr(cls, __VIEW_CLASS__, True)
 
     @classmethod
     def _load_routes(cls, router: APIRouter) -> APIRouter:
-        for _, method in inspect.getmembers(cls, inspect.isfunction):
-            if getattr(method, __VIEW_ROUTE__, False):
-                route = method(cls)
+        # definition order, base classes first, so routes match like plain FastAPI
+        members: dict[str, Any] = {}
+        for klass in reversed(cls.__mro__):
+            members.update(vars(klass))
 
-                old_endpoint = route.endpoint
-                old_signature = inspect.signature(old_endpoint)
-                old_parameters: List[inspect.Parameter] = list(
-                    old_signature.parameters.values()
-                )
-                old_first_parameter = old_parameters[0]
-                new_first_parameter = old_first_parameter.replace(default=Depends(cls))
-                new_parameters = [new_first_parameter] + [
-                    parameter.replace(kind=inspect.Parameter.KEYWORD_ONLY)
-                    for parameter in old_parameters[1:]
-                ]
-
-                new_signature = old_signature.replace(parameters=new_parameters)
-                setattr(route.endpoint, "__signature__", new_signature)
-                router.routes.append(route)
+        for method in members.values():
+            if getattr(method, __VIEW_ROUTE__, False):
+                router.routes.append(method(cls))
 
         return router
 
     @classmethod
     def _guard_endpoint(cls, func: Callable, method: str = "GET"):
+        """
+        Builds the route endpoint: one flat function taking the view
+        dependencies, the method parameters and the guard as keyword arguments.
+        """
+        cls._init_view()
+
         old_sig = inspect.signature(func)
-        old_params = list(old_sig.parameters.values())
+        old_params = [
+            param.replace(kind=inspect.Parameter.KEYWORD_ONLY)
+            for param in list(old_sig.parameters.values())[1:]  # remove self
+        ]
         params_updated = False
 
         for idx, param in enumerate(old_params):
@@ -186,7 +168,7 @@ class View:
             ):
                 authorization_instance = param.default.dependency
                 if authorization_instance is not None:
-                    authorization_instance.resource = cls.resource
+                    authorization_instance.bind(cls.resource)
                 auth_param = inspect.Parameter(
                     name=param.name,
                     kind=param.kind,
@@ -204,39 +186,101 @@ class View:
                     f"You set auth_guard flag for view, but not set default action for {method} method in guard_map attr"
                 )
 
-            guardian = HasPermission(action)
-            guardian.resource = cls.resource
+            guardian = HasPermission(action).bind(cls.resource)
 
             old_params.append(
                 inspect.Parameter(
-                    name="_",
+                    name=__VIEW_GUARD__,
                     annotation=AccessToken,
-                    kind=inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                    kind=inspect.Parameter.KEYWORD_ONLY,
                     default=Depends(guardian),
                 )
             )
 
-        new_signature = old_sig.replace(parameters=old_params)
+        # view dependencies are passed under prefixed names so they can not
+        # clash with route parameters, plain values keep their query names
+        route_names = {param.name for param in old_params}
+        init_params, attr_params = getattr(cls, __VIEW_PARAMS__)
+        view_params: list[inspect.Parameter] = []
+        init_items: list[tuple[str, str]] = []
+        attr_items: list[tuple[str, str]] = []
+
+        for items, params in ((init_items, init_params), (attr_items, attr_params)):
+            for param in params:
+                name = param.name
+                if isinstance(param.default, DependsClass):
+                    name = f"{__VIEW_PARAM_PREFIX__}{param.name}"
+                elif name in route_names:
+                    raise ValueError(
+                        f"View attribute '{name}' clashes with a parameter of {cls.__name__}.{func.__name__}"
+                    )
+                view_params.append(
+                    param.replace(name=name, kind=inspect.Parameter.KEYWORD_ONLY)
+                )
+                items.append((name, param.name))
+
+        new_signature = old_sig.replace(parameters=view_params + old_params)
+
+        new = cls.__new__
+        init = getattr(cls, __VIEW_INIT__)
+        attr_items_t = tuple(attr_items)
+        init_items_t = tuple(init_items)
+
+        def _instance(kwargs: dict[str, Any]):
+            self = new(cls)
+            self.__dict__.update({attr: kwargs.pop(name) for name, attr in attr_items_t})
+            if init is not None:
+                init(self, **{arg: kwargs.pop(name) for name, arg in init_items_t})
+            kwargs.pop(__VIEW_GUARD__, None)
+            return self
 
-        @with_signature(new_signature)
-        async def new_func(*args, **kwargs):
-            kwargs.pop('_', None)
-            return await func(*args, **kwargs)
-            
-        # return with_signature(new_signature)(func)
+        if inspect.iscoroutinefunction(func):
+
+            async def new_func(**kwargs):
+                return await func(_instance(kwargs), **kwargs)
+
+        else:
+
+            def new_func(**kwargs):
+                return func(_instance(kwargs), **kwargs)
+
+        new_func.__signature__ = new_signature  # type: ignore
         new_func.__name__ = func.__name__
+        new_func.__qualname__ = func.__qualname__
+        new_func.__doc__ = func.__doc__
         return new_func
 
     @classmethod
-    def get(cls, path: str, **kwargs: Unpack[RouterParams]):
+    def get(
+        cls,
+        path: str,
+        *,
+        etag: bool | str = False,
+        last_modified: str | None = None,
+        cache_control: str | None = None,
+        **kwargs: Unpack[RouterParams],
+    ):
+        """
+        Registers a GET route.
+
+        `etag`, `last_modified` and `cache_control` enable conditional GET, see
+        `ConditionalGet`: `If-None-Match`/`If-Modified-Since` are answered with 304.
+        """
+
         def wrapper(func):
             def _wrapper(cls: "View"):
+                endpoint = cls._guard_endpoint(func, "GET")
+                if etag or last_modified or cache_control:
+                    endpoint = ConditionalGet(
+                        etag, last_modified, cache_control, dict(kwargs)
+                    ).wrap(endpoint)
+
                 return APIRoute(
                     path=cls.prefix + path,
-                    endpoint=cls._guard_endpoint(func, "GET"),
+                    endpoint=endpoint,
                     methods=["GET"],
                     tags=kwargs.get("tags", cls.tags),
-                    **kwargs,  # type: ignore
+                    **{"response_class": FastJSONResponse, **kwargs},  # type: ignore
                 )
 
             setattr(_wrapper, __VIEW_ROUTE__, True)
@@ -253,7 +297,7 @@ class View:
                     endpoint=cls._guard_endpoint(func, "POST"),
                     methods=["POST"],
                     tags=kwargs.get("tags", cls.tags),
-                    **kwargs,  # type: ignore
+                    **{"response_class": FastJSONResponse, **kwargs},  # type: ignore
                 )
 
             setattr(_wrapper, __VIEW_ROUTE__, True)
@@ -270,7 +314,7 @@ class View:
                     endpoint=cls._guard_endpoint(func, "PATCH"),
                     methods=["PATCH"],
                     tags=kwargs.get("tags", cls.tags),
-                    **kwargs,  # type: ignore
+                    **{"response_class": FastJSONResponse, **kwargs},  # type: ignore
                 )
 
             setattr(_wrapper, __VIEW_ROUTE__, True)
@@ -287,7 +331,7 @@ class View:
                     endpoint=cls._guard_endpoint(func, "PUT"),
                     methods=["PUT"],
                     tags=kwargs.get("tags", cls.tags),
-                    **kwargs,  # type: ignore
+                    **{"response_class": FastJSONResponse, **kwargs},  # type: ignore
                 )
 
             setattr(_wrapper, __VIEW_ROUTE__, True)
@@ -304,7 +348,7 @@ class View:
                     endpoint=cls._guard_endpoint(func, "DELETE"),
                     methods=["DELETE"],
                     tags=kwargs.get("tags", cls.tags),
-                    **kwargs,  # type: ignore
+                    **{"response_class": FastJSONResponse, **kwargs},  # type: ignore
                 )
 
             setattr(_wrapper, __VIEW_ROUTE__, True)
@@ -1,8 +1,10 @@
 from typer import Typer
 from .migrations import migrations_cli
+from .profiling import profiling_cli
 from .server import server_cli
 
 cli = Typer(rich_markup_mode="rich")
 cli.add_typer(migrations_cli)
 cli.add_typer(server_cli)
+cli.add_typer(profiling_cli)
 __all__ = ["cli"]
@@ -1,27 +1,39 @@
+from functools import cache
 from typer import Typer
 from project.config import settings
-from alembic import command
-from alembic.config import Config
 
 migrations_cli = Typer()
-alembic_cfg = Config(settings.ALEMBIC_INI_PATH)
+
+
+@cache
+def get_alembic_config():
+    # alembic is only imported by the migration commands, not by every CLI call
+    from alembic.config import Config
+
+    return Config(settings.ALEMBIC_INI_PATH)
 
 
 @migrations_cli.command()
 def makemigrations(m: str | None = None, autogenerate: bool = True, sql: bool = False):
+    from alembic import command
+
     if m is None:
         m = "init"
-    command.revision(alembic_cfg, message=m, autogenerate=autogenerate, sql=sql)
+    command.revision(get_alembic_config(), message=m, autogenerate=autogenerate, sql=sql)
 
 
 @migrations_cli.command()
 def migrate(revision: str = "heads", sql: bool = False):
-    command.upgrade(alembic_cfg, revision, sql=sql)
+    from alembic import command
+
+    command.upgrade(get_alembic_config(), revision, sql=sql)
 
 
 @migrations_cli.command()
 def downgrade(revision: str, sql: bool = False):
-    command.downgrade(alembic_cfg, revision, sql=sql)
+    from alembic import command
+
+    command.downgrade(get_alembic_config(), revision, sql=sql)
 
 
 __all__ = ["migrations_cli"]
@@ -0,0 +1,67 @@
+import subprocess
+import sys
+from collections import defaultdict
+from typing import NamedTuple
+from typer import Exit, Typer, echo
+
+profiling_cli = Typer()
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportTime]:
+    """
+    Parses the `python -X importtime` report, one entry per imported module.
+    """
+
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        module = name.strip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append(ImportTime(module, int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+@profiling_cli.command()
+def profile_startup(module: str = "project.manage", top: int = 15):
+    """
+    Imports MODULE in a fresh interpreter and reports where the import time goes.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    rows = parse_importtime(result.stderr)
+    if result.returncode or not rows:
+        echo(result.stderr[-2000:], err=True)
+        raise Exit(result.returncode or 1)
+
+    total = sum(row.cumulative_us for row in rows if row.depth == 0)
+    packages: dict[str, int] = defaultdict(int)
+    for row in rows:
+        packages[row.module.partition(".")[0]] += row.self_us
+
+    echo(f"import {module}: {total / 1000:.1f}ms, {len(rows)} modules\n")
+    echo(f"{'package':<40} {'self':>10} {'share':>7}")
+    for package, self_us in sorted(packages.items(), key=lambda x: -x[1])[:top]:
+        echo(f"{package:<40} {self_us / 1000:>8.1f}ms {self_us / total:>7.1%}")
+
+    echo(f"\n{'module':<40} {'self':>10} {'cumulative':>12}")
+    for row in sorted(rows, key=lambda row: -row.self_us)[:top]:
+        echo(
+            f"{row.module:<40} {row.self_us / 1000:>8.1f}ms "
+            f"{row.cumulative_us / 1000:>10.1f}ms"
+        )
+
+
+__all__ = ["profiling_cli", "parse_importtime"]
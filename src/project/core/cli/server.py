@@ -1,4 +1,7 @@
-from typer import Typer
+from importlib.util import find_spec
+import shutil
+import tempfile
+from typer import Exit, Typer, echo
 from project.config import settings
 from pathlib import Path
 import uvicorn
@@ -32,6 +35,77 @@ def dev(
 
 @server_cli.command()
 def prod(
-    path: str | None = None, host: str = "0.0.0.0", port: int = 8000, reload: bool = False
+    path: str | None = None,
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    reload: bool = False,
+    workers: int | None = None,
+    loop: str = "auto",
+    http: str = "auto",
+    backlog: int = 2048,
+    keep_alive: int = 5,
+    limit_concurrency: int | None = None,
+    max_requests: int | None = None,
+    max_requests_jitter: int = 0,
+    graceful_timeout: int = 30,
 ):
-    _run(path, host, port, reload)
+    """
+    Serves the app from WORKERS processes (one per available CPU by default)
+    forked from one preloaded parent.
+    """
+
+    if reload:
+        return _run(path, host, port, reload)
+
+    from project.core.prefork import PreforkServer, available_cpus
+
+    workers = workers or available_cpus()
+    if workers > 1 and settings.THROTTLE_BACKEND == "memory":
+        echo(
+            f"THROTTLE_BACKEND=memory counts login attempts per worker, {workers} "
+            "workers would allow each limit that many times. Set "
+            "THROTTLE_BACKEND=redis or run with --workers 1.",
+            err=True,
+        )
+        raise Exit(1)
+
+    # "auto" already prefers them, resolved here only to report the choice
+    if loop == "auto":
+        loop = "uvloop" if find_spec("uvloop") else "asyncio"
+    if http == "auto":
+        http = "httptools" if find_spec("httptools") else "h11"
+
+    config = uvicorn.Config(
+        get_asgi_string(path or MANAGE_PY_PATH),
+        host=host,
+        port=port,
+        loop=loop,  # type: ignore
+        http=http,  # type: ignore
+        backlog=backlog,
+        timeout_keep_alive=keep_alive,
+        limit_concurrency=limit_concurrency,
+        timeout_graceful_shutdown=graceful_timeout,
+        access_log=False,
+    )
+    metrics_dir = None
+    if settings.METRICS_ENABLED:
+        from project.core.metrics import SharedMetrics
+
+        # workers merge their metrics through files, any of them answers a scrape
+        if settings.METRICS_MULTIPROCESS_DIR is None:
+            metrics_dir = Path(tempfile.mkdtemp(prefix="metrics-"))
+            settings.METRICS_MULTIPROCESS_DIR = metrics_dir
+        SharedMetrics(settings.METRICS_MULTIPROCESS_DIR).clear()
+
+    server = PreforkServer(
+        config,
+        workers=workers,
+        max_requests=max_requests,
+        max_requests_jitter=max_requests_jitter,
+    )
+    try:
+        code = server.run()
+    finally:
+        if metrics_dir is not None:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+    raise Exit(code)
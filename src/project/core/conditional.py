@@ -0,0 +1,166 @@
+import hashlib
+import inspect
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+__REQUEST_PARAM__ = "_view__request"
+__RESPONSE_PARAM__ = "_view__response"
+
+
+def _digest(value: bytes) -> str:
+    return hashlib.blake2b(value, digest_size=16).hexdigest()
+
+
+def _opaque_tag(tag: str) -> str:
+    return tag.removeprefix("W/")
+
+
+class ConditionalGet:
+    """
+    ETag / Last-Modified handling for a GET endpoint.
+
+    `etag=True` hashes the serialized body, the response is then rendered here
+    once instead of by FastAPI. `etag="<attr>"` builds a weak ETag from the
+    object id and that attribute (e.g. `updated_at`), so a 304 is answered
+    without serializing anything. `last_modified` names a datetime attribute.
+    """
+
+    def __init__(
+        self,
+        etag: bool | str = False,
+        last_modified: str | None = None,
+        cache_control: str | None = None,
+        route_kwargs: dict[str, Any] | None = None,
+    ):
+        route_kwargs = route_kwargs or {}
+        self.etag = etag
+        self.last_modified = last_modified
+        self.cache_control = cache_control
+
+        self.adapter: TypeAdapter | None = None
+        if etag is True:
+            response_model = route_kwargs.get("response_model")
+            if response_model is None:
+                raise ValueError("etag=True requires a response_model")
+            self.adapter = TypeAdapter(response_model)
+            self.dump_kwargs = {
+                "include": route_kwargs.get("response_model_include"),
+                "exclude": route_kwargs.get("response_model_exclude"),
+                "by_alias": route_kwargs.get("response_model_by_alias", True),
+                "exclude_unset": route_kwargs.get("response_model_exclude_unset", False),
+                "exclude_defaults": route_kwargs.get(
+                    "response_model_exclude_defaults", False
+                ),
+                "exclude_none": route_kwargs.get("response_model_exclude_none", False),
+            }
+
+    def wrap(self, endpoint: Callable) -> Callable:
+        signature = inspect.signature(endpoint)
+        new_signature = signature.replace(
+            parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(
+                    __REQUEST_PARAM__, inspect.Parameter.KEYWORD_ONLY, annotation=Request
+                ),
+                inspect.Parameter(
+                    __RESPONSE_PARAM__, inspect.Parameter.KEYWORD_ONLY, annotation=Response
+                ),
+            ]
+        )
+
+        if inspect.iscoroutinefunction(endpoint):
+
+            async def new_func(**kwargs):
+                request = kwargs.pop(__REQUEST_PARAM__)
+                response = kwargs.pop(__RESPONSE_PARAM__)
+                return self.respond(request, response, await endpoint(**kwargs))
+
+        else:
+
+            def new_func(**kwargs):
+                request = kwargs.pop(__REQUEST_PARAM__)
+                response = kwargs.pop(__RESPONSE_PARAM__)
+                return self.respond(request, response, endpoint(**kwargs))
+
+        new_func.__signature__ = new_signature  # type: ignore
+        new_func.__name__ = endpoint.__name__
+        new_func.__qualname__ = endpoint.__qualname__
+        new_func.__doc__ = endpoint.__doc__
+        return new_func
+
+    def respond(self, request: Request, response: Response, result: Any) -> Any:
+        if result is None or isinstance(result, Response):
+            return result
+
+        headers: dict[str, str] = {}
+        if self.cache_control:
+            headers["cache-control"] = self.cache_control
+
+        modified = self._modified(result)
+        if modified is not None:
+            headers["last-modified"] = format_datetime(modified, usegmt=True)
+
+        body: bytes | None = None
+        tag: str | None = None
+        if self.adapter is not None:
+            body = self.adapter.dump_json(
+                self.adapter.validate_python(result, from_attributes=True),
+                **self.dump_kwargs,
+            )
+            tag = f'"{_digest(body)}"'
+        elif self.etag:
+            identity = (type(result).__name__, getattr(result, "id", None))
+            version = f"{identity}:{getattr(result, self.etag)}"  # type: ignore
+            tag = f'W/"{_digest(version.encode())}"'
+
+        if tag is not None:
+            headers["etag"] = tag
+
+        if self._not_modified(request, tag, modified):
+            return Response(status_code=304, headers=headers)
+
+        if body is not None:
+            return Response(body, media_type="application/json", headers=headers)
+
+        response.headers.update(headers)
+        return result
+
+    def _modified(self, result: Any) -> datetime | None:
+        if self.last_modified is None:
+            return None
+
+        value = getattr(result, self.last_modified, None)
+        if not isinstance(value, datetime):
+            return None
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).replace(microsecond=0)
+
+    @staticmethod
+    def _not_modified(
+        request: Request, tag: str | None, modified: datetime | None
+    ) -> bool:
+        # If-None-Match wins over If-Modified-Since when both are sent
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            if tag is None:
+                return False
+            if if_none_match.strip() == "*":
+                return True
+            return _opaque_tag(tag) in {
+                _opaque_tag(candidate.strip()) for candidate in if_none_match.split(",")
+            }
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return modified <= since
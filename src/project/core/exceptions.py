@@ -1,5 +1,5 @@
 from project.config import settings
-from fastapi.responses import JSONResponse
+from .responses import FastJSONResponse
 from fastapi import FastAPI, Request
 from starlette import status as http_status
 
@@ -27,7 +27,9 @@ class BackendException(Exception):
             "debug": self.debug if settings.DEBUG else None,
         }
 
-        error = JSONResponse(status_code=self.code, content=payload)
+        error = FastJSONResponse(
+            status_code=self.code, content=payload, headers=self.headers or None
+        )
         return error
 
 
@@ -1,15 +1,99 @@
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import queue
+import random
+import re
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import sys
 import colorlog
 from project.config import settings
 from pathlib import Path
 
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": ANSI_ESCAPE.sub("", record.getMessage()),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a fraction of records per level, e.g. `{"DEBUG": 0.1}`.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = {
+            logging.getLevelName(level.upper()): rate for level, rate in rates.items()
+        }
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(record.levelno)
+        return rate is None or rate >= 1 or random.random() < rate
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Queue handler that drops records instead of blocking when the queue is full.
+    """
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listeners: set[QueueListener] = set()
+
+
+def _start_listener(
+    queue_handler: QueueHandler, handlers: list[logging.Handler]
+) -> QueueListener:
+    queue_handler.queue = queue.Queue(settings.LOGGER_QUEUE_SIZE)
+    listener = QueueListener(
+        queue_handler.queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    _listeners.add(listener)
+    return listener
+
+
+def flush_logs():
+    """
+    Stops the background listeners once they wrote every queued record, for
+    processes leaving with `os._exit`, which skips `atexit`.
+    """
+
+    while _listeners:
+        listener = _listeners.pop()
+        atexit.unregister(listener.stop)
+        listener.stop()
+
+
 def setup_logger(
     name: str = "fastapi_app", log_file: str | Path = "app.log"
 ) -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+
+    if logger.handlers:
+        return logger
 
     color_formatter = colorlog.ColoredFormatter(
         fmt="%(log_color)s[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s",
@@ -27,23 +111,50 @@ def setup_logger(
         "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s", "%Y-%m-%d %H:%M:%S"
     )
 
+    if settings.LOGGER_JSON:
+        color_formatter = file_formatter = JSONFormatter(datefmt="%Y-%m-%dT%H:%M:%S%z")
+
+    handlers: list[logging.Handler] = []
+
     # Console with colors
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.DEBUG)
-    console_handler.setFormatter(color_formatter)
+    if settings.LOGGER_OUT_IN_CONSOLE:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(logging.DEBUG)
+        console_handler.setFormatter(color_formatter)
+        handlers.append(console_handler)
 
     # File handler without color
-    file_handler = RotatingFileHandler(log_file, maxBytes=5_000_000, backupCount=5)
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(file_formatter)
+    if settings.LOGGER_OUT_IN_FILE:
+        # the file is only opened by the first record, not at import
+        file_handler = RotatingFileHandler(
+            log_file, maxBytes=5_000_000, backupCount=5, delay=True
+        )
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(file_formatter)
+        handlers.append(file_handler)
 
-    if not logger.handlers:
-        if settings.LOGGER_OUT_IN_CONSOLE:
-            logger.addHandler(console_handler)
-        if settings.LOGGER_OUT_IN_FILE:
-            logger.addHandler(file_handler)
+    if settings.LOGGER_SAMPLING:
+        logger.addFilter(SamplingFilter(settings.LOGGER_SAMPLING))
+
+    if settings.LOGGER_ASYNC and handlers:
+        # handlers run in a background thread, the caller only enqueues records
+        queue_handler = DroppingQueueHandler(queue.Queue())
+        listener = _start_listener(queue_handler, handlers)
+        logger.addHandler(queue_handler)
+
+        def restart_listener():
+            # threads do not survive fork, a forked worker starts its own
+            # listener on a new queue (the old one's lock may be held)
+            nonlocal listener
+            atexit.unregister(listener.stop)
+            _listeners.discard(listener)
+            listener = _start_listener(queue_handler, handlers)
+
+        os.register_at_fork(after_in_child=restart_listener)
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
 
-    logger.propagate = False
     return logger
 
 
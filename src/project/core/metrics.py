@@ -0,0 +1,354 @@
+import bisect
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any, Callable, ClassVar, Iterable
+
+LabelValues = tuple[str, ...]
+State = dict[LabelValues, Any]
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}" if pairs else ""
+
+
+class Metric:
+    """
+    Base metric with a fixed set of label names.
+
+    Metrics are updated from the event loop thread only, so no locking is done.
+    """
+
+    type: ClassVar[str]
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        registry: "Registry | None" = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def state(self) -> State:
+        """
+        Current value per label set, in the form `merge` and `samples` take.
+        """
+        raise NotImplementedError
+
+    def merge(self, states: Iterable[State]) -> State:
+        merged: State = {}
+        for state in states:
+            for key, value in state.items():
+                merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def samples(self, state: State) -> Iterable[tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self, state: State | None = None) -> str:
+        lines = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        lines.extend(
+            f"{name}{labels} {_format_value(value)}"
+            for name, labels, value in self.samples(
+                self.state() if state is None else state
+            )
+        )
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        self._values: dict[LabelValues, float] = {}
+        super().__init__(*args, **kwargs)
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def state(self) -> State:
+        return dict(self._values)
+
+    def samples(self, state: State):
+        for key, value in state.items():
+            yield f"{self.name}_total", _format_labels(self.labelnames, key), value
+
+
+class Gauge(Metric):
+    """
+    Gauge set directly or, with `callback`, read on every scrape.
+
+    The callback returns `{label values: value}`.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        *args,
+        callback: Callable[[], dict[LabelValues, float]] | None = None,
+        **kwargs,
+    ):
+        self._values: dict[LabelValues, float] = {}
+        self.callback = callback
+        super().__init__(*args, **kwargs)
+
+    def set(self, value: float, **labels: str):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str):
+        self.inc(-amount, **labels)
+
+    def state(self) -> State:
+        return dict(self.callback() if self.callback is not None else self._values)
+
+    def samples(self, state: State):
+        for key, value in state.items():
+            yield self.name, _format_labels(self.labelnames, key), value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, *args, buckets: Iterable[float] = DEFAULT_BUCKETS, **kwargs):
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket (non-cumulative) + overflow, sum]
+        self._values: dict[LabelValues, tuple[list[int], list[float]]] = {}
+        super().__init__(*args, **kwargs)
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1][0] += value
+
+    def state(self) -> State:
+        return {
+            key: (list(counts), total[0]) for key, (counts, total) in self._values.items()
+        }
+
+    def merge(self, states: Iterable[State]) -> State:
+        merged: State = {}
+        for state in states:
+            for key, (counts, total) in state.items():
+                if key not in merged:
+                    merged[key] = (list(counts), total)
+                    continue
+                merged_counts, merged_total = merged[key]
+                for idx, count in enumerate(counts):
+                    merged_counts[idx] += count
+                merged[key] = (merged_counts, merged_total + total)
+        return merged
+
+    def samples(self, state: State):
+        for key, (counts, total) in state.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                labels = _format_labels(
+                    (*self.labelnames, "le"), (*key, _format_value(bound))
+                )
+                yield f"{self.name}_bucket", labels, cumulative
+
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self.metrics[metric.name] = metric
+
+    def collect(self) -> dict[str, State]:
+        return {name: metric.state() for name, metric in self.metrics.items()}
+
+    def render(self, states: dict[str, State] | None = None) -> str:
+        if states is None:
+            states = self.collect()
+        return (
+            "\n".join(
+                metric.render(states.get(name, {}))
+                for name, metric in self.metrics.items()
+            )
+            + "\n"
+        )
+
+
+REGISTRY = Registry()
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class SharedMetrics:
+    """
+    Metrics of every worker process of one server, merged on scrape.
+
+    Each worker writes its state to `<directory>/<pid>.json` periodically and
+    before it answers a scrape, which renders the sum over all files, so any
+    worker can be scraped. Counters and histograms of exited workers stay in
+    the sum so totals never go down, gauges only count running workers.
+    """
+
+    def __init__(self, directory: Path, registry: Registry = REGISTRY):
+        self.directory = Path(directory)
+        self.registry = registry
+
+    def write(self) -> None:
+        # read the pid on every write, the instance is created before forking
+        pid = os.getpid()
+        states = {
+            name: [[list(key), value] for key, value in state.items()]
+            for name, state in self.registry.collect().items()
+        }
+        path = self.directory / f"{pid}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"pid": pid, "metrics": states}))
+        os.replace(tmp_path, path)
+
+    def collect(self) -> dict[str, State]:
+        states: dict[str, list[State]] = {name: [] for name in self.registry.metrics}
+        for path in self.directory.glob("*.json"):
+            try:
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue  # removed or replaced meanwhile
+            alive = _process_alive(snapshot["pid"])
+            for name, items in snapshot["metrics"].items():
+                metric = self.registry.metrics.get(name)
+                if metric is None or (metric.type == "gauge" and not alive):
+                    continue
+                states[name].append(
+                    {tuple(key): _load_value(metric, value) for key, value in items}
+                )
+
+        return {
+            name: self.registry.metrics[name].merge(items)
+            for name, items in states.items()
+        }
+
+    def render(self) -> str:
+        self.write()
+        return self.registry.render(self.collect())
+
+    def clear(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+def _load_value(metric: Metric, value: Any) -> Any:
+    # histogram states are (bucket counts, sum), JSON turns the tuple into a list
+    return tuple(value) if metric.type == "histogram" else value
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# HTTP
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight", "Requests currently being handled", ("method",)
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ("method", "route", "status"),
+)
+
+# Auth
+auth_login = Counter("auth_login", "Login attempts by result", ("result",))
+auth_login_duration = Histogram(
+    "auth_login_duration_seconds", "Login latency including password check"
+)
+password_hash_duration = Histogram(
+    "password_hash_duration_seconds",
+    "Time spent hashing or verifying a password, queueing included",
+    ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+password_hash_rejected = Counter(
+    "password_hash_rejected", "Password operations rejected because the pool was full"
+)
+
+
+def _pool_stats(engines) -> dict[LabelValues, float]:
+    stats = {}
+    for name, engine in engines.items():
+        pool = engine.pool
+        for stat in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, stat, None)
+            if method is not None:
+                # QueuePool reports unused base capacity as negative overflow
+                stats[(name, stat)] = max(method(), 0)
+    return stats
+
+
+def register_pool_metrics(engines: dict, registry: Registry | None = None) -> Gauge:
+    """
+    Exposes `size`, `checkedin`, `checkedout` and `overflow` of every engine pool.
+    """
+
+    return Gauge(
+        "db_pool_connections",
+        "SQLAlchemy pool state per engine",
+        ("engine", "state"),
+        callback=lambda: _pool_stats(engines),
+        registry=registry,
+    )
+
+
+__all__ = [
+    "CONTENT_TYPE",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Registry",
+    "REGISTRY",
+    "SharedMetrics",
+    "register_pool_metrics",
+]
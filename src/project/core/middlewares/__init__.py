@@ -1,3 +1,5 @@
 from .loging import LoggingMiddleware
+from .metrics import MetricsMiddleware
+from .query_stats import QueryStatsMiddleware
 
-__all__ = ["LoggingMiddleware"]
+__all__ = ["LoggingMiddleware", "MetricsMiddleware", "QueryStatsMiddleware"]
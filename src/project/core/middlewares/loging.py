@@ -1,44 +1,92 @@
 # middlewares/logging_middleware.py
 
+import logging
+import random
 import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 from colorama import Fore, Style
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from project.config import settings
 from project.core.logger import log
 
+_METHOD_COLORS = {
+    "GET": Fore.CYAN,
+    "POST": Fore.GREEN,
+    "PUT": Fore.MAGENTA,
+    "PATCH": Fore.YELLOW,
+    "DELETE": Fore.RED,
+}
+_STATUS_COLORS = {2: Fore.GREEN, 3: Fore.CYAN, 4: Fore.YELLOW}
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        response = await call_next(request)
-        duration = (time.time() - start_time) * 1000  # ms
+COLORED_METHODS = {
+    method: f"{color}{method}{Style.RESET_ALL}" for method, color in _METHOD_COLORS.items()
+}
+COLORED_STATUSES = {
+    status: f"{_STATUS_COLORS.get(status // 100, Fore.RED)}{status}{Style.RESET_ALL}"
+    for status in range(100, 600)
+}
 
-        method = self._color_method(request.method)
-        status = self._color_status(response.status_code)
-        url = f"{request.url.path}" + (f"?{request.url.query}" if request.url.query else '')
-        if request.client:
-            client_ip = request.client.host
+
+class LoggingMiddleware:
+    """
+    Access log middleware working on raw ASGI messages.
+
+    The response is streamed through untouched, only the status code is read
+    from `http.response.start`. Successful fast requests are logged with
+    `sample_rate` probability, errors and slow requests are always logged.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = settings.ACCESS_LOG_SAMPLE_RATE,
+        slow_request_ms: float = settings.ACCESS_LOG_SLOW_REQUEST_MS,
+        colored: bool = settings.ACCESS_LOG_COLORED,
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_request_ms = slow_request_ms
+        self.methods = COLORED_METHODS if colored else {}
+        self.statuses = COLORED_STATUSES if colored else {}
+        self.client_format = f"{Fore.BLUE}%s{Style.RESET_ALL}" if colored else "%s"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not log.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = (time.perf_counter() - start_time) * 1000  # ms
+            if (
+                status_code >= 500
+                or duration >= self.slow_request_ms
+                or self.sample_rate >= 1
+                or random.random() < self.sample_rate
+            ):
+                self._log(scope, status_code, duration)
+
+    def _log(self, scope: Scope, status_code: int, duration: float):
+        method = scope["method"]
+        url = scope["path"]
+        if scope["query_string"]:
+            url = f"{url}?{scope['query_string'].decode('latin-1')}"
+        client = scope.get("client")
 
         log.info(
-            f"{method} {url} - {status} - {duration:.1f}ms - {Fore.BLUE}{client_ip}{Style.RESET_ALL}"
+            "%s %s - %s - %.1fms - " + self.client_format,
+            self.methods.get(method, method),
+            url,
+            self.statuses.get(status_code, status_code),
+            duration,
+            client[0] if client else "-",
         )
-        return response
-
-    def _color_method(self, method: str) -> str:
-        return {
-            "GET": f"{Fore.CYAN}GET{Style.RESET_ALL}",
-            "POST": f"{Fore.GREEN}POST{Style.RESET_ALL}",
-            "PUT": f"{Fore.MAGENTA}PUT{Style.RESET_ALL}",
-            "PATCH": f"{Fore.YELLOW}PATCH{Style.RESET_ALL}",
-            "DELETE": f"{Fore.RED}DELETE{Style.RESET_ALL}",
-        }.get(method.upper(), method)
-
-    def _color_status(self, status_code: int) -> str:
-        if 200 <= status_code < 300:
-            return f"{Fore.GREEN}{status_code}{Style.RESET_ALL}"
-        elif 300 <= status_code < 400:
-            return f"{Fore.CYAN}{status_code}{Style.RESET_ALL}"
-        elif 400 <= status_code < 500:
-            return f"{Fore.YELLOW}{status_code}{Style.RESET_ALL}"
-        else:
-            return f"{Fore.RED}{status_code}{Style.RESET_ALL}"
@@ -0,0 +1,46 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from project.core.metrics import http_request_duration, http_requests_in_flight
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Records in-flight requests and latency per route template.
+
+    The route is read from `scope["route"]` after routing, so `/users/{id}` is a
+    single series no matter how many ids are requested. Unrouted paths share one
+    series to keep the label cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc(method=method)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec(method=method)
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - start_time,
+                method=method,
+                route=getattr(route, "path", UNMATCHED_ROUTE),
+                status=status_code,
+            )
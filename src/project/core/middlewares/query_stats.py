@@ -0,0 +1,78 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from project.config import settings
+from project.core.logger import log
+from project.core.query_stats import (
+    QueryStats,
+    current_query_stats,
+    shorten_statement,
+)
+
+
+class QueryStatsMiddleware:
+    """
+    Collects SQL statistics per request.
+
+    Statements repeated `SQL_N_PLUS_ONE_THRESHOLD` times within one request are
+    logged as a likely N+1. With `headers=True` (debug by default) the query count
+    and DB time are sent back in `X-DB-Query-Count` and `Server-Timing`, and a
+    summary with the slowest statements is logged.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        headers: bool = settings.DEBUG,
+        n_plus_one_threshold: int = settings.SQL_N_PLUS_ONE_THRESHOLD,
+    ):
+        self.app = app
+        self.headers = headers
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message: Message):
+            if self.headers and message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["x-db-query-count"] = str(stats.count)
+                headers.append(
+                    "server-timing", f'db;dur={stats.total_time * 1000:.2f};desc="SQL"'
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            self._report(scope, stats)
+
+    def _report(self, scope: Scope, stats: QueryStats):
+        route = getattr(scope.get("route"), "path", scope["path"])
+
+        for statement, count in stats.repeated(self.n_plus_one_threshold).items():
+            log.warning(
+                "Possible N+1 in %s %s: statement executed %d times: %s",
+                scope["method"],
+                route,
+                count,
+                shorten_statement(statement),
+            )
+
+        if self.headers and stats.count:
+            log.debug(
+                "%s %s - %d queries in %.1fms, slowest: %s",
+                scope["method"],
+                route,
+                stats.count,
+                stats.total_time * 1000,
+                "; ".join(
+                    f"{duration * 1000:.1f}ms {shorten_statement(statement, 120)}"
+                    for duration, statement in stats.slowest
+                ),
+            )
@@ -0,0 +1,110 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack
+from typing import Any
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from project.config import settings
+from .logger import log
+from .metrics import Counter, Histogram
+
+db_pool_checkout_wait = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to get a connection from the pool, connecting included",
+    ("engine",),
+)
+db_pool_timeouts = Counter(
+    "db_pool_timeouts", "Checkouts that gave up after the pool timeout", ("engine",)
+)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waited.
+
+    Checkouts slower than `DATABASE_POOL_SLOW_CHECKOUT_MS` are logged, they mean
+    the pool is too small for the load (or the database is slow to connect).
+    """
+
+    slow_checkout: float = settings.DATABASE_POOL_SLOW_CHECKOUT_MS / 1000
+
+    def connect(self):
+        name = self._orig_logging_name or "pool"
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            db_pool_timeouts.inc(engine=name)
+            log.error(
+                "Connection pool '%s' exhausted: %d in use, %d overflow, timeout %.1fs",
+                name,
+                self.checkedout(),
+                max(self.overflow(), 0),
+                self._timeout,
+            )
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            db_pool_checkout_wait.observe(waited, engine=name)
+            if waited >= self.slow_checkout:
+                log.warning(
+                    "Slow connection checkout from '%s' pool: %.1fms (%d in use)",
+                    name,
+                    waited * 1000,
+                    self.checkedout(),
+                )
+
+
+def engine_options(name: str, url: Any) -> dict[str, Any]:
+    """
+    `create_async_engine` arguments for the writer or a reader from settings.
+    """
+
+    role = "WRITER" if name == "writer" else "READER"
+    url = make_url(str(url))
+
+    def option(key: str):
+        return getattr(settings, f"DATABASE_{role}_{key}")
+
+    options: dict[str, Any] = {
+        "url": url,
+        "pool_pre_ping": option("POOL_PRE_PING"),
+        "pool_recycle": option("POOL_RECYCLE"),
+        "pool_logging_name": name,
+    }
+
+    # in-memory sqlite needs its own single connection pool
+    if not (url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")):
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=option("POOL_SIZE"),
+            max_overflow=option("MAX_OVERFLOW"),
+            pool_timeout=option("POOL_TIMEOUT"),
+        )
+
+    if url.get_driver_name() == "asyncpg":
+        cache_size = option("STATEMENT_CACHE_SIZE")
+        # asyncpg's own cache and SQLAlchemy's cache of prepared statements,
+        # 0 disables both (required behind pgbouncer in transaction mode)
+        options["connect_args"] = {"statement_cache_size": cache_size}
+        options["url"] = url.update_query_dict(
+            {"prepared_statement_cache_size": str(cache_size)}
+        )
+
+    return options
+
+
+async def warm_pool(engine: AsyncEngine, size: int):
+    """
+    Opens `size` connections at once and returns them to the pool.
+    """
+
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(size))
+        )
+
+
+__all__ = ["TimedQueuePool", "engine_options", "warm_pool"]
@@ -0,0 +1,150 @@
+import gc
+import os
+import random
+import signal
+import sys
+import time
+import uvicorn
+from .logger import flush_logs, log
+
+# exit code of a worker whose lifespan startup failed, restarting it is pointless
+STARTUP_FAILURE = 3
+
+
+def available_cpus() -> int:
+    # CPUs this process may run on (container cpusets), not every host CPU
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class WorkerServer(uvicorn.Server):
+    """
+    A worker's uvicorn server, stopped gracefully once its parent is gone.
+
+    A SIGKILLed parent cannot stop its workers, they notice it within a second
+    instead of serving on as orphans.
+    """
+
+    def __init__(self, config: uvicorn.Config, parent: int):
+        super().__init__(config)
+        self.parent = parent
+
+    async def on_tick(self, counter: int) -> bool:
+        if counter % 10 == 0 and not self.should_exit and os.getppid() != self.parent:
+            log.warning(f"Parent process [{self.parent}] is gone, stopping worker")
+            self.should_exit = True
+        return await super().on_tick(counter)
+
+
+class PreforkServer:
+    """
+    Runs uvicorn in `workers` forked processes accepting on one shared socket.
+
+    The app is imported once in the parent and its objects are moved out of the
+    garbage collector's reach (`gc.freeze`) before forking, so workers share
+    those memory pages copy-on-write instead of importing the project each.
+    A worker that exits, e.g. after `max_requests` requests, is replaced, and
+    workers stop on their own if the parent dies.
+    """
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        workers: int,
+        max_requests: int | None = None,
+        max_requests_jitter: int = 0,
+    ):
+        self.config = config
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.children: dict[int, float] = {}
+        self.stopping = False
+
+    def _handle_stop(self, signum, frame):
+        self.stopping = True
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _serve(self, sock, parent: int) -> int:
+        # the terminal's Ctrl+C goes to the parent only, which stops workers
+        # gracefully with one SIGTERM each
+        os.setpgid(0, 0)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, signal.SIG_IGN)
+
+        if self.max_requests:
+            # jitter keeps workers from all restarting at the same moment
+            self.config.limit_max_requests = self.max_requests + random.randint(
+                0, self.max_requests_jitter
+            )
+
+        server = WorkerServer(self.config, parent)
+        server.run(sockets=[sock])
+        return 0 if server.started else STARTUP_FAILURE
+
+    def _spawn(self, sock):
+        parent = os.getpid()
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = self._serve(sock, parent)
+            except BaseException:
+                log.exception("Worker crashed")
+            finally:
+                # leave right here: unwinding would run the parent's code up the
+                # stack (the CLI, its cleanups) and its atexit handlers
+                flush_logs()
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        self.children[pid] = time.monotonic()
+
+    def run(self) -> int:
+        # preload, then keep the imported objects out of every future collection
+        self.config.load()
+        sock = self.config.bind_socket()
+        gc.collect()
+        gc.freeze()
+
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGTERM, self._handle_stop)
+
+        log.info(
+            f"Starting {self.workers} workers on {self.config.host}:{self.config.port} "
+            f"({self.config.loop}, {self.config.http}), parent process [{os.getpid()}]"
+        )
+        for _ in range(self.workers):
+            self._spawn(sock)
+
+        code = 0
+        while self.children:
+            pid, status = os.wait()
+            started = self.children.pop(pid, 0.0)
+            if self.stopping:
+                continue
+
+            if os.waitstatus_to_exitcode(status) == STARTUP_FAILURE:
+                log.error(f"Worker [{pid}] failed to start, stopping")
+                code = STARTUP_FAILURE
+                self._handle_stop(signal.SIGTERM, None)
+                continue
+
+            log.info(f"Worker [{pid}] exited, starting a new one")
+            if time.monotonic() - started < 1:
+                # do not spin on a worker that crashes right away
+                time.sleep(1)
+            if not self.stopping:
+                self._spawn(sock)
+
+        sock.close()
+        return code
+
+
+__all__ = ["PreforkServer", "available_cpus"]
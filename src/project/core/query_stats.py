@@ -0,0 +1,102 @@
+import heapq
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from project.config import settings
+from .logger import log
+from .metrics import Counter, Histogram
+
+db_query_duration = Histogram(
+    "db_query_duration_seconds", "SQL statement execution time", ("engine",)
+)
+db_slow_queries = Counter(
+    "db_slow_queries", "Statements slower than SQL_SLOW_QUERY_MS", ("engine",)
+)
+
+
+class QueryStats:
+    """
+    Statements executed while handling one request.
+    """
+
+    def __init__(self, keep_slowest: int = 5):
+        self.count = 0
+        self.total_time = 0.0
+        self.statements: dict[str, int] = {}
+        self.keep_slowest = keep_slowest
+        self._slowest: list[tuple[float, int, str]] = []
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.total_time += duration
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+        item = (duration, self.count, statement)
+        if len(self._slowest) < self.keep_slowest:
+            heapq.heappush(self._slowest, item)
+        elif duration > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
+
+    @property
+    def slowest(self) -> list[tuple[float, str]]:
+        return [
+            (duration, statement)
+            for duration, _, statement in sorted(self._slowest, reverse=True)
+        ]
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """
+        Statements executed at least `threshold` times, the usual N+1 shape.
+        """
+
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= threshold
+        }
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def shorten_statement(statement: str, limit: int = 300) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else f"{statement[:limit]}..."
+
+
+def instrument_engine(name: str, engine: AsyncEngine):
+    """
+    Times every statement on `engine`, logs slow ones and feeds `QueryStats`.
+    """
+
+    slow_query_time = settings.SQL_SLOW_QUERY_MS / 1000
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start"].pop()
+        db_query_duration.observe(duration, engine=name)
+
+        if duration >= slow_query_time:
+            db_slow_queries.inc(engine=name)
+            log.warning(
+                "Slow query on %s (%.1fms): %s", name, duration * 1000, shorten_statement(statement)
+            )
+
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.record(statement, duration)
+
+
+__all__ = [
+    "QueryStats",
+    "current_query_stats",
+    "instrument_engine",
+    "shorten_statement",
+]
@@ -0,0 +1,128 @@
+import asyncio
+import itertools
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from .logger import log
+
+# 0 on a primary or on a replica that replayed everything it received,
+# otherwise seconds since the last replayed transaction
+POSTGRES_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+            OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class Replica:
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.healthy = True
+        self.lag = 0.0
+        self.failures = 0
+
+        event.listen(engine.sync_engine, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        if context.is_disconnect:
+            self.eject("connection lost")
+
+    def eject(self, reason: str):
+        if self.healthy:
+            log.warning(f"Read replica '{self.name}' ejected: {reason}")
+        self.healthy = False
+        self.failures += 1
+
+    @property
+    def in_use(self) -> int:
+        checkedout = getattr(self.engine.pool, "checkedout", None)
+        return checkedout() if checkedout else 0
+
+
+class ReplicaSet:
+    """
+    Read replicas with background health and replication lag checks.
+
+    Replicas that fail a check, lose their connection or lag more than `max_lag`
+    seconds stop receiving reads until a later check succeeds.
+    """
+
+    def __init__(
+        self,
+        engines: dict[str, AsyncEngine],
+        max_lag: float = 10.0,
+        check_interval: float = 10.0,
+    ):
+        self.replicas = [Replica(name, engine) for name, engine in engines.items()]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._counter = itertools.count()
+        self._task: asyncio.Task | None = None
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def available(self) -> list[Replica]:
+        return [
+            replica
+            for replica in self.replicas
+            if replica.healthy and replica.lag <= self.max_lag
+        ]
+
+    def choose(self) -> Replica | None:
+        candidates = self.available()
+        if not candidates:
+            return None
+
+        # rotate the start so ties on pool usage are spread round-robin
+        offset = next(self._counter) % len(candidates)
+        candidates = candidates[offset:] + candidates[:offset]
+        return min(candidates, key=lambda replica: replica.in_use)
+
+    async def check(self, replica: Replica):
+        try:
+            async with asyncio.timeout(self.check_interval):
+                async with replica.engine.connect() as conn:
+                    if conn.dialect.name == "postgresql":
+                        lag = await conn.scalar(POSTGRES_LAG_QUERY)
+                    else:
+                        lag = await conn.scalar(text("SELECT 0"))
+        except Exception as e:
+            replica.eject(repr(e))
+            return
+
+        replica.lag = float(lag or 0)
+        if replica.lag > self.max_lag:
+            log.warning(
+                f"Read replica '{replica.name}' lags {replica.lag:.1f}s behind writer"
+            )
+        elif not replica.healthy:
+            log.info(f"Read replica '{replica.name}' is back in rotation")
+
+        replica.healthy = True
+        replica.failures = 0
+
+    async def check_all(self):
+        await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+
+    async def _run(self):
+        while True:
+            await self.check_all()
+            await asyncio.sleep(self.check_interval)
+
+    def start(self):
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
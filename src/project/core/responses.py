@@ -0,0 +1,58 @@
+import json
+from typing import Any, Callable
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+from project.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _orjson_dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)  # type: ignore
+
+
+def _pydantic_dumps(content: Any) -> bytes:
+    return to_json(content)
+
+
+def get_json_dumps(renderer: str) -> Callable[[Any], bytes]:
+    """
+    `auto` picks orjson when installed and pydantic-core's serializer otherwise,
+    both are several times faster than the stdlib on large pages.
+    """
+
+    if renderer == "auto":
+        renderer = "orjson" if orjson is not None else "pydantic"
+    if renderer == "orjson":
+        if orjson is None:
+            raise RuntimeError("JSON_RENDERER is 'orjson' but orjson is not installed")
+        return _orjson_dumps
+    if renderer == "pydantic":
+        return _pydantic_dumps
+    if renderer == "stdlib":
+        return _stdlib_dumps
+    raise ValueError(f"Unknown JSON_RENDERER '{renderer}'")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered by `JSON_RENDERER`, the default response class of
+    the app, `View` routes and `BackendException`.
+    """
+
+    dumps = staticmethod(get_json_dumps(settings.JSON_RENDERER))
+
+    def render(self, content: Any) -> bytes:
+        return self.dumps(content)
+
+
+__all__ = ["FastJSONResponse", "get_json_dumps"]
@@ -1,10 +1,11 @@
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi.security import HTTPAuthorizationCredentials, OAuth2PasswordBearer, HTTPBearer
 from project.config import settings
 from .exceptions import BackendException, http_status
 from project.services import AuthServiceDep
 from project.schemas.auth import AccessToken
 from enum import StrEnum
+from typing import Hashable, Iterable
 
 auth_key = OAuth2PasswordBearer(tokenUrl=settings.LOGIN_URL_ENDPOINT, auto_error=False)
 bearer = HTTPBearer(auto_error=False)
@@ -16,12 +17,179 @@ class Action(StrEnum):
     DELETE = "delete"
 
 
+def _normalize(value: str) -> str:
+    return value.lower().strip()
+
+
+class AuthorizationContext:
+    """
+    Token data shared by every policy evaluated during one request.
+    """
+
+    __slots__ = ("token", "role", "permissions", "results")
+
+    def __init__(self, token: AccessToken):
+        self.token = token
+        self.role = _normalize(token.role)
+        self.permissions = frozenset(map(_normalize, token.permissions))
+        self.results: dict[Hashable, bool] = {}
+
+    @classmethod
+    def from_request(cls, request: Request, token: AccessToken):
+        context = getattr(request.state, "authorization", None)
+        if context is None or context.token is not token:
+            context = cls(token)
+            request.state.authorization = context
+        return context
+
+
+class Policy:
+    """
+    Compiled form of an `Authorization` tree.
+    """
+
+    async def __call__(self, context: AuthorizationContext) -> bool:
+        return True
+
+
+class _CheckPolicy(Policy):
+    def __init__(self, authorization: "Authorization"):
+        self.authorization = authorization
+        self.key = ("check", id(authorization))
+
+    async def __call__(self, context: AuthorizationContext) -> bool:
+        result = context.results.get(self.key)
+        if result is None:
+            result = bool(await self.authorization.check(context.token))
+            context.results[self.key] = result
+        return result
+
+
+class _PermissionPolicy(Policy):
+    def __init__(self, permissions: Iterable[str], require_all: bool = True):
+        self.permissions = frozenset(permissions)
+        self.require_all = require_all
+
+    async def __call__(self, context: AuthorizationContext) -> bool:
+        if self.require_all:
+            return self.permissions <= context.permissions
+        return not self.permissions.isdisjoint(context.permissions)
+
+
+class _RolePolicy(Policy):
+    def __init__(self, roles: Iterable[str]):
+        self.roles = frozenset(roles)
+
+    async def __call__(self, context: AuthorizationContext) -> bool:
+        return context.role in self.roles
+
+
+class _AllPolicy(Policy):
+    def __init__(self, policies: Iterable[Policy]):
+        self.policies = tuple(policies)
+
+    async def __call__(self, context: AuthorizationContext) -> bool:
+        for policy in self.policies:
+            if not await policy(context):
+                return False
+        return True
+
+    @classmethod
+    def combine(cls, policies: Iterable[Policy]) -> Policy:
+        permissions: set[str] = set()
+        rest: list[Policy] = []
+
+        for policy in _flatten(cls, policies):
+            if isinstance(policy, _PermissionPolicy) and (
+                policy.require_all or len(policy.permissions) == 1
+            ):
+                permissions.update(policy.permissions)
+            elif type(policy) is not Policy:
+                rest.append(policy)
+
+        return _merge(cls, permissions, True, [], rest)
+
+
+class _AnyPolicy(Policy):
+    def __init__(self, policies: Iterable[Policy]):
+        self.policies = tuple(policies)
+
+    async def __call__(self, context: AuthorizationContext) -> bool:
+        for policy in self.policies:
+            if await policy(context):
+                return True
+        return False
+
+    @classmethod
+    def combine(cls, policies: Iterable[Policy]) -> Policy:
+        permissions: set[str] = set()
+        roles: set[str] = set()
+        rest: list[Policy] = []
+
+        for policy in _flatten(cls, policies):
+            if type(policy) is Policy:
+                return policy
+            if isinstance(policy, _PermissionPolicy) and (
+                not policy.require_all or len(policy.permissions) == 1
+            ):
+                permissions.update(policy.permissions)
+            elif isinstance(policy, _RolePolicy):
+                roles.update(policy.roles)
+            else:
+                rest.append(policy)
+
+        return _merge(cls, permissions, False, roles, rest)
+
+
+def _flatten(kind: type, policies: Iterable[Policy]):
+    for policy in policies:
+        if isinstance(policy, kind):
+            yield from _flatten(kind, policy.policies)  # type: ignore
+        else:
+            yield policy
+
+
+def _merge(
+    kind: type,
+    permissions: set[str],
+    require_all: bool,
+    roles: Iterable[str],
+    rest: list[Policy],
+) -> Policy:
+    # set lookups first, so custom checks only run when they can change the result
+    policies: list[Policy] = []
+    if permissions:
+        policies.append(_PermissionPolicy(permissions, require_all))
+    if roles:
+        policies.append(_RolePolicy(roles))
+    policies.extend(
+        sorted(rest, key=lambda policy: isinstance(policy, _CheckPolicy))
+    )
+
+    if not policies:
+        return Policy()
+    if len(policies) == 1:
+        return policies[0]
+    return kind(policies)
+
+
 class Authorization:
     resource: str | None = None
+    _policy: Policy | None = None
 
     async def check(self, token: AccessToken) -> bool:
         return True
 
+    def compile(self, resource: str | None = None) -> Policy:
+        if type(self).check is Authorization.check:
+            return Policy()
+        return _CheckPolicy(self)
+
+    def bind(self, resource: str | None = None):
+        self.resource = resource
+        self._policy = self.compile(resource)
+        return self
+
     def __or__(self, other: "Authorization"):
         return _OrPermissionCheck(self, other)
 
@@ -40,6 +208,7 @@ class Authorization:
 
     async def __call__(
         self,
+        request: Request,
         service: AuthServiceDep,
         auth_token: str | None = Depends(auth_key),
         bearer_token: HTTPAuthorizationCredentials | None = Depends(bearer)
@@ -50,7 +219,10 @@ class Authorization:
         
         token = service.decode_token(token)
 
-        check = await self.check(token)
+        if self._policy is None:
+            self._policy = self.compile(self.resource)
+
+        check = await self._policy(AuthorizationContext.from_request(request, token))
 
         if check:
             return token
@@ -65,9 +237,13 @@ class _OrPermissionCheck(Authorization):
         self.right = right
 
     async def check(self, token: AccessToken) -> bool:
-        left_result = await self.left.check(token)
-        right_result = await self.right.check(token)
-        return left_result or right_result
+        return await self.left.check(token) or await self.right.check(token)
+
+    def compile(self, resource: str | None = None) -> Policy:
+        resource = self.resource or resource
+        return _AnyPolicy.combine(
+            [self.left.compile(resource), self.right.compile(resource)]
+        )
 
 
 class _AndPermissionCheck(Authorization):
@@ -76,9 +252,13 @@ class _AndPermissionCheck(Authorization):
         self.right = right
 
     async def check(self, token: AccessToken) -> bool:
-        left_result = await self.left.check(token)
-        right_result = await self.right.check(token)
-        return left_result and right_result
+        return await self.left.check(token) and await self.right.check(token)
+
+    def compile(self, resource: str | None = None) -> Policy:
+        resource = self.resource or resource
+        return _AllPolicy.combine(
+            [self.left.compile(resource), self.right.compile(resource)]
+        )
 
 
 class HasRole(Authorization):
@@ -86,7 +266,12 @@ class HasRole(Authorization):
         self.role = role
 
     async def check(self, token: AccessToken) -> bool:
-        return self.role.lower().strip() == token.role.lower().strip()
+        return _normalize(self.role) == _normalize(token.role)
+
+    def compile(self, resource: str | None = None) -> Policy:
+        if type(self).check is not HasRole.check:
+            return _CheckPolicy(self)
+        return _RolePolicy([_normalize(self.role)])
 
 
 class HasPermission(Authorization):
@@ -94,9 +279,14 @@ class HasPermission(Authorization):
         self.action = action
 
     async def check(self, token: AccessToken) -> bool:
-        return f"{self.resource}:{self.action}" in list(
-            map(lambda x: x.lower().strip(), token.permissions)
-        )
+        permission = _normalize(f"{self.resource}:{self.action}")
+        return any(_normalize(x) == permission for x in token.permissions)
+
+    def compile(self, resource: str | None = None) -> Policy:
+        if type(self).check is not HasPermission.check:
+            return _CheckPolicy(self)
+        resource = self.resource or resource
+        return _PermissionPolicy([_normalize(f"{resource}:{self.action}")])
 
 
 def to_user(instance: Authorization):
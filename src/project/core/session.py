@@ -1,3 +1,4 @@
+import os
 from typing import Annotated
 
 from fastapi import Depends
@@ -6,18 +7,64 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sess
 from sqlalchemy.orm import Session
 from project.config import settings
 from .logger import log
+from .metrics import register_pool_metrics
+from .pool import engine_options
+from .query_stats import instrument_engine
+from .replicas import ReplicaSet
 
 engines = {
-    "writer": create_async_engine(str(settings.DATABASE_URL), pool_recycle=3600),
-    "reader": create_async_engine(str(settings.DATABASE_URL), pool_recycle=3600),
+    "writer": create_async_engine(**engine_options("writer", settings.DATABASE_URL)),
 }
+for idx, url in enumerate(settings.DATABASE_REPLICA_URLS):
+    engines[f"reader_{idx}"] = create_async_engine(
+        **engine_options(f"reader_{idx}", url)
+    )
+
+replicas = ReplicaSet(
+    {name: engine for name, engine in engines.items() if name != "writer"},
+    max_lag=settings.DATABASE_REPLICA_MAX_LAG,
+    check_interval=settings.DATABASE_REPLICA_CHECK_INTERVAL,
+)
+
+
+def _reset_pools_after_fork():
+    # a forked worker must not reuse connections opened by its parent
+    for engine in engines.values():
+        engine.sync_engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_reset_pools_after_fork)
+register_pool_metrics(engines)
+if settings.SQL_INSTRUMENTATION:
+    for name, engine in engines.items():
+        instrument_engine(name, engine)
 
 
 class RoutingSession(Session):
+    """
+    Sends writes to the writer and reads to one replica per session.
+
+    Once the session writes (or locks rows), every later statement goes to the
+    writer as well, so a request always reads its own writes.
+    """
+
     def get_bind(self, mapper=None, clause=None, **kwargs):
-        if self._flushing or isinstance(clause, (Update, Delete, Insert)):
+        if (
+            self._flushing
+            or isinstance(clause, (Update, Delete, Insert))
+            or getattr(clause, "_for_update_arg", None) is not None
+        ):
+            self.info["use_writer"] = True
+
+        if self.info.get("use_writer") or not replicas:
             return engines["writer"].sync_engine
-        return engines["reader"].sync_engine
+
+        replica = self.info.get("replica")
+        if replica is None or not replica.healthy:
+            replica = self.info["replica"] = replicas.choose()
+        if replica is None:
+            return engines["writer"].sync_engine
+        return replica.engine.sync_engine
 
 
 session_factory = async_sessionmaker(
@@ -26,9 +73,24 @@ session_factory = async_sessionmaker(
 
 
 async def get_session():
+    """
+    Request scoped session working as a unit of work.
+
+    Repositories only flush, everything the request wrote is committed here in
+    one transaction before the response is sent, or rolled back on error. With
+    `DB_UNIT_OF_WORK=False` repositories commit on every call instead.
+    """
     async with session_factory() as session:
+        session.info["unit_of_work"] = settings.DB_UNIT_OF_WORK
         try:
             yield session
+            if (
+                session.info.pop("dirty", False)
+                or session.new
+                or session.dirty
+                or session.deleted
+            ):
+                await session.commit()
         except Exception as e:
             await session.rollback()
             log.error(e)
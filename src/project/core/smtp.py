@@ -0,0 +1,221 @@
+import os
+import queue
+import smtplib
+import ssl
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from email.message import EmailMessage
+from project.config import settings
+from .logger import log
+
+# the connection is unusable after these, everything else is about one message
+DISCONNECT_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+MESSAGE_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+)
+
+
+class SMTPDeliveryError(Exception):
+    """
+    Raised when the server stays unreachable, `sent` messages of the batch
+    were delivered before that.
+    """
+
+    def __init__(self, sent: int, cause: Exception):
+        super().__init__(f"SMTP delivery stopped after {sent} messages: {cause!r}")
+        self.sent = sent
+        self.cause = cause
+
+    def __reduce__(self):
+        return self.__class__, (self.sent, self.cause)
+
+
+class _Connection:
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+    def close(self):
+        try:
+            self.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self.smtp.close()
+
+
+class SMTPConnectionPool:
+    """
+    Persistent, authenticated SMTP connections shared by the tasks of a worker
+    process.
+
+    Connections are opened lazily up to `size`, checked with NOOP when idle for
+    more than `idle_check` seconds and replaced after `max_messages` messages,
+    as most servers limit messages per session. A forked child never reuses the
+    parent's sockets.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        use_ssl: bool = True,
+        starttls: bool = False,
+        timeout: float = 10.0,
+        size: int = 4,
+        max_messages: int = 100,
+        idle_check: float = 30.0,
+        max_reconnects: int = 3,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.starttls = starttls
+        self.timeout = timeout
+        self.size = size
+        self.max_messages = max_messages
+        self.idle_check = idle_check
+        self.max_reconnects = max_reconnects
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._idle: queue.LifoQueue[_Connection] = queue.LifoQueue()
+        self._opened = 0
+
+    def _connect(self) -> _Connection:
+        context = ssl.create_default_context()
+        if self.use_ssl:
+            smtp: smtplib.SMTP = smtplib.SMTP_SSL(
+                self.host, self.port, timeout=self.timeout, context=context
+            )
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                smtp.starttls(context=context)
+        if self.username:
+            smtp.login(self.username, self.password)
+        return _Connection(smtp)
+
+    def _alive(self, connection: _Connection) -> bool:
+        if time.monotonic() - connection.last_used < self.idle_check:
+            return True
+        try:
+            return connection.smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _acquire(self) -> _Connection:
+        if self._pid != os.getpid():
+            self._reset()
+
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_open = self._opened < self.size
+                    if can_open:
+                        self._opened += 1
+
+                if can_open:
+                    try:
+                        return self._connect()
+                    except BaseException:
+                        with self._lock:
+                            self._opened -= 1
+                        raise
+
+                connection = self._idle.get(timeout=self.timeout)
+
+            if self._alive(connection):
+                return connection
+            self._discard(connection)
+
+    def _release(self, connection: _Connection):
+        connection.last_used = time.monotonic()
+        if connection.sent >= self.max_messages:
+            self._discard(connection)
+        else:
+            self._idle.put(connection)
+
+    def _discard(self, connection: _Connection):
+        connection.close()
+        with self._lock:
+            self._opened -= 1
+
+    @contextmanager
+    def connection(self):
+        connection = self._acquire()
+        try:
+            yield connection
+        except DISCONNECT_ERRORS:
+            self._discard(connection)
+            raise
+        except BaseException:
+            self._release(connection)
+            raise
+        else:
+            self._release(connection)
+
+    def send_many(
+        self, messages: list[EmailMessage]
+    ) -> list[tuple[EmailMessage, Exception]]:
+        """
+        Sends messages in order over pooled connections, reconnecting when the
+        server drops the session. Returns messages the server refused.
+        """
+
+        pending = deque(messages)
+        failed: list[tuple[EmailMessage, Exception]] = []
+        reconnects = 0
+
+        while pending:
+            try:
+                with self.connection() as connection:
+                    while pending and connection.sent < self.max_messages:
+                        try:
+                            connection.smtp.send_message(pending[0])
+                        except MESSAGE_ERRORS as e:
+                            failed.append((pending[0], e))
+                        pending.popleft()
+                        connection.sent += 1
+            except (*DISCONNECT_ERRORS, smtplib.SMTPConnectError, queue.Empty) as e:
+                reconnects += 1
+                if reconnects > self.max_reconnects:
+                    raise SMTPDeliveryError(len(messages) - len(pending), e) from e
+                log.warning(f"SMTP connection lost, reconnecting ({reconnects}): {e!r}")
+                time.sleep(0.1 * 2**reconnects)
+
+        return failed
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+smtp_pool = SMTPConnectionPool(
+    settings.SMTP_HOST,
+    settings.SMTP_PORT,
+    username=settings.SMTP_LOGIN,
+    password=settings.SMTP_PASSWORD,
+    use_ssl=settings.SMTP_USE_SSL,
+    starttls=settings.SMTP_STARTTLS,
+    timeout=settings.SMTP_TIMEOUT,
+    size=settings.SMTP_POOL_SIZE,
+    max_messages=settings.SMTP_MAX_MESSAGES_PER_CONNECTION,
+)
+
+
+__all__ = ["SMTPConnectionPool", "SMTPDeliveryError", "smtp_pool"]
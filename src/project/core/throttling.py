@@ -0,0 +1,188 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Protocol
+from project.config import settings
+from .exceptions import BackendException, http_status
+
+
+class IThrottleBackend(Protocol):
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        """
+        Counts one attempt, returns 0 if it is within `limit` per sliding
+        `window` seconds, otherwise seconds until the next attempt is allowed.
+        """
+        ...  # pragma: no cover
+
+    async def reset(self, key: str, window: float) -> None: ...  # pragma: no cover
+
+
+def _sliding_count(
+    current: int, previous: int, elapsed: float, window: float
+) -> float:
+    # sliding window counter: the previous fixed window weighted by its overlap
+    return previous * (1 - elapsed / window) + current
+
+
+def _retry_after(
+    current: int, previous: int, elapsed: float, limit: int, window: float
+) -> float:
+    if current > limit:
+        # the current window alone is over the limit
+        return window - elapsed
+    # wait until the previous window's weight leaves room for one more attempt
+    fits_at = window * (1 - (limit - current) / previous)
+    return max(fits_at - elapsed, 0.001)
+
+
+class MemoryThrottleBackend(IThrottleBackend):
+    """
+    Per-process sliding window counters, at most `max_keys` keys are kept.
+    """
+
+    def __init__(
+        self, max_keys: int = 100_000, clock: Callable[[], float] = time.time
+    ):
+        self.max_keys = max_keys
+        self.clock = clock
+        # key -> [window index, current window count, previous window count]
+        self._counters: OrderedDict[str, list[int]] = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        now = self.clock()
+        index = int(now // window)
+        counter = self._counters.get(key)
+
+        if counter is None:
+            counter = self._counters[key] = [index, 0, 0]
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+        else:
+            self._counters.move_to_end(key)
+            if counter[0] != index:
+                counter[2] = counter[1] if counter[0] == index - 1 else 0
+                counter[0], counter[1] = index, 0
+
+        elapsed = now - index * window
+        counter[1] += 1
+        _, current, previous = counter
+        if _sliding_count(current, previous, elapsed, window) <= limit:
+            return 0.0
+        return _retry_after(current, previous, elapsed, limit, window)
+
+    async def reset(self, key: str, window: float) -> None:
+        self._counters.pop(key, None)
+
+
+class RedisThrottleBackend(IThrottleBackend):
+    """
+    Sliding window counters shared by all workers, on a `redis.asyncio` client
+    (or anything with the same `incr`/`expire`/`get`/`delete` coroutines).
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        prefix: str = "throttle:",
+        clock: Callable[[], float] = time.time,
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.clock = clock
+
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        now = self.clock()
+        index = int(now // window)
+        key = f"{self.prefix}{key}"
+
+        current = await self.client.incr(f"{key}:{index}")
+        if current == 1:
+            await self.client.expire(f"{key}:{index}", math.ceil(window * 2))
+        previous = int(await self.client.get(f"{key}:{index - 1}") or 0)
+
+        elapsed = now - index * window
+        if _sliding_count(current, previous, elapsed, window) <= limit:
+            return 0.0
+        return _retry_after(current, previous, elapsed, limit, window)
+
+    async def reset(self, key: str, window: float) -> None:
+        index = int(self.clock() // window)
+        key = f"{self.prefix}{key}"
+        await self.client.delete(f"{key}:{index}", f"{key}:{index - 1}")
+
+
+class LoginThrottle:
+    """
+    Limits login attempts per username and per client IP.
+
+    Checked before the user lookup and password verification, so rejected
+    attempts cost no database query and no hashing. A successful login clears
+    the username counter.
+    """
+
+    def __init__(
+        self,
+        backend: IThrottleBackend,
+        username_limit: int = 5,
+        ip_limit: int = 20,
+        window: float = 60.0,
+    ):
+        self.backend = backend
+        self.username_limit = username_limit
+        self.ip_limit = ip_limit
+        self.window = window
+
+    @staticmethod
+    def _username_key(username: str) -> str:
+        return f"login:user:{username.strip().lower()}"
+
+    async def check(self, username: str, client_ip: str | None = None):
+        retry_after = await self.backend.hit(
+            self._username_key(username), self.username_limit, self.window
+        )
+        if client_ip and not retry_after:
+            retry_after = await self.backend.hit(
+                f"login:ip:{client_ip}", self.ip_limit, self.window
+            )
+
+        if retry_after:
+            raise BackendException(
+                http_status.HTTP_429_TOO_MANY_REQUESTS,
+                "Too many requests",
+                "Too many login attempts, try again later",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+    async def reset(self, username: str):
+        await self.backend.reset(self._username_key(username), self.window)
+
+
+def get_throttle_backend(name: str) -> IThrottleBackend:
+    if name == "memory":
+        return MemoryThrottleBackend(settings.THROTTLE_MEMORY_MAX_KEYS)
+    if name == "redis":
+        try:
+            from redis.asyncio import from_url
+        except ImportError as e:
+            raise RuntimeError(
+                "THROTTLE_BACKEND 'redis' requires the redis package"
+            ) from e
+        return RedisThrottleBackend(from_url(settings.THROTTLE_REDIS_URL))
+    raise ValueError(f"Unknown THROTTLE_BACKEND '{name}'")
+
+
+login_throttle = LoginThrottle(
+    get_throttle_backend(settings.THROTTLE_BACKEND),
+    username_limit=settings.THROTTLE_LOGIN_USERNAME_LIMIT,
+    ip_limit=settings.THROTTLE_LOGIN_IP_LIMIT,
+    window=settings.THROTTLE_LOGIN_WINDOW,
+)
+
+
+__all__ = [
+    "IThrottleBackend",
+    "LoginThrottle",
+    "MemoryThrottleBackend",
+    "RedisThrottleBackend",
+    "login_throttle",
+]
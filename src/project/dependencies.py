@@ -1,3 +1,2 @@
 from project.repositories import *
 from project.services import *
-from project.utils.pagination import PaginationDep
@@ -1,6 +1,6 @@
-from .auth import User, Role, Permission
+from .auth import User, Role, Permission, RefreshToken, RevokedToken
 
 # for alembic automigration purposes
 from .base import Model
 
-__all__ = ["User", "Role", "Permission", "Model"]
+__all__ = ["User", "Role", "Permission", "RefreshToken", "RevokedToken", "Model"]
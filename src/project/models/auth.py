@@ -1,11 +1,14 @@
 from .base import Model, TimestampMixin
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import DateTime, ForeignKey, Index
 from project.config import settings
+from datetime import datetime
 import uuid
 
 
 class RolePermissionRel(Model):
+    __tablename__ = "role_permission_rels"
+
     permission_id: Mapped[int] = mapped_column(
         ForeignKey("permissions.id"), primary_key=True
     )
@@ -13,12 +16,16 @@ class RolePermissionRel(Model):
 
 
 class Permission(TimestampMixin, Model):
+    __tablename__ = "permissions"
+
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     resource: Mapped[str]
     action: Mapped[str]
 
 
 class Role(Model):
+    __tablename__ = "roles"
+
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(unique=True, index=True)
     permissions: Mapped[list[Permission]] = relationship(
@@ -27,6 +34,10 @@ class Role(Model):
 
 
 class User(TimestampMixin, Model):
+    __tablename__ = "users"
+    # cursor pages are ordered on (created_at, id), see UserRepository
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
+
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     email: Mapped[str] = mapped_column(unique=True, index=True)
     hashed_password: Mapped[str]
@@ -35,3 +46,33 @@ class User(TimestampMixin, Model):
     role_id: Mapped[int] = mapped_column(ForeignKey("roles.id"))
 
     role: Mapped[Role] = relationship(lazy="joined")
+
+
+class RefreshToken(TimestampMixin, Model):
+    """
+    One issued refresh token. Tokens rotated from the same login share
+    `family_id`, which is the `sid` claim of their access tokens.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    family_id: Mapped[uuid.UUID] = mapped_column(index=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), index=True
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    revoked_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), default=None
+    )
+
+
+class RevokedToken(Model):
+    """
+    Revoked access token `jti` or session `sid`, kept until `expires_at`.
+    """
+
+    __tablename__ = "revoked_tokens"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
@@ -9,17 +9,26 @@ class TimestampMixin:
     Mixin class to add created_at and updated_at timestamps to a model.
     """
 
+    # fetch updated_at back with RETURNING on insert/update, it backs ETags
+    __mapper_args__ = {"eager_defaults": True}
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), server_onupdate=func.now()
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        server_onupdate=func.now(),
     )
 
 
 class Model(DeclarativeBase):
     """
     Base class for all sqlalchemy models.
+
+    Without an explicit `__tablename__` the table is named after the plural of
+    the class name (`UserRole` -> `user_roles`).
     """
 
     @declared_attr.directive
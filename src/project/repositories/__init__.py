@@ -1,5 +1,12 @@
-from .auth import UserRepoDep
+from .auth import UserRepoDep, RefreshTokenRepoDep, RevokedTokenRepoDep
 from .rbac import RoleRepoDep, PermissionRepoDep
 from .celery import CeleryRepoDep
 
-__all__ = ["UserRepoDep", "RoleRepoDep", "PermissionRepoDep", "CeleryRepoDep"]
+__all__ = [
+    "UserRepoDep",
+    "RefreshTokenRepoDep",
+    "RevokedTokenRepoDep",
+    "RoleRepoDep",
+    "PermissionRepoDep",
+    "CeleryRepoDep",
+]
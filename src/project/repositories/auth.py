@@ -1,9 +1,10 @@
-from .base import IRepository, BaseRepository
-from project.models import User
+from .base import IRepository, BaseRepository, field_lookup_statement
+from project.models import User, RefreshToken, RevokedToken
 from project.core.session import SessionDep
 from typing import Annotated, Any
+from datetime import datetime
 from fastapi import Depends
-from sqlalchemy import select, or_
+from sqlalchemy import delete, select, update
 import uuid
 
 
@@ -11,31 +12,131 @@ class IUserRepository(IRepository[User, uuid.UUID]):
     model = User
 
     async def get_user_by_login_fields(
-        self, login_fields: list[str], value: Any
+        self, login_fields: list[str], value: Any, with_role: bool = True
     ) -> User | None:
         raise NotImplementedError
 
 
 class UserRepository(IUserRepository, BaseRepository[User, uuid.UUID]):
-    async def get_user_by_login_fields(self, login_fields, value):
-        for field in login_fields:
-            if not hasattr(self.model, field):
-                raise ValueError(
-                    f"Field '{field}' does not exist on model '{self.model.__name__}'"
-                )
-
-        qs = (
-            select(self.model)
-            .where(
-                or_(*[getattr(self.model, field) == value for field in login_fields])
-            )
-            .limit(1)
+    cursor_field = "created_at"
+
+    @classmethod
+    def prepare(cls, login_fields: list[str]):
+        """
+        Builds (and validates) the login statements ahead of the first login.
+        """
+
+        for with_role in (True, False):
+            cls._login_statement(tuple(login_fields), with_role)
+
+    @classmethod
+    def _login_statement(cls, login_fields: tuple[str, ...], with_role: bool):
+        return field_lookup_statement(
+            cls.model, login_fields, () if with_role else ("role",)
+        )
+
+    async def get_user_by_login_fields(self, login_fields, value, with_role=True):
+        login_fields = tuple(login_fields)
+        qs = self._login_statement(login_fields, with_role)
+        return await self.session.scalar(qs, dict.fromkeys(login_fields, value))
+
+
+class IRefreshTokenRepository(IRepository[RefreshToken, uuid.UUID]):
+    model = RefreshToken
+
+    async def get_for_update(self, id: uuid.UUID) -> RefreshToken | None:
+        raise NotImplementedError
+
+    async def revoke_family(
+        self, family_id: uuid.UUID, revoked_at: datetime, commit: bool | None = None
+    ) -> None:
+        raise NotImplementedError
+
+    async def delete_expired(self, now: datetime, commit: bool | None = None) -> int:
+        raise NotImplementedError
+
+
+class RefreshTokenRepository(
+    IRefreshTokenRepository, BaseRepository[RefreshToken, uuid.UUID]
+):
+    async def get_for_update(self, id):
+        # locks the row, so two concurrent refreshes cannot both rotate it
+        return await self.session.get(self.model, id, with_for_update=True)
+
+    async def revoke_family(self, family_id, revoked_at, commit=None):
+        await self.session.execute(
+            update(self.model)
+            .where(self.model.family_id == family_id, self.model.revoked_at.is_(None))
+            .values(revoked_at=revoked_at)
+            .execution_options(synchronize_session=False)
+        )
+        await self._persist(commit)
+
+    async def delete_expired(self, now, commit=None):
+        # spent tokens stay until they expire, a replay must still be detected
+        result = await self.session.execute(
+            delete(self.model)
+            .where(self.model.expires_at <= now)
+            .execution_options(synchronize_session=False)
         )
-        return await self.session.scalar(qs)
+        await self._persist(commit)
+        return result.rowcount
+
+
+class IRevokedTokenRepository(IRepository[RevokedToken, uuid.UUID]):
+    model = RevokedToken
+
+    async def get_active(self, now: datetime) -> list[tuple[uuid.UUID, datetime]]:
+        raise NotImplementedError
+
+    async def revoke(
+        self, id: uuid.UUID, expires_at: datetime, commit: bool | None = None
+    ) -> None:
+        raise NotImplementedError
+
+    async def delete_expired(self, now: datetime, commit: bool | None = None) -> int:
+        raise NotImplementedError
+
+
+class RevokedTokenRepository(
+    IRevokedTokenRepository, BaseRepository[RevokedToken, uuid.UUID]
+):
+    async def get_active(self, now):
+        qs = select(self.model.id, self.model.expires_at).where(
+            self.model.expires_at > now
+        )
+        return [(row.id, row.expires_at) for row in await self.session.execute(qs)]
+
+    async def revoke(self, id, expires_at, commit=None):
+        await self.session.merge(self.model(id=id, expires_at=expires_at))
+        await self._persist(commit)
+
+    async def delete_expired(self, now, commit=None):
+        result = await self.session.execute(
+            delete(self.model)
+            .where(self.model.expires_at <= now)
+            .execution_options(synchronize_session=False)
+        )
+        await self._persist(commit)
+        return result.rowcount
 
 
 async def get_user_repository(session: SessionDep):
     return UserRepository(session)
 
 
+async def get_refresh_token_repository(session: SessionDep):
+    return RefreshTokenRepository(session)
+
+
+async def get_revoked_token_repository(session: SessionDep):
+    return RevokedTokenRepository(session)
+
+
 UserRepoDep = Annotated[IUserRepository, Depends(get_user_repository)]
+RefreshTokenRepoDep = Annotated[
+    IRefreshTokenRepository, Depends(get_refresh_token_repository)
+]
+RevokedTokenRepoDep = Annotated[
+    IRevokedTokenRepository, Depends(get_revoked_token_repository)
+]
@@ -1,11 +1,29 @@
-from typing import TypeVar, Generic, Any
+import json
+from functools import lru_cache
+from typing import TypeVar, Generic, Any, ClassVar
 from project.models.base import Model
+from project.core.exceptions import BackendException, http_status
 from abc import ABC, abstractmethod
 from fastapi_pagination.bases import AbstractPage, AbstractParams
+from fastapi_pagination.cursor import CursorPage, CursorParams
 from fastapi_pagination.ext.sqlalchemy import paginate
 from fastapi_filter.base.filter import BaseFilterModel
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import to_jsonable_python
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import (
+    Column,
+    Select,
+    bindparam,
+    delete,
+    func,
+    insert,
+    inspect,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.orm import noload
 
 M = TypeVar("M", bound=Model)
 ID = TypeVar("ID")
@@ -43,17 +61,164 @@ class IRepository(Generic[M, ID], ABC):
     async def delete(self, instance: M, **kwargs) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_many_by_ids(self, ids: list[ID], **kwargs) -> list[M]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_many_by_field(
+        self, field: str, values: list[Any], **kwargs
+    ) -> list[M]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create_many(self, data: list[dict[str, Any]], **kwargs) -> list[M]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_many(
+        self, instances: list[M], data: list[dict[str, Any]], **kwargs
+    ) -> list[M]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_many(self, instances: list[M], **kwargs) -> None:
+        raise NotImplementedError
+
+
+@lru_cache
+def _type_adapter(python_type: type) -> TypeAdapter:
+    return TypeAdapter(python_type)
+
+
+def _validate_fields(model: type[Model], fields: tuple[str, ...]):
+    columns = inspect(model).column_attrs
+    for field in fields:
+        if field not in columns:
+            raise ValueError(f"Field '{field}' does not exist on model '{model.__name__}'")
+
+
+# Statements below are built once per model and fields and then only executed
+# with new parameters. A reused statement keeps its memoized cache key, so
+# SQLAlchemy goes straight to the compiled cache without rebuilding the query.
+
+
+@lru_cache(maxsize=None)
+def field_lookup_statement(
+    model: type[Model], fields: tuple[str, ...], noload_relationships: tuple[str, ...] = ()
+) -> Select:
+    """
+    `SELECT ... WHERE <field> = :<field> OR ... LIMIT 1`, parameters are named
+    after the fields.
+    """
+
+    _validate_fields(model, fields)
+    qs = (
+        select(model)
+        .where(or_(*(getattr(model, field) == bindparam(field) for field in fields)))
+        .limit(1)
+    )
+    if noload_relationships:
+        qs = qs.options(*(noload(getattr(model, key)) for key in noload_relationships))
+    return qs
+
+
+@lru_cache(maxsize=None)
+def field_in_statement(model: type[Model], field: str) -> Select:
+    """
+    `SELECT ... WHERE <field> IN :values`.
+    """
+
+    _validate_fields(model, (field,))
+    return select(model).where(
+        getattr(model, field).in_(bindparam("values", expanding=True))
+    )
+
+
+@lru_cache(maxsize=None)
+def association_columns(model: type[Model]) -> tuple[Column, ...]:
+    """
+    Columns of many-to-many (`secondary`) tables referencing `model`'s table,
+    from relationships declared on either side.
+    """
+
+    table = inspect(model).local_table
+    columns: list[Column] = []
+    for mapper in model.registry.mappers:
+        for relationship in mapper.relationships:
+            if relationship.secondary is None:
+                continue
+            for foreign_key in relationship.secondary.foreign_keys:
+                if foreign_key.column.table is table and not any(
+                    column is foreign_key.parent for column in columns
+                ):
+                    columns.append(foreign_key.parent)
+    return tuple(columns)
+
 
 class BaseRepository(Generic[M, ID], IRepository[M, ID]):
+    # column used before the primary key to order cursor (keyset) pages
+    cursor_field: ClassVar[str | None] = None
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    def _cursor_columns(self):
+        mapper = inspect(self.model)
+        columns = list(mapper.primary_key)
+        if self.cursor_field:
+            columns.insert(0, mapper.columns[self.cursor_field])
+        return [(column, mapper.get_property_by_column(column).key) for column in columns]
+
+    def _encode_cursor(self, instance: M, columns) -> str:
+        values = [getattr(instance, key) for _, key in columns]
+        return json.dumps(to_jsonable_python(values), separators=(",", ":"))
+
+    def _decode_cursor(self, cursor: str, columns) -> list[Any]:
+        try:
+            values = json.loads(cursor)
+            if not isinstance(values, list) or len(values) != len(columns):
+                raise ValueError("Cursor does not match ordering columns")
+            return [
+                _type_adapter(column.type.python_type).validate_python(value)
+                for (column, _), value in zip(columns, values)
+            ]
+        except (ValueError, ValidationError) as e:
+            raise BackendException(
+                http_status.HTTP_400_BAD_REQUEST, "Invalid cursor", "Invalid cursor value", e
+            )
+
+    async def _paginate_keyset(self, qs: Select, pagination: CursorParams):
+        raw_params = pagination.to_raw_params()
+        columns = self._cursor_columns()
+        order_by = [column for column, _ in columns]
+
+        total = None
+        if raw_params.include_total:
+            total = await self.session.scalar(
+                select(func.count()).select_from(qs.order_by(None).subquery())
+            )
+
+        if raw_params.cursor:
+            values = self._decode_cursor(str(raw_params.cursor), columns)
+            qs = qs.where(tuple_(*order_by) > tuple_(*values))
+
+        qs = qs.order_by(*order_by).limit(raw_params.size + 1)
+        items = list((await self.session.scalars(qs)).unique())
+
+        next_cursor = None
+        if len(items) > raw_params.size:
+            items = items[: raw_params.size]
+            next_cursor = self._encode_cursor(items[-1], columns) if items else None
+
+        return CursorPage.create(items, pagination, next_=next_cursor, total=total)
+
     async def get_by_id(self, id: ID, **kwargs) -> M | None:
         return await self.session.get(self.model, id)
 
     async def get_by_field(self, field: str, value: Any, **kwargs) -> M | None:
-        qs = select(self.model).filter_by(**{field: value}).limit(1)
-        return await self.session.scalar(qs)
+        qs = field_lookup_statement(self.model, (field,))
+        return await self.session.scalar(qs, {field: value})
 
     async def get_many(
         self,
@@ -64,24 +229,143 @@ class BaseRepository(Generic[M, ID], IRepository[M, ID]):
         qs = select(self.model)
         if filter:
             qs = filter.filter(qs)
+        if isinstance(pagination, CursorParams):
+            return await self._paginate_keyset(qs, pagination)  # type: ignore
         return await paginate(self.session, qs, pagination) # type: ignore
 
-    async def create(self, data: dict[str, Any], **kwargs) -> M:
+    async def _persist(self, commit: bool | None = None):
+        """
+        Flushes when the session is a request unit of work (see `get_session`),
+        which commits once at the end, otherwise commits right away.
+        """
+
+        if commit is None:
+            commit = not self.session.info.get("unit_of_work", False)
+
+        if commit:
+            await self.session.commit()
+            # earlier flushed writes went out with this commit
+            self.session.info.pop("dirty", None)
+        else:
+            await self.session.flush()
+            self.session.info["dirty"] = True
+
+    async def _load_unloaded(self, instance: M, expire: list[str] | None = None) -> M:
+        # server values come back through RETURNING (eager_defaults), so only
+        # relationships that were never loaded, or whose key changed, are selected
+        if expire:
+            self.session.expire(instance, expire)
+        unloaded = inspect(instance).unloaded
+        if unloaded:
+            await self.session.refresh(instance, attribute_names=list(unloaded))
+        return instance
+
+    def _stale_relationships(self, data: dict[str, Any]) -> list[str]:
+        mapper = inspect(self.model)
+        return [
+            relationship.key
+            for relationship in mapper.relationships
+            if any(
+                column in mapper.columns.values()
+                and mapper.get_property_by_column(column).key in data
+                for column in relationship.local_columns
+            )
+        ]
+
+    async def create(
+        self, data: dict[str, Any], commit: bool | None = None, **kwargs
+    ) -> M:
         instance = self.model(**data)
         self.session.add(instance)
-        await self.session.commit()
-        await self.session.refresh(instance)
-        return instance
+        await self._persist(commit)
+        return await self._load_unloaded(instance)
 
-    async def update(self, instance: M, data: dict[str, Any], **kwargs) -> M:
+    async def update(
+        self, instance: M, data: dict[str, Any], commit: bool | None = None, **kwargs
+    ) -> M:
         for key, value in data.items():
             setattr(instance, key, value)
         self.session.add(instance)
-        await self.session.commit()
-        await self.session.refresh(instance)
-        return instance
+        await self._persist(commit)
+        return await self._load_unloaded(instance, self._stale_relationships(data))
 
-    async def delete(self, instance: M, **kwargs) -> M:
+    async def delete(self, instance: M, commit: bool | None = None, **kwargs) -> M:
         await self.session.delete(instance)
-        await self.session.commit()
+        await self._persist(commit)
         return instance
+
+    @property
+    def _pk(self):
+        primary_key = inspect(self.model).primary_key
+        if len(primary_key) != 1:
+            raise ValueError(
+                f"Bulk operations require a single column primary key on '{self.model.__name__}'"
+            )
+        return primary_key[0]
+
+    def _identity(self, instance: M) -> Any:
+        return inspect(instance).identity[0]  # type: ignore
+
+    async def get_many_by_ids(self, ids: list[ID], **kwargs) -> list[M]:
+        if not ids:
+            return []
+        qs = select(self.model).where(self._pk.in_(ids))
+        return list((await self.session.scalars(qs)).unique())
+
+    async def get_many_by_field(
+        self, field: str, values: list[Any], **kwargs
+    ) -> list[M]:
+        if not values:
+            return []
+        qs = field_in_statement(self.model, field)
+        return list((await self.session.scalars(qs, {"values": values})).unique())
+
+    async def _reload_many(self, instances: list[M]) -> list[M]:
+        # one SELECT to load relationships and server side values for all rows
+        if not instances or not inspect(self.model).relationships:
+            return instances
+        ids = [self._identity(instance) for instance in instances]
+        qs = (
+            select(self.model)
+            .where(self._pk.in_(ids))
+            .execution_options(populate_existing=True)
+        )
+        by_id = {self._identity(x): x for x in (await self.session.scalars(qs)).unique()}
+        return [by_id[id] for id in ids]
+
+    async def create_many(
+        self, data: list[dict[str, Any]], commit: bool | None = None, **kwargs
+    ) -> list[M]:
+        if not data:
+            return []
+        qs = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        instances = list(await self.session.scalars(qs, data))
+        await self._persist(commit)
+        return await self._reload_many(instances)
+
+    async def update_many(
+        self,
+        instances: list[M],
+        data: list[dict[str, Any]],
+        commit: bool | None = None,
+        **kwargs,
+    ) -> list[M]:
+        # the unit of work batches rows with the same changed columns into one
+        # executemany UPDATE ... WHERE id = ?
+        for instance, values in zip(instances, data, strict=True):
+            for key, value in values.items():
+                setattr(instance, key, value)
+        await self._persist(commit)
+        return await self._reload_many(instances)
+
+    async def delete_many(
+        self, instances: list[M], commit: bool | None = None, **kwargs
+    ) -> None:
+        if not instances:
+            return
+        ids = [self._identity(instance) for instance in instances]
+        # a bulk DELETE bypasses the ORM cascade that clears secondary rows
+        for column in association_columns(self.model):
+            await self.session.execute(delete(column.table).where(column.in_(ids)))
+        await self.session.execute(delete(self.model).where(self._pk.in_(ids)))
+        await self._persist(commit)
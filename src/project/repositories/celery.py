@@ -1,14 +1,39 @@
-from typing import Annotated, Callable
-from celery import Celery
+import asyncio
+import threading
+from typing import TYPE_CHECKING, Annotated, Any, Callable
 from fastapi import Depends
 from project.config import settings
 
+if TYPE_CHECKING:
+    from celery.result import AsyncResult
+
 
 class CeleryRepository:
-    def __init__(self, backend_url: str, broker_url: str, **kwargs):
+    """
+    Wraps the process-wide Celery application.
+
+    With `eager=True` tasks run in-process on `delay()` with an in-memory broker
+    and result backend, for tests and local runs without a broker.
+    """
+
+    def __init__(self, backend_url: str, broker_url: str, eager: bool = False, **kwargs):
+        # imported here, the API only pays for Celery when it queues a task
+        from celery import Celery
+
+        if eager:
+            backend_url, broker_url = "cache+memory://", "memory://"
+
         self._celery = Celery(
             "worker", backend=backend_url, broker=broker_url, **kwargs
         )
+        if eager:
+            self._celery.conf.update(
+                task_always_eager=True,
+                task_eager_propagates=True,
+                task_store_eager_result=True,
+            )
+        # shared tasks (project.tasks) bind to this app
+        self._celery.set_default()
 
     @property
     def worker(self):
@@ -17,12 +42,65 @@ class CeleryRepository:
     def wrap_task(self, func: Callable):
         return self.worker.task(func)
 
-    def send_task(self, func: Callable, *args, **kwargs):
-        return func.delay(*args, **kwargs)
+    async def send_task(self, func: Callable, *args, **kwargs) -> "AsyncResult":
+        # publishing talks to the broker (and runs the task in eager mode),
+        # keep it off the event loop
+        return await asyncio.to_thread(func.delay, *args, **kwargs)
+
+    async def get_result(
+        self,
+        result: "AsyncResult",
+        timeout: float | None = None,
+        interval: float = 0.05,
+        max_interval: float = 1.0,
+    ) -> Any:
+        """
+        Awaits a task result by polling the backend from a worker thread, with
+        exponential backoff up to `max_interval`. Raises the task exception on
+        failure and `TimeoutError` after `timeout` seconds.
+        """
+
+        async with asyncio.timeout(timeout):
+            while not await asyncio.to_thread(result.ready):
+                await asyncio.sleep(interval)
+                interval = min(interval * 2, max_interval)
+
+        return await asyncio.to_thread(result.get, propagate=True)
+
+    def close(self):
+        self._celery.close()
+
+
+_celery_repository: CeleryRepository | None = None
+# sync dependencies run on the threadpool, concurrent first requests would
+# otherwise each create an app
+_celery_lock = threading.Lock()
+
+
+def init_celery_repository() -> CeleryRepository:
+    global _celery_repository
+    with _celery_lock:
+        if _celery_repository is None:
+            _celery_repository = CeleryRepository(
+                settings.CELERY_BACKEND_URL,
+                settings.CELERY_BROKER_URL,
+                eager=settings.CELERY_EAGER,
+                include=["project.tasks"],
+            )
+        return _celery_repository
+
+
+def close_celery_repository():
+    global _celery_repository
+    with _celery_lock:
+        if _celery_repository is not None:
+            _celery_repository.close()
+            _celery_repository = None
 
 
-def get_celery_repository():
-    return CeleryRepository(settings.CELERY_BACKEND_URL, settings.CELERY_BROKER_URL)
+def get_celery_repository() -> CeleryRepository:
+    # created by the first request that queues a task
+    return _celery_repository or init_celery_repository()
 
 
 CeleryRepoDep = Annotated[CeleryRepository, Depends(get_celery_repository)]
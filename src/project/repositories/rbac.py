@@ -4,18 +4,23 @@ from project.core.session import SessionDep
 from typing import Annotated
 from fastapi import Depends
 from abc import ABC
+from sqlalchemy import select
 
 
 class IRoleRepository(IRepository[Role, int], ABC):
     model = Role
 
+    async def get_all(self) -> list[Role]:
+        raise NotImplementedError
+
 
 class IPermissionRepository(IRepository[Permission, int], ABC):
     model = Permission
 
 
 class RoleRepository(IRoleRepository, BaseRepository[Role, int]):
-    pass
+    async def get_all(self) -> list[Role]:
+        return list(await self.session.scalars(select(self.model)))
 
 
 class PermissionRepository(IPermissionRepository, BaseRepository[Permission, int]):
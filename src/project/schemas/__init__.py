@@ -1,5 +1,6 @@
 from fastapi_pagination import Page
-from .auth import TokenResponse, AccessToken
+from fastapi_pagination.cursor import CursorPage
+from .auth import TokenResponse, AccessToken, RefreshRequest
 from .rbac import (
     RoleCreate,
     RoleRead,
@@ -12,8 +13,10 @@ from .users import UserCreate, UserRead, UserUpdate
 
 __all__ = [
     "Page",
+    "CursorPage",
     "TokenResponse",
     "AccessToken",
+    "RefreshRequest",
     "RoleCreate",
     "RoleRead",
     "RoleUpdate",
@@ -6,8 +6,20 @@ class AccessToken(JWTPayload):
     email: str
     permissions: list[str] = []
     role: str 
+    sid: str | None = None
+
+
+class RefreshTokenPayload(JWTPayload):
+    jti: str
+    sid: str
+
+
+class RefreshRequest(Schema):
+    refresh_token: str
 
 
 class TokenResponse(Schema):
     access_token: str
     token_type: str = "Bearer"
+    refresh_token: str | None = None
+    expires_in: int | None = None
@@ -1,26 +1,67 @@
+import time
 import uuid
-from project.repositories.auth import IUserRepository
+from datetime import timedelta
+from project.repositories.auth import (
+    IRefreshTokenRepository,
+    IRevokedTokenRepository,
+    IUserRepository,
+)
+from project.repositories.rbac import IRoleRepository
 from project.schemas.users import UserCreate, UserUpdate
 from .base import GenericService
+from .rbac import rbac_cache
 from project.models import User
 from project.config import settings
 from project.core.exceptions import BackendException, http_status
-from project.utils.password import DefaultPasswordHelper, IPasswordHelper
-from project.utils.jwts import to_jwt_payload, to_jwt_token
-from project.schemas.auth import TokenResponse, AccessToken
+from project.core.metrics import auth_login, auth_login_duration
+from project.core.throttling import LoginThrottle, login_throttle
+from project.utils.password import (
+    AsyncPasswordHelper,
+    DefaultPasswordHelper,
+    IAsyncPasswordHelper,
+)
+from project.utils.jwts import (
+    RevocationList,
+    TokenCache,
+    now,
+    to_jwt_payload,
+    to_jwt_token,
+)
+from project.schemas.auth import TokenResponse, AccessToken, RefreshTokenPayload
 from fastapi import Depends
 from typing import Annotated, Any
-from project.repositories import UserRepoDep
+from project.repositories import (
+    UserRepoDep,
+    RoleRepoDep,
+    RefreshTokenRepoDep,
+    RevokedTokenRepoDep,
+)
+
+access_token_cache: TokenCache[AccessToken] = TokenCache(settings.ACCESS_TOKEN_CACHE_SIZE)
+revoked_tokens = RevocationList()
+default_password_helper = AsyncPasswordHelper(
+    DefaultPasswordHelper(),
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
 
 
 class AuthService(GenericService[IUserRepository, User, uuid.UUID]):
     def __init__(
         self,
         user_repo: IUserRepository,
-        password_helper: IPasswordHelper = DefaultPasswordHelper(),
+        role_repo: IRoleRepository,
+        refresh_token_repo: IRefreshTokenRepository,
+        revoked_token_repo: IRevokedTokenRepository,
+        password_helper: IAsyncPasswordHelper = default_password_helper,
+        throttle: LoginThrottle | None = login_throttle,
     ):
         super().__init__(user_repo)
+        self.role_repo = role_repo
+        self.refresh_token_repo = refresh_token_repo
+        self.revoked_token_repo = revoked_token_repo
         self.password_helper = password_helper
+        self.throttle = throttle
 
     def not_found_error(self):
         return BackendException(
@@ -29,6 +70,13 @@ class AuthService(GenericService[IUserRepository, User, uuid.UUID]):
             "User with provided credentials not found",
         )
 
+    def invalid_token_error(self):
+        return BackendException(
+            http_status.HTTP_401_UNAUTHORIZED,
+            "Invalid token",
+            "Token is invalid or revoked",
+        )
+
     def parse_user_id(self, user_id: str) -> Any:
         return uuid.UUID(user_id)
 
@@ -44,39 +92,142 @@ class AuthService(GenericService[IUserRepository, User, uuid.UUID]):
 
         return user
 
-    def _create_access_token(self, user: User):
-        permissions = [
-            f"{permission.resource}:{permission.action}"
-            for permission in user.role.permissions
-        ]
+    async def _create_access_token(self, user: User, family_id: uuid.UUID):
+        role = await rbac_cache.get(user.role_id, self.role_repo)
+        if role is None:
+            raise self.not_found_error()
 
         payload = AccessToken(
             sub=str(user.id),
             email=user.email,
-            role=user.role.name,
-            permissions=permissions,
+            role=role.name,
+            permissions=list(role.permissions),
             aud=settings.ACCESS_TOKEN_AUDIENCE,
             expires_in=settings.ACCESS_TOKEN_MAX_AGE,
+            jti=str(uuid.uuid4()),
+            sid=str(family_id),
         )
 
         return to_jwt_token(payload)
 
-    def _user_login_response(self, user: User):
-        access_token = self._create_access_token(user)
+    async def _create_refresh_token(self, user: User, family_id: uuid.UUID):
+        instance = await self.refresh_token_repo.create(
+            {
+                "family_id": family_id,
+                "user_id": user.id,
+                "expires_at": now() + timedelta(seconds=settings.REFRESH_TOKEN_MAX_AGE),
+            }
+        )
 
-        return TokenResponse(access_token=access_token)
+        payload = RefreshTokenPayload(
+            sub=str(user.id),
+            aud=settings.REFRESH_TOKEN_AUDIENCE,
+            exp=instance.expires_at,
+            jti=str(instance.id),
+            sid=str(family_id),
+        )
+
+        return to_jwt_token(payload)
+
+    async def _user_login_response(
+        self, user: User, family_id: uuid.UUID | None = None
+    ):
+        family_id = family_id or uuid.uuid4()
+        access_token = await self._create_access_token(user, family_id)
+        refresh_token = await self._create_refresh_token(user, family_id)
+
+        return TokenResponse(
+            access_token=access_token,
+            refresh_token=refresh_token,
+            expires_in=settings.ACCESS_TOKEN_MAX_AGE,
+        )
 
     def decode_token(self, token: str) -> AccessToken:
-        return AccessToken.model_validate(to_jwt_payload(token, audience=settings.ACCESS_TOKEN_AUDIENCE))
+        payload = access_token_cache.get(token)
+        if payload is None:
+            payload = AccessToken.model_validate(
+                to_jwt_payload(token, audience=settings.ACCESS_TOKEN_AUDIENCE)
+            )
+            access_token_cache.set(token, payload)
+        if revoked_tokens.is_revoked(payload.jti, payload.sid):
+            raise self.invalid_token_error()
+        return payload
+
+    def _decode_refresh_token(self, token: str) -> RefreshTokenPayload:
+        return RefreshTokenPayload.model_validate(
+            to_jwt_payload(token, audience=settings.REFRESH_TOKEN_AUDIENCE)
+        )
+
+    async def revoke_session(self, family_id: uuid.UUID, commit: bool | None = None):
+        """
+        Revokes every refresh token of a login and its access tokens.
+        """
+
+        revoked_at = now()
+        # access tokens of the session are valid at most this long
+        expires_at = revoked_at + timedelta(seconds=settings.ACCESS_TOKEN_MAX_AGE)
+        await self.refresh_token_repo.revoke_family(family_id, revoked_at, commit)
+        await self.revoked_token_repo.revoke(family_id, expires_at, commit)
+        revoked_tokens.add(str(family_id), expires_at.timestamp())
+
+    async def refresh(self, token: str) -> TokenResponse:
+        payload = self._decode_refresh_token(token)
+        jti = uuid.UUID(payload.jti)
+        instance = await self.refresh_token_repo.get_for_update(jti)
+        if instance is None or str(instance.user_id) != payload.sub:
+            raise self.invalid_token_error()
+
+        if instance.revoked_at is not None:
+            # a rotated token came back, it leaked: end the whole session, and
+            # commit now since the error below rolls the request back
+            await self.revoke_session(instance.family_id, commit=True)
+            raise self.invalid_token_error()
+
+        if revoked_tokens.is_revoked(payload.sid):
+            raise self.invalid_token_error()
+
+        user = await self.get_current_user(payload.sub)
+        await self.refresh_token_repo.update(instance, {"revoked_at": now()})
+        return await self._user_login_response(user, instance.family_id)
+
+    async def logout(self, token: str) -> None:
+        payload = self._decode_refresh_token(token)
+        instance = await self.refresh_token_repo.get_by_id(uuid.UUID(payload.jti))
+        if instance is None or str(instance.user_id) != payload.sub:
+            raise self.invalid_token_error()
+        await self.revoke_session(instance.family_id)
 
     async def get_current_user(self, user_id: str) -> User:
         user = await self.main_repo.get_by_id(self.parse_user_id(user_id))
         return self._validate_user(user)
 
-    async def login(self, username: str, password: str) -> TokenResponse:
+    async def login(
+        self, username: str, password: str, client_ip: str | None = None
+    ) -> TokenResponse:
+        start = time.perf_counter()
+        result = "error"
+        try:
+            if self.throttle is not None:
+                await self.throttle.check(username, client_ip)
+            response = await self._login(username, password)
+            result = "success"
+            if self.throttle is not None:
+                await self.throttle.reset(username)
+            return response
+        except BackendException as e:
+            if e.code == http_status.HTTP_429_TOO_MANY_REQUESTS:
+                result = "throttled"
+            else:
+                result = "failure" if e.code < 500 else "error"
+            raise
+        finally:
+            auth_login.inc(result=result)
+            auth_login_duration.observe(time.perf_counter() - start)
+
+    async def _login(self, username: str, password: str) -> TokenResponse:
         try:
             user = await self.main_repo.get_user_by_login_fields(
-                settings.LOGIN_FIELDS, username
+                settings.LOGIN_FIELDS, username, with_role=False
             )
         except ValueError as e:
             raise BackendException(
@@ -88,7 +239,7 @@ class AuthService(GenericService[IUserRepository, User, uuid.UUID]):
 
         user = self._validate_user(user)
 
-        is_valid, new_hash = self.password_helper.verify_and_update(
+        is_valid, new_hash = await self.password_helper.verify_and_update(
             password, user.hashed_password
         )
         if not is_valid:
@@ -97,7 +248,7 @@ class AuthService(GenericService[IUserRepository, User, uuid.UUID]):
         if new_hash:
             user = await self.main_repo.update(user, {"hashed_password": new_hash})
 
-        return self._user_login_response(user)
+        return await self._user_login_response(user)
 
     async def signup(self, payload: UserCreate, safe: bool = True):
         for field in settings.LOGIN_FIELDS:
@@ -111,7 +262,7 @@ class AuthService(GenericService[IUserRepository, User, uuid.UUID]):
                     )
 
         payload_dict = payload.model_dump()
-        payload_dict["hashed_password"] = self.password_helper.hash(
+        payload_dict["hashed_password"] = await self.password_helper.hash(
             payload_dict.pop("password")
         )
 
@@ -124,6 +275,32 @@ class AuthService(GenericService[IUserRepository, User, uuid.UUID]):
 
         return user
 
+    async def signup_many(self, payloads: list[UserCreate], safe: bool = True):
+        for field in settings.LOGIN_FIELDS:
+            values = [getattr(p, field) for p in payloads if hasattr(p, field)]
+            if len(values) != len(set(values)) or await self.main_repo.get_many_by_field(
+                field, values
+            ):
+                raise BackendException(
+                    http_status.HTTP_403_FORBIDDEN,
+                    "User already exist",
+                    "User with provided credentials already exist",
+                )
+
+        payload_dicts = [payload.model_dump() for payload in payloads]
+        hashed_passwords = await self.password_helper.hash_many(
+            [payload_dict.pop("password") for payload_dict in payload_dicts]
+        )
+
+        for payload_dict, hashed_password in zip(payload_dicts, hashed_passwords):
+            payload_dict["hashed_password"] = hashed_password
+            if safe:
+                payload_dict["is_active"] = settings.DEFAULT_USER_IS_ACTIVE
+                payload_dict["is_verified"] = settings.DEFAULT_USER_IS_VERIFIED
+                payload_dict["role_id"] = settings.DEFAULT_USER_ROLE_ID
+
+        return await self.main_repo.create_many(payload_dicts)
+
     async def update(self, instance: User, payload: UserUpdate, safe: bool = True):
         for field in settings.LOGIN_FIELDS:
             if hasattr(payload, field):
@@ -147,8 +324,32 @@ class AuthService(GenericService[IUserRepository, User, uuid.UUID]):
         return await self.main_repo.update(instance, payload_dict)
 
 
-async def get_auth_service(user_repo: UserRepoDep):
-    return AuthService(user_repo)
+async def sync_revoked_tokens(revoked_token_repo: IRevokedTokenRepository):
+    rows = await revoked_token_repo.get_active(now())
+    revoked_tokens.load((str(id), expires_at.timestamp()) for id, expires_at in rows)
+
+
+async def purge_expired_tokens(
+    refresh_token_repo: IRefreshTokenRepository,
+    revoked_token_repo: IRevokedTokenRepository,
+) -> int:
+    """
+    Deletes refresh tokens and revocations that can no longer match a token.
+    """
+
+    current = now()
+    purged = await refresh_token_repo.delete_expired(current, commit=True)
+    purged += await revoked_token_repo.delete_expired(current, commit=True)
+    return purged
+
+
+async def get_auth_service(
+    user_repo: UserRepoDep,
+    role_repo: RoleRepoDep,
+    refresh_token_repo: RefreshTokenRepoDep,
+    revoked_token_repo: RevokedTokenRepoDep,
+):
+    return AuthService(user_repo, role_repo, refresh_token_repo, revoked_token_repo)
 
 
 AuthServiceDep = Annotated[AuthService, Depends(get_auth_service)]
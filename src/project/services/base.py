@@ -22,6 +22,13 @@ class GenericService(Generic[REPO, M, ID]):
         return instance
 
 
+    async def get_many_by_ids(self, ids: list[ID], **kwargs) -> list[M]:
+        instances = await self.main_repo.get_many_by_ids(ids, **kwargs)
+        if len(instances) != len(set(ids)):
+            raise self.not_found_error()
+        by_id = {instance.id: instance for instance in instances}  # type: ignore
+        return [by_id[id] for id in ids]
+
     def not_found_error(self):
         return BackendException(
             http_status.HTTP_404_NOT_FOUND,
@@ -70,6 +77,38 @@ class BaseCreateService(Generic[REPO, M, ID, CS], GenericService[REPO, M, ID]):
         On after create hook
         """
 
+    async def create_many(self, payloads: list[CS], **kwargs) -> list[M]:
+        request = kwargs.get("request", None)
+        payload_dicts = [payload.model_dump() for payload in payloads]
+
+        await self.on_before_create_many(payload_dicts, request)
+        instances = await self.main_repo.create_many(payload_dicts, **kwargs)
+        await self.on_after_create_many(instances, payload_dicts, request)
+
+        return instances
+
+    async def on_before_create_many(
+        self, payloads: list[dict[str, Any]], request: Request | None = None, **kwargs
+    ):
+        """
+        On before bulk create hook, runs `on_before_create` for every payload by default
+        """
+        for payload in payloads:
+            await self.on_before_create(payload, request, **kwargs)
+
+    async def on_after_create_many(
+        self,
+        instances: list[M],
+        payloads: list[dict[str, Any]],
+        request: Request | None = None,
+        **kwargs,
+    ):
+        """
+        On after bulk create hook, runs `on_after_create` for every instance by default
+        """
+        for instance, payload in zip(instances, payloads):
+            await self.on_after_create(instance, payload, request, **kwargs)
+
 
 class BaseUpdateService(Generic[REPO, M, ID, US], GenericService[REPO, M, ID]):
 
@@ -114,6 +153,45 @@ class BaseUpdateService(Generic[REPO, M, ID, US], GenericService[REPO, M, ID]):
         On after update hook
         """
 
+    async def patch_many(self, payloads: dict[ID, US], **kwargs) -> list[M]:
+        request = kwargs.get("request", None)
+        instances = await self.get_many_by_ids(list(payloads), **kwargs)
+        payload_dicts = [
+            payload.model_dump(exclude_unset=True, exclude_defaults=True, exclude_none=True)
+            for payload in payloads.values()
+        ]
+
+        await self.on_before_update_many(instances, payload_dicts, request)
+        instances = await self.main_repo.update_many(instances, payload_dicts, **kwargs)
+        await self.on_after_update_many(instances, payload_dicts, request)
+        return instances
+
+    async def on_before_update_many(
+        self,
+        instances: list[M],
+        payloads: list[dict[str, Any]],
+        request: Request | None = None,
+        **kwargs,
+    ):
+        """
+        On before bulk update hook, runs `on_before_update` for every instance by default
+        """
+        for instance, payload in zip(instances, payloads):
+            await self.on_before_update(instance, payload, request, **kwargs)
+
+    async def on_after_update_many(
+        self,
+        instances: list[M],
+        payloads: list[dict[str, Any]],
+        request: Request | None = None,
+        **kwargs,
+    ):
+        """
+        On after bulk update hook, runs `on_after_update` for every instance by default
+        """
+        for instance, payload in zip(instances, payloads):
+            await self.on_after_update(instance, payload, request, **kwargs)
+
 
 class BaseDeleteService(Generic[REPO, M, ID], GenericService[REPO, M, ID]):
     async def delete(self, id: ID, **kwargs) -> M:
@@ -138,6 +216,32 @@ class BaseDeleteService(Generic[REPO, M, ID], GenericService[REPO, M, ID]):
         On after delete hook
         """
 
+    async def delete_many(self, ids: list[ID], **kwargs) -> list[M]:
+        request = kwargs.get("request", None)
+        instances = await self.get_many_by_ids(ids, **kwargs)
+        await self.on_before_delete_many(instances, request, **kwargs)
+        await self.main_repo.delete_many(instances, **kwargs)
+        await self.on_after_delete_many(instances, request, **kwargs)
+        return instances
+
+    async def on_before_delete_many(
+        self, instances: list[M], request: Request | None = None, **kwargs
+    ):
+        """
+        On before bulk delete hook, runs `on_before_delete` for every instance by default
+        """
+        for instance in instances:
+            await self.on_before_delete(instance, request, **kwargs)
+
+    async def on_after_delete_many(
+        self, instances: list[M], request: Request | None = None, **kwargs
+    ):
+        """
+        On after bulk delete hook, runs `on_after_delete` for every instance by default
+        """
+        for instance in instances:
+            await self.on_after_delete(instance, request, **kwargs)
+
 
 class BaseCRUDService(
     Generic[REPO, M, ID, CS, US],
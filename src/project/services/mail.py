@@ -1,34 +1,69 @@
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
 from fastapi import Depends
 from project.repositories.celery import CeleryRepository
 from project.repositories import CeleryRepoDep
-import smtplib
-from email.message import EmailMessage
 from project.config import settings
 
+if TYPE_CHECKING:
+    # the tasks import Celery, which the API loads on the first queued task
+    from project.tasks.mail import MailPayload
+
 
 class MailService:
+    """
+    Queues mail for the Celery workers, nothing here talks to the SMTP server.
+    """
+
     def __init__(self, celery_repo: CeleryRepository):
         self.repo = celery_repo
-        self.smtp = smtplib.SMTP_SSL(host=settings.SMTP_HOST, port=settings.SMTP_PORT)
+
+    @staticmethod
+    def _payload(
+        from_email: str | None,
+        to_email: str | list[str],
+        subject: str | None,
+        body: str,
+        html: str | None = None,
+    ) -> "MailPayload":
+        from_email = from_email or settings.MAIL_DEFAULT_FROM
+        if not from_email:
+            raise ValueError("No sender: pass from_email or set MAIL_DEFAULT_FROM")
+
+        return {
+            "from_email": from_email,
+            "to_email": to_email,
+            "subject": subject,
+            "body": body,
+            "html": html,
+        }
 
     async def send_message(
-        self, from_email: str, to_email: str, subject: str | None, body: str, **kwargs
+        self,
+        from_email: str | None,
+        to_email: str | list[str],
+        subject: str | None,
+        body: str,
+        html: str | None = None,
     ):
-        msg = EmailMessage()
-        msg["Subject"] = subject
-        msg["From"] = from_email
-        msg["To"] = to_email
-        msg.set_content(body)
-
-        @self.repo.wrap_task
-        def _msg():
-            with self.smtp as smtp:
-                smtp.login(settings.SMTP_LOGIN, settings.SMTP_PASSWORD)
-                smtp.send_message(msg)
-
-        return self.repo.send_task(_msg, **kwargs)
+        from project.tasks.mail import send_mail
+
+        payload = self._payload(from_email, to_email, subject, body, html)
+        return await self.repo.send_task(send_mail, [payload])
+
+    async def send_messages(self, payloads: "list[MailPayload]"):
+        """
+        Queues messages in batches of `MAIL_BATCH_SIZE`, each batch is one task
+        delivered over a single pooled connection.
+        """
+
+        from project.tasks.mail import send_mail
+
+        size = settings.MAIL_BATCH_SIZE
+        return [
+            await self.repo.send_task(send_mail, payloads[idx : idx + size])
+            for idx in range(0, len(payloads), size)
+        ]
 
 
 async def get_mail_service(celery_repo: CeleryRepoDep):
@@ -1,25 +1,130 @@
+import time
+from sqlalchemy import event
 from .base import BaseCRUDService
 from project.repositories.rbac import IRoleRepository, IPermissionRepository
 from project.repositories import RoleRepoDep, PermissionRepoDep
 from project.models import Role, Permission
+from project.config import settings
 from project.schemas.rbac import (
     RoleCreate,
     RoleUpdate,
     PermissionCreate,
     PermissionUpdate,
 )
-from typing import Annotated
-from fastapi import Depends
+from typing import Annotated, Any, NamedTuple
+from fastapi import Depends, Request
 
 
-class RoleService(BaseCRUDService[IRoleRepository, Role, int, RoleCreate, RoleUpdate]):
+class CachedRole(NamedTuple):
+    name: str
+    permissions: tuple[str, ...]
+
+
+class RBACCache:
+    """
+    In-process map of role id to role name and permission strings.
+
+    Cleared once role/permission writes of this process are committed, and
+    fully reloaded after `ttl` seconds to pick up changes made by other workers.
+    """
+
+    def __init__(self, ttl: float = 300):
+        self.ttl = ttl
+        self._roles: dict[int, CachedRole] = {}
+        self._loaded_at: float | None = None
+
+    @staticmethod
+    def _to_cached(role: Role) -> CachedRole:
+        return CachedRole(
+            role.name,
+            tuple(
+                f"{permission.resource}:{permission.action}"
+                for permission in role.permissions
+            ),
+        )
+
+    @property
+    def expired(self) -> bool:
+        return (
+            self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+        )
+
+    def invalidate(self):
+        self._roles = {}
+        self._loaded_at = None
+
+    async def warm(self, role_repo: IRoleRepository):
+        roles = await role_repo.get_all()
+        self._roles = {role.id: self._to_cached(role) for role in roles}
+        self._loaded_at = time.monotonic()
+
+    async def get(self, role_id: int, role_repo: IRoleRepository) -> CachedRole | None:
+        if self.expired:
+            await self.warm(role_repo)
+
+        cached = self._roles.get(role_id)
+        if cached is None:
+            role = await role_repo.get_by_id(role_id)
+            if role is None:
+                return None
+            cached = self._roles[role_id] = self._to_cached(role)
+        return cached
+
+
+rbac_cache = RBACCache(settings.RBAC_CACHE_TTL)
+
+
+def _invalidate_after_commit(session):
+    if session.info.pop("rbac_cache_stale", False):
+        rbac_cache.invalidate()
+
+
+def _keep_after_rollback(session):
+    session.info.pop("rbac_cache_stale", None)
+
+
+class _RBACCacheInvalidationMixin:
+    def _invalidate_rbac_cache(self):
+        session = getattr(self.main_repo, "session", None)  # type: ignore
+        if session is None or not session.info.get("dirty"):
+            # the write is already committed
+            rbac_cache.invalidate()
+            return
+
+        # with the unit of work the write is committed later, clearing now would
+        # let the cache reload rows that may still be rolled back
+        if not session.info.get("rbac_cache_stale"):
+            session.info["rbac_cache_stale"] = True
+            sync_session = session.sync_session
+            event.listen(sync_session, "after_commit", _invalidate_after_commit, once=True)
+            event.listen(sync_session, "after_rollback", _keep_after_rollback, once=True)
+
+    async def on_after_create(
+        self, instance, payload: dict[str, Any], request: Request | None = None, **kwargs
+    ):
+        self._invalidate_rbac_cache()
+
+    async def on_after_update(
+        self, instance, payload: dict[str, Any], request: Request | None = None, **kwargs
+    ):
+        self._invalidate_rbac_cache()
+
+    async def on_after_delete(self, instance, request: Request | None = None, **kwargs):
+        self._invalidate_rbac_cache()
+
+
+class RoleService(
+    _RBACCacheInvalidationMixin,
+    BaseCRUDService[IRoleRepository, Role, int, RoleCreate, RoleUpdate],
+):
     pass
 
 
 class PermissionService(
+    _RBACCacheInvalidationMixin,
     BaseCRUDService[
         IPermissionRepository, Permission, int, PermissionCreate, PermissionUpdate
-    ]
+    ],
 ):
     pass
 
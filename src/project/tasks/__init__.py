@@ -0,0 +1,3 @@
+from .mail import send_mail
+
+__all__ = ["send_mail"]
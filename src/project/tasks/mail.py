@@ -0,0 +1,50 @@
+from email.message import EmailMessage
+from typing import Any, TypedDict, NotRequired
+from celery import shared_task
+from celery.signals import worker_process_shutdown
+from project.core.logger import log
+from project.core.smtp import SMTPDeliveryError, smtp_pool
+
+
+class MailPayload(TypedDict):
+    from_email: str
+    to_email: str | list[str]
+    subject: str | None
+    body: str
+    html: NotRequired[str | None]
+
+
+def build_message(payload: MailPayload) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = payload["subject"] or ""
+    message["From"] = payload["from_email"]
+    to_email = payload["to_email"]
+    message["To"] = to_email if isinstance(to_email, str) else ", ".join(to_email)
+    message.set_content(payload["body"])
+    if payload.get("html"):
+        message.add_alternative(payload["html"], subtype="html")
+    return message
+
+
+@shared_task(bind=True, name="project.tasks.mail.send_mail", max_retries=5)
+def send_mail(self: Any, payloads: list[MailPayload]) -> int:
+    """
+    Delivers a batch of messages over the worker's SMTP pool, returns the number
+    of accepted messages. Only the undelivered tail is retried.
+    """
+
+    try:
+        failed = smtp_pool.send_many([build_message(payload) for payload in payloads])
+    except SMTPDeliveryError as e:
+        raise self.retry(
+            args=(payloads[e.sent :],), exc=e, countdown=2**self.request.retries * 10
+        )
+
+    for message, error in failed:
+        log.warning(f"Mail to {message['To']} refused: {error!r}")
+    return len(payloads) - len(failed)
+
+
+@worker_process_shutdown.connect
+def close_smtp_pool(**kwargs):
+    smtp_pool.close()
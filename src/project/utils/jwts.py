@@ -1,3 +1,12 @@
+import base64
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from functools import cache
+from pathlib import Path
+from typing import Any, Generic, Iterable, TypeVar
+
 import jwt
 from jwt import decode, encode
 from pydantic import BaseModel, Field, ConfigDict, model_validator
@@ -28,23 +37,23 @@ class JWTPayload(BaseModel):
     def validate_expires_in(cls, data):
         if isinstance(data, dict):
             exp = data.get("exp", None)
-            iat = data.get("iat", None)
             expires_in = data.get("expires_in", None)
 
             if exp is not None:
                 return data
 
-            if iat and expires_in:
+            if expires_in:
+                iat = data.setdefault("iat", now())
                 data["exp"] = iat + timedelta(seconds=expires_in)
 
         return data
 
-    def to_token(self, key: str, algorithm: str = "HS256", **kwargs) -> str:
+    def to_token(self, key: Any, algorithm: str = "HS256", **kwargs) -> str:
         payload = self.model_dump(exclude_none=True)
         return encode(payload, key=key, algorithm=algorithm, **kwargs)
 
     @classmethod
-    def from_token(cls, token: str, key: str, algorithm: str = "HS256", **kwargs):
+    def from_token(cls, token: str, key: Any, algorithm: str = "HS256", **kwargs):
         try:
             payload = decode(token, key=key, algorithms=[algorithm], **kwargs)
             return cls.model_validate(payload)
@@ -67,14 +76,324 @@ class JWTPayload(BaseModel):
             )
 
 
+P = TypeVar("P", bound=JWTPayload)
+
+
+class TokenCache(Generic[P]):
+    """
+    Bounded LRU cache of already verified tokens.
+
+    Entries are keyed by a digest of the raw token, so the token itself is never
+    kept in memory, and are dropped as soon as the token's own `exp` is reached.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[P, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str) -> P | None:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def set(self, token: str, payload: P) -> None:
+        if self.max_size <= 0 or payload.exp is None:
+            return
+
+        key = self._key(token)
+        self._entries[key] = (payload, payload.exp.timestamp())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class RevocationList:
+    """
+    In-memory set of revoked token ids (`jti`, or the `sid` of a revoked
+    session) mapped to the time they stop mattering.
+
+    Lookups never touch the database. The list is reloaded from the database
+    periodically to pick up revocations made by other workers, and an entry is
+    dropped once every token it could match has expired, so it stays small.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, jti: str | None) -> bool:
+        if jti is None:
+            return False
+        expires_at = self._entries.get(jti)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            self._entries.pop(jti, None)
+            return False
+        return True
+
+    def is_revoked(self, *ids: str | None) -> bool:
+        return any(jti in self for jti in ids)
+
+    def add(self, jti: str, expires_at: float) -> None:
+        self._entries[jti] = max(expires_at, self._entries.get(jti, 0.0))
+
+    def load(self, entries: Iterable[tuple[str, float]]) -> None:
+        # revocations are never undone, so merging keeps local entries whose
+        # transaction was not committed yet when the rows were read
+        now = time.time()
+        merged = {jti: exp for jti, exp in self._entries.items() if exp > now}
+        for jti, expires_at in entries:
+            if expires_at > now:
+                merged[jti] = max(expires_at, merged.get(jti, 0.0))
+        self._entries = merged
+
+
+# default algorithm per asymmetric key type, JWT_ALGORITHM wins when it fits
+_KEY_ALGORITHMS = {
+    "RSA": ("RS256", ("RS256", "RS384", "RS512", "PS256", "PS384", "PS512")),
+    "P-256": ("ES256", ("ES256",)),
+    "P-384": ("ES384", ("ES384",)),
+    "P-521": ("ES512", ("ES512",)),
+    "secp256k1": ("ES256K", ("ES256K",)),
+    "Ed25519": ("EdDSA", ("EdDSA",)),
+    "Ed448": ("EdDSA", ("EdDSA",)),
+}
+# members of the RFC 7638 thumbprint, used as the default `kid`
+_THUMBPRINT_MEMBERS = {
+    "RSA": ("e", "kty", "n"),
+    "EC": ("crv", "kty", "x", "y"),
+    "OKP": ("crv", "kty", "x"),
+}
+
+
+def _thumbprint(jwk: dict[str, Any]) -> str:
+    members = {name: jwk[name] for name in _THUMBPRINT_MEMBERS[jwk["kty"]]}
+    digest = hashlib.sha256(
+        json.dumps(members, separators=(",", ":"), sort_keys=True).encode()
+    ).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+class JWTKey:
+    """
+    A parsed signing/verification key pinned to one algorithm.
+
+    Keys are parsed once, encoding and decoding then reuse the key objects
+    instead of loading PEM data for every token.
+    """
+
+    def __init__(
+        self,
+        kid: str | None,
+        algorithm: str,
+        verifying_key: Any,
+        signing_key: Any = None,
+        jwk: dict[str, Any] | None = None,
+    ):
+        self.kid = kid
+        self.algorithm = algorithm
+        self.verifying_key = verifying_key
+        self.signing_key = signing_key
+        self.jwk = jwk
+
+    @classmethod
+    def from_secret(cls, secret: str, algorithm: str = "HS256") -> "JWTKey":
+        # shared secrets are never published, so they do not need a `kid`
+        key = jwt.get_algorithm_by_name(algorithm).prepare_key(secret)
+        return cls(None, algorithm, key, key)
+
+    @classmethod
+    def from_pem(
+        cls, pem: bytes, kid: str | None = None, algorithm: str | None = None
+    ) -> "JWTKey":
+        """
+        Loads a PEM private key (to sign and verify) or public key (to verify
+        tokens signed before a key rotation).
+        """
+
+        try:
+            from cryptography.hazmat.primitives.asymmetric import ec, ed448, ed25519
+            from cryptography.hazmat.primitives.serialization import (
+                load_pem_private_key,
+                load_pem_public_key,
+            )
+            from jwt.algorithms import ECAlgorithm, OKPAlgorithm, RSAAlgorithm
+        except ImportError as e:
+            raise RuntimeError(
+                "Asymmetric JWT keys require the cryptography package, "
+                "install pyjwt[crypto]"
+            ) from e
+
+        signing_key = None
+        if b"PRIVATE KEY" in pem:
+            signing_key = load_pem_private_key(pem, password=None)
+            verifying_key = signing_key.public_key()
+        else:
+            verifying_key = load_pem_public_key(pem)
+
+        if isinstance(verifying_key, ec.EllipticCurvePublicKey):
+            jwk = ECAlgorithm.to_jwk(verifying_key, as_dict=True)
+        elif isinstance(
+            verifying_key, (ed25519.Ed25519PublicKey, ed448.Ed448PublicKey)
+        ):
+            jwk = OKPAlgorithm.to_jwk(verifying_key, as_dict=True)
+        else:
+            jwk = RSAAlgorithm.to_jwk(verifying_key, as_dict=True)
+
+        default, allowed = _KEY_ALGORITHMS[jwk.get("crv", jwk["kty"])]
+        algorithm = algorithm if algorithm in allowed else default
+        kid = kid or _thumbprint(jwk)
+        jwk.update(kid=kid, alg=algorithm, use="sig")
+        return cls(kid, algorithm, verifying_key, signing_key, jwk)
+
+    @classmethod
+    def from_file(cls, entry: str | Path, algorithm: str | None = None) -> "JWTKey":
+        """
+        Loads a PEM file given as `path` or `kid=path`. The `kid` must be the
+        one the key signed with, when it was not derived from the key itself.
+        """
+
+        kid, sep, path = str(entry).partition("=")
+        if not sep:
+            kid, path = "", kid
+        return cls.from_pem(Path(path).read_bytes(), kid or None, algorithm)
+
+    @property
+    def public(self) -> bool:
+        return self.jwk is not None
+
+    def encode(self, payload: JWTPayload, **kwargs) -> str:
+        if self.signing_key is None:
+            raise ValueError(f"JWT key '{self.kid}' has no private key")
+        if self.kid is not None:
+            kwargs["headers"] = {**kwargs.get("headers", {}), "kid": self.kid}
+        return payload.to_token(self.signing_key, self.algorithm, **kwargs)
+
+    def decode(self, token: str, **kwargs) -> JWTPayload:
+        return JWTPayload.from_token(
+            token, self.verifying_key, self.algorithm, **kwargs
+        )
+
+
+def _token_kid(token: str) -> str | None:
+    # only the header segment is decoded here, the full token is parsed and
+    # checked once by the selected key
+    try:
+        segment = token.split(".", 1)[0].encode()
+        padding = b"=" * (-len(segment) % 4)
+        kid = json.loads(base64.urlsafe_b64decode(segment + padding)).get("kid")
+        if kid is not None and not isinstance(kid, str):
+            raise ValueError("Invalid kid header")
+    except (ValueError, AttributeError) as e:
+        raise BackendException(
+            http_status.HTTP_400_BAD_REQUEST, "Invalid token", "Invalid token", e
+        )
+    return kid
+
+
+class JWTKeyRing:
+    """
+    Signs with the current key and verifies with any known key, picked by
+    the token `kid` header.
+
+    Rotation: start signing with a new private key and keep the previous
+    public key until the tokens it signed have expired. Tokens without `kid`
+    are checked with the shared secret, if one is configured.
+    """
+
+    def __init__(self, signing_key: JWTKey, verifying_keys: Iterable[JWTKey] = ()):
+        self.signing_key = signing_key
+        self.keys: dict[str | None, JWTKey] = {signing_key.kid: signing_key}
+        for key in verifying_keys:
+            self.keys.setdefault(key.kid, key)
+        self.jwks = {"keys": [key.jwk for key in self.keys.values() if key.public]}
+        self.jwks_json = json.dumps(self.jwks, separators=(",", ":")).encode()
+
+    @classmethod
+    def from_settings(cls) -> "JWTKeyRing":
+        secret_key = None
+        if settings.SECRET_KEY and settings.JWT_ALGORITHM.startswith("HS"):
+            secret_key = JWTKey.from_secret(settings.SECRET_KEY, settings.JWT_ALGORITHM)
+
+        public_keys = list(map(JWTKey.from_file, settings.JWT_PUBLIC_KEY_FILES))
+        if secret_key is not None:
+            public_keys.append(secret_key)
+
+        if settings.JWT_PRIVATE_KEY_FILE:
+            signing_key = JWTKey.from_pem(
+                Path(settings.JWT_PRIVATE_KEY_FILE).read_bytes(),
+                kid=settings.JWT_KEY_ID or None,
+                algorithm=settings.JWT_ALGORITHM,
+            )
+        elif secret_key is not None:
+            signing_key = secret_key
+        else:
+            raise ValueError("Set SECRET_KEY or JWT_PRIVATE_KEY_FILE to sign tokens")
+
+        return cls(signing_key, public_keys)
+
+    def encode(self, payload: JWTPayload, **kwargs) -> str:
+        return self.signing_key.encode(payload, **kwargs)
+
+    def decode(self, token: str, **kwargs) -> JWTPayload:
+        key = self.keys.get(_token_kid(token))
+        if key is None:
+            raise BackendException(
+                http_status.HTTP_400_BAD_REQUEST, "Invalid token", "Unknown signing key"
+            )
+        return key.decode(token, **kwargs)
+
+
+@cache
+def get_key_ring() -> JWTKeyRing:
+    return JWTKeyRing.from_settings()
+
+
 def to_jwt_token(payload: JWTPayload, **kwargs) -> str:
-    return payload.to_token(settings.SECRET_KEY, settings.JWT_ALGORITHM, **kwargs)
+    return get_key_ring().encode(payload, **kwargs)
 
 
 def to_jwt_payload(token: str, **kwargs) -> JWTPayload:
-    return JWTPayload.from_token(
-        token, settings.SECRET_KEY, settings.JWT_ALGORITHM, **kwargs
-    )
+    return get_key_ring().decode(token, **kwargs)
 
 
-__all__ = ["JWTPayload", "to_jwt_token", "to_jwt_payload"]
+__all__ = [
+    "JWTKey",
+    "JWTKeyRing",
+    "JWTPayload",
+    "RevocationList",
+    "TokenCache",
+    "get_key_ring",
+    "to_jwt_token",
+    "to_jwt_payload",
+]
@@ -1,5 +1,20 @@
 from fastapi_pagination import Params
+from fastapi_pagination.bases import CursorRawParams
+from fastapi_pagination.cursor import CursorParams
 from typing import Annotated
-from fastapi import Depends
+from fastapi import Depends, Query
+
+
+class KeysetParams(CursorParams):
+    include_total: bool = Query(False, description="Count total number of items")
+
+    def to_raw_params(self) -> CursorRawParams:
+        return CursorRawParams(
+            cursor=self.decode_cursor(self.cursor),
+            size=self.size,
+            include_total=self.include_total,
+        )
+
 
 PaginationDep = Annotated[Params, Depends()]
+CursorPaginationDep = Annotated[KeysetParams, Depends()]
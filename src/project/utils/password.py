@@ -1,9 +1,17 @@
+import asyncio
+import os
 import secrets
-from typing import Protocol
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Protocol, TypeVar
 
 from pwdlib import PasswordHash
 from pwdlib.hashers.argon2 import Argon2Hasher
 from pwdlib.hashers.bcrypt import BcryptHasher
+from project.core.exceptions import BackendException, http_status
+from project.core.metrics import password_hash_duration, password_hash_rejected
+
+T = TypeVar("T")
 
 
 class IPasswordHelper(Protocol):
@@ -16,6 +24,18 @@ class IPasswordHelper(Protocol):
     def generate(self) -> str: ...  # pragma: no cover
 
 
+class IAsyncPasswordHelper(Protocol):
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]: ...  # pragma: no cover
+
+    async def hash(self, password: str) -> str: ...  # pragma: no cover
+
+    async def hash_many(self, passwords: list[str]) -> list[str]: ...  # pragma: no cover
+
+    def generate(self) -> str: ...  # pragma: no cover
+
+
 class DefaultPasswordHelper(IPasswordHelper):
     def __init__(self, password_hash: PasswordHash | None = None) -> None:
         if password_hash is None:
@@ -38,3 +58,114 @@ class DefaultPasswordHelper(IPasswordHelper):
 
     def generate(self) -> str:
         return secrets.token_urlsafe()
+
+
+class AsyncPasswordHelper(IAsyncPasswordHelper):
+    """
+    Runs a blocking `IPasswordHelper` in a bounded thread pool.
+
+    Argon2 and bcrypt release the GIL while hashing, so threads are enough to use
+    every core without stalling the event loop. Calls beyond `max_pending` are
+    rejected with 503 instead of piling up behind the pool.
+    """
+
+    def __init__(
+        self,
+        password_helper: IPasswordHelper | None = None,
+        max_workers: int | None = None,
+        max_pending: int = 256,
+    ) -> None:
+        self.password_helper = password_helper or DefaultPasswordHelper()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_time = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            password_hash_rejected.inc()
+            raise BackendException(
+                http_status.HTTP_503_SERVICE_UNAVAILABLE,
+                "Service unavailable",
+                "Too many authentication requests, try again later",
+            )
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        future = self.executor.submit(func, *args)
+        self.pending += 1
+
+        def done(future: Future) -> None:
+            # called once the thread is really done, even if the caller was
+            # cancelled meanwhile, counters are only touched on the loop thread
+            elapsed = time.perf_counter() - start
+            try:
+                loop.call_soon_threadsafe(
+                    self._finished, future, elapsed, func.__name__
+                )
+            except RuntimeError:  # the loop is already closed
+                pass
+
+        future.add_done_callback(done)
+        return await asyncio.wrap_future(future)
+
+    def _finished(self, future: Future, elapsed: float, operation: str) -> None:
+        self.pending -= 1
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            self.failed += 1
+            return
+        self.completed += 1
+        self.total_time += elapsed
+        password_hash_duration.observe(elapsed, operation=operation)
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        return await self._run(
+            self.password_helper.verify_and_update, plain_password, hashed_password
+        )
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.password_helper.hash, password)
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        # one chunk per pool size, so a bulk import never trips max_pending
+        hashed: list[str] = []
+        for idx in range(0, len(passwords), self.max_workers):
+            chunk = passwords[idx : idx + self.max_workers]
+            hashed.extend(await asyncio.gather(*map(self.hash, chunk)))
+        return hashed
+
+    def generate(self) -> str:
+        return self.password_helper.generate()
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "workers": self.max_workers,
+            "pending": self.pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "total_time": self.total_time,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -1,5 +1,5 @@
-import inflect
 import re
+from functools import cache, lru_cache
 
 
 def snake2camel(snake: str, start_lower: bool = False) -> str:
@@ -25,6 +25,15 @@ def camel2snake(camel: str) -> str:
     return snake.lower()
 
 
+@cache
+def _inflect_engine():
+    # inflect takes seconds to import (typeguard instruments it), so it is only
+    # loaded when a plural is actually needed
+    import inflect
+
+    return inflect.engine()
+
+
+@lru_cache(maxsize=1024)
 def make_plural(text: str):
-    p = inflect.engine()
-    return p.plural(text)  # type: ignore
+    return _inflect_engine().plural(text)  # type: ignore
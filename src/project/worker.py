@@ -0,0 +1,7 @@
+"""
+Celery worker entry point: `celery -A project.worker worker`.
+"""
+
+from project.repositories.celery import init_celery_repository
+
+app = init_celery_repository().worker
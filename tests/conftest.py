@@ -0,0 +1,155 @@
+import os
+import socket
+import tempfile
+from pathlib import Path
+
+# settings are read on import, point them at a throwaway database first
+_tmp = Path(tempfile.mkdtemp(prefix="project-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_tmp / 'test.sqlite'}"
+os.environ["DATABASE_REPLICA_URLS"] = "[]"
+os.environ["SECRET_KEY"] = "test-secret-key-test-secret-key-test"
+os.environ["LOGGER_OUT_IN_FILE"] = "false"
+os.environ["LOGGER_OUT_IN_CONSOLE"] = "false"
+os.environ["THROTTLE_LOGIN_IP_LIMIT"] = "1000"
+os.environ["CELERY_EAGER"] = "true"
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+RESOURCES = ("users", "roles", "permissions")
+ACTIONS = ("create", "read", "update", "delete")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _enable_foreign_keys(dbapi_connection, connection_record):
+    # sqlite ignores foreign keys unless asked, Postgres always enforces them
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+@pytest.fixture
+async def database():
+    from sqlalchemy import event
+    from project.core.session import engines
+    from project.models import Model
+
+    engine = engines["writer"].sync_engine
+    if not event.contains(engine, "connect", _enable_foreign_keys):
+        event.listen(engine, "connect", _enable_foreign_keys)
+
+    async with engines["writer"].begin() as conn:
+        await conn.run_sync(Model.metadata.create_all)
+    yield
+    async with engines["writer"].begin() as conn:
+        await conn.run_sync(Model.metadata.drop_all)
+    for engine in engines.values():
+        await engine.dispose()
+
+
+@pytest.fixture
+async def session(database):
+    from project.core.session import session_factory
+
+    async with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+async def client(database):
+    from project.core.asgi import create_app
+    from project.services.auth import access_token_cache
+    from project.services.rbac import rbac_cache
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            yield client
+    access_token_cache.clear()
+    rbac_cache.invalidate()
+
+
+@pytest.fixture
+async def admin(session, client):
+    """
+    Headers of a logged in user whose role has every permission.
+    """
+
+    from project.models import Permission, Role, User
+    from project.services.rbac import rbac_cache
+    from project.utils.password import DefaultPasswordHelper
+
+    permissions = [
+        Permission(resource=resource, action=action)
+        for resource in RESOURCES
+        for action in ACTIONS
+    ]
+    role = Role(name="admin", permissions=permissions)
+    session.add(role)
+    await session.flush()
+    session.add(
+        User(
+            email="admin@example.com",
+            hashed_password=DefaultPasswordHelper().hash("password"),
+            is_active=True,
+            is_verified=True,
+            role_id=role.id,
+        )
+    )
+    await session.commit()
+    rbac_cache.invalidate()
+
+    response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": "admin@example.com", "password": "password"},
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+class SMTPHandler:
+    def __init__(self):
+        self.messages: list[tuple[tuple, bytes]] = []
+        self.sessions: list = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((session.peer, envelope.content))
+        if server not in self.sessions:
+            self.sessions.append(server)
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def closed_port():
+    return free_port()
+
+
+@pytest.fixture
+def handler():
+    return SMTPHandler()
+
+
+@pytest.fixture
+def controller(handler):
+    """
+    Local SMTP server, received messages are kept on `handler`.
+    """
+
+    from aiosmtpd.controller import Controller
+
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller
+    controller.stop()
@@ -0,0 +1,186 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Annotated
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from pydantic import BaseModel
+
+from project.core.cbv import View
+
+pytestmark = pytest.mark.anyio
+
+
+def get_greeting() -> str:
+    return "hello"
+
+
+def get_suffix() -> str:
+    return "!"
+
+
+class GreetingView(View):
+    prefix = "/greetings"
+
+    greeting: Annotated[str, Depends(get_greeting)]
+    limit: int = 2
+
+    def __init__(self, suffix: str = Depends(get_suffix)):
+        self.suffix = suffix
+
+    @View.get("/{name}")
+    async def greet(self, name: str):
+        return {"text": f"{self.greeting} {name}{self.suffix}", "limit": self.limit}
+
+
+class PlainView(View):
+    prefix = "/plain"
+
+    greeting: Annotated[str, Depends(get_greeting)]
+
+    @View.get("/")
+    def read(self):
+        return {"text": self.greeting}
+
+
+UPDATED_AT = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+
+class Document(BaseModel):
+    id: int
+    title: str
+    updated_at: datetime
+
+
+class DocumentView(View):
+    prefix = "/documents"
+
+    @View.get(
+        "/{id}",
+        response_model=Document,
+        etag=True,
+        cache_control="private, max-age=60",
+    )
+    async def read(self, id: int):
+        return Document(id=id, title="draft", updated_at=UPDATED_AT)
+
+    @View.get(
+        "/{id}/versioned",
+        response_model=Document,
+        etag="updated_at",
+        last_modified="updated_at",
+    )
+    async def read_versioned(self, id: int):
+        return Document(id=id, title="draft", updated_at=UPDATED_AT)
+
+
+@pytest.fixture
+async def client():
+    app = FastAPI()
+    app.include_router(GreetingView.as_router())
+    app.include_router(PlainView.as_router())
+    app.include_router(DocumentView.as_router())
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+async def test_view_keeps_its_own_init(client):
+    assert "__init__" not in PlainView.__dict__
+    assert "__signature__" not in GreetingView.__dict__
+    view = GreetingView("?")
+    assert view.suffix == "?"
+
+
+async def test_endpoint_gets_init_and_attribute_dependencies(client):
+    response = await client.get("/greetings/world", params={"limit": 5})
+
+    assert response.json() == {"text": "hello world!", "limit": 5}
+
+
+async def test_sync_endpoint_without_init(client):
+    response = await client.get("/plain/")
+
+    assert response.json() == {"text": "hello"}
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value, usegmt=True)
+
+
+async def test_conditional_get_miss_returns_body_and_headers(client):
+    response = await client.get("/documents/1")
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "draft"
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["cache-control"] == "private, max-age=60"
+
+    response = await client.get("/documents/1", headers={"if-none-match": '"other"'})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    ["{tag}", "W/{tag}", '"other", {tag}', "*"],
+)
+async def test_conditional_get_matching_etag_is_304(client, if_none_match):
+    tag = (await client.get("/documents/1")).headers["etag"]
+
+    response = await client.get(
+        "/documents/1", headers={"if-none-match": if_none_match.format(tag=tag)}
+    )
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == tag
+    assert response.headers["cache-control"] == "private, max-age=60"
+
+
+async def test_conditional_get_weak_etag_and_last_modified(client):
+    response = await client.get("/documents/1/versioned")
+    tag = response.headers["etag"]
+
+    assert tag.startswith('W/"')
+    assert response.headers["last-modified"] == http_date(UPDATED_AT)
+    assert (await client.get("/documents/2/versioned")).headers["etag"] != tag
+
+    response = await client.get(
+        "/documents/1/versioned", headers={"if-none-match": tag}
+    )
+    assert response.status_code == 304
+
+
+async def test_conditional_get_if_modified_since(client):
+    response = await client.get(
+        "/documents/1/versioned",
+        headers={"if-modified-since": http_date(UPDATED_AT)},
+    )
+    assert response.status_code == 304
+
+    response = await client.get(
+        "/documents/1/versioned",
+        headers={"if-modified-since": http_date(UPDATED_AT - timedelta(seconds=1))},
+    )
+    assert response.status_code == 200
+    assert response.json()["id"] == 1
+
+
+async def test_conditional_get_if_none_match_wins_over_if_modified_since(client):
+    tag = (await client.get("/documents/1/versioned")).headers["etag"]
+    later = http_date(UPDATED_AT + timedelta(days=1))
+    earlier = http_date(UPDATED_AT - timedelta(days=1))
+
+    response = await client.get(
+        "/documents/1/versioned",
+        headers={"if-none-match": '"other"', "if-modified-since": later},
+    )
+    assert response.status_code == 200
+
+    response = await client.get(
+        "/documents/1/versioned",
+        headers={"if-none-match": tag, "if-modified-since": earlier},
+    )
+    assert response.status_code == 304
@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    NoEncryption,
+    PrivateFormat,
+    PublicFormat,
+)
+
+from project.config import settings
+from project.core.exceptions import BackendException
+from project.utils.jwts import JWTKey, JWTKeyRing, JWTPayload, TokenCache, now
+
+
+@pytest.fixture
+def old_key(tmp_path):
+    private_key = ed25519.Ed25519PrivateKey.generate()
+    private = tmp_path / "old.pem"
+    private.write_bytes(
+        private_key.private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption())
+    )
+    public = tmp_path / "old.pub"
+    public.write_bytes(
+        private_key.public_key().public_bytes(
+            Encoding.PEM, PublicFormat.SubjectPublicKeyInfo
+        )
+    )
+    return private, public
+
+
+@pytest.fixture
+def new_key(tmp_path):
+    private = tmp_path / "new.pem"
+    private.write_bytes(
+        ed25519.Ed25519PrivateKey.generate().private_bytes(
+            Encoding.PEM, PrivateFormat.PKCS8, NoEncryption()
+        )
+    )
+    return private
+
+
+def test_key_file_kid_defaults_to_thumbprint(old_key):
+    private, public = old_key
+    assert JWTKey.from_file(public).kid == JWTKey.from_file(private).kid
+
+
+def test_key_file_with_kid(old_key):
+    _, public = old_key
+    key = JWTKey.from_file(f"2026-01={public}")
+    assert key.kid == "2026-01"
+    assert key.jwk["kid"] == "2026-01"
+
+
+def test_rotation_keeps_custom_kid(old_key, new_key):
+    private, public = old_key
+    old_ring = JWTKeyRing(JWTKey.from_file(f"2026-01={private}"))
+    token = old_ring.encode(JWTPayload(sub="1"))
+
+    ring = JWTKeyRing(
+        JWTKey.from_file(f"2026-02={new_key}"),
+        [JWTKey.from_file(f"2026-01={public}")],
+    )
+    assert ring.decode(token).sub == "1"
+    assert [key["kid"] for key in ring.jwks["keys"]] == ["2026-02", "2026-01"]
+
+    # the thumbprint does not match the kid the old key signed with
+    ring = JWTKeyRing(JWTKey.from_file(new_key), [JWTKey.from_file(public)])
+    with pytest.raises(BackendException):
+        ring.decode(token)
+
+
+def test_key_ring_from_settings(monkeypatch, old_key, new_key):
+    private, public = old_key
+    monkeypatch.setattr(settings, "SECRET_KEY", "")
+    monkeypatch.setattr(settings, "JWT_PRIVATE_KEY_FILE", private)
+    monkeypatch.setattr(settings, "JWT_KEY_ID", "2026-01")
+    monkeypatch.setattr(settings, "JWT_PUBLIC_KEY_FILES", [])
+    token = JWTKeyRing.from_settings().encode(JWTPayload(sub="1"))
+
+    monkeypatch.setattr(settings, "JWT_PRIVATE_KEY_FILE", new_key)
+    monkeypatch.setattr(settings, "JWT_KEY_ID", "")
+    monkeypatch.setattr(settings, "JWT_PUBLIC_KEY_FILES", [f"2026-01={public}"])
+    ring = JWTKeyRing.from_settings()
+    assert ring.signing_key.kid != "2026-01"
+    assert ring.decode(token).sub == "1"
+
+
+def payload(sub: str, expires_in: int = 60) -> JWTPayload:
+    return JWTPayload(sub=sub, exp=now() + timedelta(seconds=expires_in))
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache: TokenCache[JWTPayload] = TokenCache(max_size=2)
+    cache.set("a", payload("a"))
+    cache.set("b", payload("b"))
+    assert cache.get("a").sub == "a"
+
+    cache.set("c", payload("c"))
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a").sub == "a"
+    assert cache.get("c").sub == "c"
+    assert cache.stats() == {"size": 2, "hits": 3, "misses": 1}
+
+
+def test_token_cache_drops_expired_entries():
+    cache: TokenCache[JWTPayload] = TokenCache()
+    cache.set("expired", payload("1", expires_in=-1))
+    cache.set("no exp", JWTPayload(sub="2"))
+
+    assert cache.get("expired") is None
+    assert cache.get("no exp") is None
+    assert len(cache) == 0
+    assert cache.stats()["misses"] == 2
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from project.core.smtp import SMTPConnectionPool
+from project.repositories import celery
+from project.repositories.celery import (
+    close_celery_repository,
+    get_celery_repository,
+    init_celery_repository,
+)
+from project.services.mail import MailService
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def celery_repo():
+    # CELERY_EAGER is set for the tests, tasks run on delay()
+    yield init_celery_repository()
+    close_celery_repository()
+
+
+@pytest.fixture
+def smtp_pool(controller, monkeypatch):
+    pool = SMTPConnectionPool(controller.hostname, controller.port, use_ssl=False)
+    monkeypatch.setattr("project.tasks.mail.smtp_pool", pool)
+    yield pool
+    pool.close()
+
+
+def current_thread() -> int:
+    return threading.get_ident()
+
+
+async def test_concurrent_first_requests_create_one_app(monkeypatch):
+    created = []
+
+    class SlowCeleryRepository(celery.CeleryRepository):
+        def __init__(self, *args, **kwargs):
+            created.append(self)
+            time.sleep(0.05)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(celery, "CeleryRepository", SlowCeleryRepository)
+    close_celery_repository()
+    try:
+        # sync dependencies run on worker threads, like here
+        repos = await asyncio.gather(
+            *(asyncio.to_thread(get_celery_repository) for _ in range(8))
+        )
+        assert len(created) == 1
+        assert all(repo is created[0] for repo in repos)
+    finally:
+        close_celery_repository()
+
+
+async def test_send_task_runs_off_the_event_loop(celery_repo):
+    task = celery_repo.wrap_task(current_thread)
+
+    result = await celery_repo.send_task(task)
+
+    assert await celery_repo.get_result(result, timeout=5) != threading.get_ident()
+
+
+async def test_send_message_delivers_in_eager_mode(celery_repo, smtp_pool, handler):
+    service = MailService(celery_repo)
+
+    result = await service.send_message(
+        "noreply@example.com", "user@example.com", "Welcome", "Hello"
+    )
+
+    assert await celery_repo.get_result(result, timeout=5) == 1
+    assert len(handler.messages) == 1
+    assert b"Subject: Welcome" in handler.messages[0][1]
+
+
+async def test_send_messages_queues_one_task_per_batch(
+    celery_repo, smtp_pool, handler, monkeypatch
+):
+    monkeypatch.setattr("project.services.mail.settings.MAIL_BATCH_SIZE", 2)
+    service = MailService(celery_repo)
+    payloads = [
+        service._payload("noreply@example.com", f"user{idx}@example.com", None, "Hi")
+        for idx in range(5)
+    ]
+
+    results = await service.send_messages(payloads)
+
+    assert [await celery_repo.get_result(result) for result in results] == [2, 2, 1]
+    assert len(handler.messages) == 5
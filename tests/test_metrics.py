@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from project.core.metrics import Counter, Gauge, Histogram, Registry, SharedMetrics
+
+
+def make_registry() -> Registry:
+    registry = Registry()
+    Counter("requests", "Requests", ("route",), registry=registry)
+    Gauge("in_flight", "In flight", registry=registry)
+    Histogram("latency", "Latency", buckets=(0.1, 1.0), registry=registry)
+    return registry
+
+
+@pytest.fixture
+def registry():
+    return make_registry()
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def write_worker(directory, pid: int, registry: Registry):
+    states = {
+        name: [[list(key), value] for key, value in state.items()]
+        for name, state in registry.collect().items()
+    }
+    (directory / f"{pid}.json").write_text(json.dumps({"pid": pid, "metrics": states}))
+
+
+def update(registry: Registry, requests: int, in_flight: int, latency: float):
+    registry.metrics["requests"].inc(requests, route="/users")
+    registry.metrics["in_flight"].set(in_flight)
+    registry.metrics["latency"].observe(latency)
+
+
+def test_render(registry):
+    update(registry, 2, 1, 0.5)
+
+    text = registry.render()
+
+    assert 'requests_total{route="/users"} 2' in text
+    assert "in_flight 1" in text
+    assert 'latency_bucket{le="0.1"} 0' in text
+    assert 'latency_bucket{le="1"} 1' in text
+    assert "latency_sum 0.5" in text
+    assert "latency_count 1" in text
+
+
+def test_shared_metrics_sum_workers(tmp_path, registry):
+    other = make_registry()
+    update(other, 3, 2, 0.05)
+    write_worker(tmp_path, os.getppid(), other)
+
+    update(registry, 2, 1, 0.5)
+    text = SharedMetrics(tmp_path, registry).render()
+
+    assert (tmp_path / f"{os.getpid()}.json").exists()
+    assert 'requests_total{route="/users"} 5' in text
+    assert "in_flight 3" in text
+    assert 'latency_bucket{le="0.1"} 1' in text
+    assert 'latency_bucket{le="1"} 2' in text
+    assert "latency_count 2" in text
+
+
+def test_exited_worker_keeps_counters_but_not_gauges(tmp_path, registry):
+    other = make_registry()
+    update(other, 3, 2, 0.05)
+    write_worker(tmp_path, dead_pid(), other)
+
+    text = SharedMetrics(tmp_path, registry).render()
+
+    assert 'requests_total{route="/users"} 3' in text
+    assert "in_flight 2" not in text
+    assert "latency_count 1" in text
+
+
+def test_clear_removes_old_states(tmp_path, registry):
+    shared = SharedMetrics(tmp_path, registry)
+    shared.write()
+
+    shared.clear()
+
+    assert not list(tmp_path.glob("*.json"))
@@ -0,0 +1,92 @@
+import base64
+import json
+
+import pytest
+from sqlalchemy import inspect
+
+from project.repositories.base import BaseRepository
+
+pytestmark = pytest.mark.anyio
+
+
+def encode(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+async def test_cursor_pages_walk_every_row_once(client, admin):
+    ids: list[int] = []
+    params = {"size": 5}
+    pages = 0
+
+    while True:
+        response = await client.get(
+            "/api/v1/permissions/cursor", params=params, headers=admin
+        )
+        assert response.status_code == 200, response.text
+        page = response.json()
+        ids.extend(item["id"] for item in page["items"])
+        pages += 1
+        if page["next_page"] is None:
+            break
+        params["cursor"] = page["next_page"]
+
+    assert pages == 3
+    assert ids == sorted(ids)
+    assert len(ids) == len(set(ids)) == 12
+
+
+async def test_cursor_page_counts_total_on_request(client, admin):
+    response = await client.get(
+        "/api/v1/permissions/cursor", params={"size": 5}, headers=admin
+    )
+    assert response.json()["total"] is None
+
+    response = await client.get(
+        "/api/v1/permissions/cursor",
+        params={"size": 5, "include_total": True},
+        headers=admin,
+    )
+    assert response.json()["total"] == 12
+
+
+async def test_cursor_with_other_columns_is_rejected(client, admin):
+    response = await client.get(
+        "/api/v1/roles/cursor", params={"cursor": encode([1, 2])}, headers=admin
+    )
+
+    assert response.status_code == 400
+    assert response.json()["debug"] == "Cursor does not match ordering columns"
+
+
+async def test_cursor_of_wrong_type_is_rejected(client, admin):
+    response = await client.get(
+        "/api/v1/roles/cursor", params={"cursor": encode(["x"])}, headers=admin
+    )
+
+    assert response.status_code == 400
+
+
+async def test_cursor_routes_are_not_taken_for_ids(client, admin):
+    for path in ("/api/v1/users/cursor", "/api/v1/roles/cursor"):
+        response = await client.get(path, headers=admin)
+        assert response.status_code == 200, response.text
+        assert len(response.json()["items"]) == 1
+
+
+def subclasses(cls):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from subclasses(subclass)
+
+
+def test_cursor_columns_are_indexed():
+    repositories = [repo for repo in subclasses(BaseRepository) if repo.cursor_field]
+    assert repositories
+
+    for repo in repositories:
+        mapper = inspect(repo.model)
+        ordering = [mapper.columns[repo.cursor_field], *mapper.primary_key]
+        prefixes = [
+            list(index.columns)[: len(ordering)] for index in mapper.local_table.indexes
+        ]
+        assert ordering in prefixes, f"{repo.__name__} cursor pages are not indexed"
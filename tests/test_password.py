@@ -0,0 +1,93 @@
+import asyncio
+import threading
+
+import pytest
+
+from project.utils.password import AsyncPasswordHelper
+
+pytestmark = pytest.mark.anyio
+
+
+class BlockingHelper:
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def hash(self, password: str) -> str:
+        self.started.set()
+        self.release.wait(5)
+        if password == "fail":
+            raise ValueError(password)
+        return f"hashed:{password}"
+
+    def verify_and_update(self, plain_password, hashed_password):
+        return hashed_password == f"hashed:{plain_password}", None
+
+    def generate(self) -> str:
+        return "generated"
+
+
+async def wait_for(predicate):
+    for _ in range(100):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+@pytest.fixture
+async def helper():
+    helper = AsyncPasswordHelper(BlockingHelper(), max_workers=1)
+    yield helper
+    helper.password_helper.release.set()
+    helper.shutdown()
+
+
+async def test_counts_completed_calls(helper):
+    helper.password_helper.release.set()
+
+    assert await helper.hash("secret") == "hashed:secret"
+    await wait_for(lambda: helper.pending == 0)
+    assert helper.stats()["completed"] == 1
+    assert helper.stats()["failed"] == 0
+
+
+async def test_failed_call_is_not_completed(helper):
+    helper.password_helper.release.set()
+
+    with pytest.raises(ValueError):
+        await helper.hash("fail")
+    await wait_for(lambda: helper.pending == 0)
+    assert helper.completed == 0
+    assert helper.failed == 1
+
+
+async def test_cancelled_call_stays_pending_while_hashing(helper):
+    task = asyncio.create_task(helper.hash("secret"))
+    await asyncio.to_thread(helper.password_helper.started.wait, 5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # the thread is still busy, its slot must still be taken
+    await asyncio.sleep(0.05)
+    assert helper.pending == 1
+
+    helper.password_helper.release.set()
+    await wait_for(lambda: helper.pending == 0)
+    assert helper.completed == 1
+
+
+async def test_rejects_over_max_pending(helper):
+    from project.core.exceptions import BackendException
+
+    helper.max_pending = 1
+    task = asyncio.create_task(helper.hash("secret"))
+    await asyncio.to_thread(helper.password_helper.started.wait, 5)
+
+    with pytest.raises(BackendException):
+        await helper.hash("other")
+    assert helper.rejected == 1
+
+    helper.password_helper.release.set()
+    assert await task == "hashed:secret"
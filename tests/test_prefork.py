@@ -0,0 +1,106 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from tests.conftest import free_port
+
+pytestmark = pytest.mark.skipif(
+    not Path("/proc/self/stat").exists(), reason="finds workers through /proc"
+)
+
+SERVER = """
+import os, sys, uvicorn
+from project.core.prefork import PreforkServer
+
+async def app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": str(os.getpid()).encode()})
+
+config = uvicorn.Config(
+    app, host="127.0.0.1", port=int(sys.argv[1]), lifespan="off", log_level="error"
+)
+sys.exit(PreforkServer(config, workers=2).run())
+"""
+
+
+def children(pid: int) -> set[int]:
+    # live processes whose parent is `pid`, zombies are already gone
+    found = set()
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        if fields[0] != "Z" and int(fields[1]) == pid:
+            found.add(int(stat.parent.name))
+    return found
+
+
+def alive(pid: int) -> bool:
+    try:
+        return Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()[0] != "Z"
+    except (OSError, IndexError):
+        return False
+
+
+def wait_until(condition, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def server():
+    port = free_port()
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).parent.parent / "src")}
+    process = subprocess.Popen([sys.executable, "-c", SERVER, str(port)], env=env)
+
+    def serving() -> bool:
+        try:
+            return httpx.get(f"http://127.0.0.1:{port}/").status_code == 200
+        except httpx.TransportError:
+            return False
+
+    workers: set[int] = set()
+    try:
+        wait_until(lambda: len(children(process.pid)) == 2 and serving())
+        workers = children(process.pid)
+        yield process, port
+    finally:
+        process.kill()
+        process.wait()
+        # the workers that outlived a failed test
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+
+def test_workers_serve_and_stop_with_the_parent(server):
+    process, port = server
+    workers = children(process.pid)
+
+    assert int(httpx.get(f"http://127.0.0.1:{port}/").text) in workers
+
+    process.send_signal(signal.SIGTERM)
+    assert process.wait(timeout=10) == 0
+    assert not any(map(alive, workers))
+
+
+def test_workers_stop_when_the_parent_is_killed(server):
+    process, _ = server
+    workers = children(process.pid)
+
+    process.kill()
+    process.wait()
+
+    wait_until(lambda: not any(map(alive, workers)), timeout=5)
@@ -0,0 +1,87 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from project.core.middlewares import QueryStatsMiddleware
+from project.core.middlewares import query_stats as middleware_module
+from project.core.query_stats import QueryStats, current_query_stats, instrument_engine
+
+pytestmark = pytest.mark.anyio
+
+
+class RecordingLog:
+    def __init__(self):
+        self.warnings: list[str] = []
+
+    def warning(self, message, *args):
+        self.warnings.append(message % args)
+
+    def debug(self, message, *args):
+        pass
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_engine("test", engine)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def log(monkeypatch):
+    log = RecordingLog()
+    monkeypatch.setattr(middleware_module, "log", log)
+    return log
+
+
+@pytest.fixture
+async def client(engine, log):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, headers=True, n_plus_one_threshold=3)
+
+    @app.get("/queries/{count}")
+    async def run_queries(count: int):
+        async with engine.connect() as conn:
+            for _ in range(count):
+                await conn.execute(text("SELECT 1"))
+        return {"count": count}
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+async def test_statements_are_counted_per_request(client, log):
+    first = await client.get("/queries/3")
+    second = await client.get("/queries/1")
+
+    assert first.headers["x-db-query-count"] == "3"
+    assert second.headers["x-db-query-count"] == "1"
+    assert first.headers["server-timing"].startswith("db;dur=")
+    # only the first request repeats a statement often enough
+    assert len(log.warnings) == 1
+    assert "executed 3 times: SELECT 1" in log.warnings[0]
+
+
+async def test_statements_outside_requests_are_not_collected(client, engine):
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    assert current_query_stats.get() is None
+    response = await client.get("/queries/0")
+    assert response.headers["x-db-query-count"] == "0"
+
+
+def test_query_stats_keep_the_slowest_statements():
+    stats = QueryStats(keep_slowest=2)
+    for statement, duration in [("a", 0.1), ("b", 0.3), ("c", 0.2), ("a", 0.05)]:
+        stats.record(statement, duration)
+
+    assert stats.count == 4
+    assert stats.total_time == pytest.approx(0.65)
+    assert stats.slowest == [(0.3, "b"), (0.2, "c")]
+    assert stats.repeated(2) == {"a": 2}
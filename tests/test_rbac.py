@@ -0,0 +1,121 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from project.core.session import session_factory
+from project.models import Permission, Role
+from project.repositories.rbac import RoleRepository
+from project.schemas.rbac import RoleUpdate
+from project.services import rbac
+from project.services.rbac import RBACCache, RoleService
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeRoleRepository:
+    def __init__(self, roles: list[Role]):
+        self.roles = {role.id: role for role in roles}
+        self.loads = 0
+        self.lookups = 0
+
+    async def get_all(self) -> list[Role]:
+        self.loads += 1
+        return list(self.roles.values())
+
+    async def get_by_id(self, id: int) -> Role | None:
+        self.lookups += 1
+        return self.roles.get(id)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rbac, "time", clock)
+    return clock
+
+
+def make_role(id: int, name: str, *actions: str) -> Role:
+    return Role(
+        id=id,
+        name=name,
+        permissions=[Permission(resource="users", action=action) for action in actions],
+    )
+
+
+async def test_warm_loads_every_role(clock):
+    repo = FakeRoleRepository([make_role(1, "admin", "read", "delete")])
+    cache = RBACCache(ttl=60)
+
+    await cache.warm(repo)
+    cached = await cache.get(1, repo)
+
+    assert cached == ("admin", ("users:read", "users:delete"))
+    assert (repo.loads, repo.lookups) == (1, 0)
+
+
+async def test_roles_missing_from_the_cache_are_looked_up(clock):
+    repo = FakeRoleRepository([make_role(1, "admin")])
+    cache = RBACCache(ttl=60)
+    await cache.warm(repo)
+
+    repo.roles[2] = make_role(2, "staff", "read")
+    assert (await cache.get(2, repo)).name == "staff"
+    assert (await cache.get(2, repo)).name == "staff"
+    assert await cache.get(3, repo) is None
+    assert (repo.loads, repo.lookups) == (1, 2)
+
+
+async def test_cache_reloads_after_ttl(clock):
+    repo = FakeRoleRepository([make_role(1, "admin")])
+    cache = RBACCache(ttl=60)
+    await cache.get(1, repo)
+
+    repo.roles[1] = make_role(1, "owner")
+    clock.now += 60
+    assert (await cache.get(1, repo)).name == "admin"
+
+    clock.now += 1
+    assert (await cache.get(1, repo)).name == "owner"
+    assert repo.loads == 2
+
+
+@pytest.fixture
+async def role(database):
+    async with session_factory() as session:
+        session.add(Role(id=1, name="staff"))
+        await session.commit()
+        await rbac.rbac_cache.warm(RoleRepository(session))
+    yield
+    rbac.rbac_cache.invalidate()
+
+
+async def update_role(session: AsyncSession, name: str):
+    # a request unit of work, committed or rolled back by the caller
+    session.info["unit_of_work"] = True
+    service = RoleService(RoleRepository(session))
+    await service.patch(1, RoleUpdate(name=name))
+
+
+async def test_role_update_invalidates_after_commit(role):
+    async with session_factory() as session:
+        await update_role(session, "manager")
+        assert not rbac.rbac_cache.expired
+
+        await session.commit()
+        assert rbac.rbac_cache.expired
+
+
+async def test_role_update_rolled_back_keeps_cache(role):
+    async with session_factory() as session:
+        await update_role(session, "manager")
+        await session.rollback()
+
+    assert not rbac.rbac_cache.expired
+    assert rbac.rbac_cache._roles[1].name == "staff"
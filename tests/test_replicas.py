@@ -0,0 +1,102 @@
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from project.core import session as session_module
+from project.core.replicas import ReplicaSet
+from project.core.session import RoutingSession, engines, session_factory
+from project.models import Permission
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def replicas(monkeypatch, tmp_path):
+    # empty databases: a statement sent to a replica fails with "no such table"
+    replicas = ReplicaSet(
+        {
+            "reader_0": create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'r0'}"),
+            "reader_1": create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'r1'}"),
+        },
+        max_lag=5.0,
+    )
+    monkeypatch.setattr(session_module, "replicas", replicas)
+    yield replicas
+    for replica in replicas.replicas:
+        await replica.engine.dispose()
+
+
+def engine_of(replica):
+    return replica.engine.sync_engine
+
+
+async def test_reads_stick_to_one_replica(replicas):
+    session = RoutingSession()
+    read = select(Permission)
+
+    bind = session.get_bind(clause=read)
+    assert bind in [engine_of(replica) for replica in replicas.replicas]
+    assert session.get_bind(clause=read) is bind
+
+
+async def test_replicas_are_used_in_turn(replicas):
+    binds = {RoutingSession().get_bind(clause=select(Permission)) for _ in range(4)}
+
+    assert binds == {engine_of(replica) for replica in replicas.replicas}
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [insert(Permission), select(Permission).with_for_update()],
+    ids=["write", "for update"],
+)
+async def test_session_sticks_to_writer_after_write_or_lock(replicas, statement):
+    session = RoutingSession()
+    assert session.get_bind(clause=select(Permission)) is not engines["writer"].sync_engine
+
+    assert session.get_bind(clause=statement) is engines["writer"].sync_engine
+    assert session.get_bind(clause=select(Permission)) is engines["writer"].sync_engine
+
+
+async def test_reads_after_flush_go_to_writer(database, replicas):
+    async with session_factory() as session:
+        session.add(Permission(resource="users", action="read"))
+        await session.flush()
+
+        # the replicas have no tables, this only works on the writer
+        assert session.info["use_writer"]
+        assert len((await session.scalars(select(Permission))).all()) == 1
+        await session.rollback()
+
+
+async def test_unhealthy_or_lagging_replicas_fall_back_to_writer(replicas):
+    first, second = replicas.replicas
+    session = RoutingSession()
+    session.info["replica"] = first
+
+    first.eject("connection lost")
+    assert session.get_bind(clause=select(Permission)) is engine_of(second)
+
+    second.lag = 30.0
+    assert replicas.available() == []
+    assert RoutingSession().get_bind(clause=select(Permission)) is (
+        engines["writer"].sync_engine
+    )
+
+
+async def test_check_ejects_and_restores_replicas(replicas, tmp_path):
+    replica, _ = replicas.replicas
+
+    replica.lag = 30.0
+    replica.eject("connection lost")
+    await replicas.check(replica)
+    assert replica.healthy
+    assert replica.lag == 0.0
+
+    broken = ReplicaSet(
+        {"broken": create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/x/y.db")}
+    )
+    await broken.check_all()
+    assert broken.replicas[0].healthy is False
+    assert broken.replicas[0].failures == 1
+    await broken.replicas[0].engine.dispose()
@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import func, select
+
+from project.models import Permission, Role
+from project.models.auth import RolePermissionRel
+from project.repositories.rbac import PermissionRepository, RoleRepository
+
+pytestmark = pytest.mark.anyio
+
+
+async def count(session, model) -> int:
+    return await session.scalar(select(func.count()).select_from(model))
+
+
+@pytest.fixture
+async def roles(session):
+    permissions = [Permission(resource="users", action=action) for action in "crud"]
+    roles = [
+        Role(name="editor", permissions=permissions[:2]),
+        Role(name="viewer", permissions=permissions[1:]),
+        Role(name="guest"),
+    ]
+    session.add_all(roles)
+    await session.commit()
+    return roles
+
+
+async def test_bulk_delete_roles_with_permissions(session, roles):
+    await RoleRepository(session).delete_many(roles[:2], commit=True)
+
+    assert await count(session, Role) == 1
+    assert await count(session, RolePermissionRel) == 0
+    assert await count(session, Permission) == 4
+
+
+async def test_bulk_delete_permissions_granted_to_roles(session, roles):
+    permissions = list(await session.scalars(select(Permission).limit(2)))
+
+    await PermissionRepository(session).delete_many(permissions, commit=True)
+
+    assert await count(session, Permission) == 2
+    assert await count(session, RolePermissionRel) == 2
+    assert await count(session, Role) == 3
+
+
+async def test_bulk_delete_roles_endpoint(client, admin, roles):
+    response = await client.delete(
+        "/api/v1/roles/bulk",
+        params={"ids": [role.id for role in roles[:2]]},
+        headers=admin,
+    )
+
+    assert response.status_code == 200, response.text
+    assert [role["name"] for role in response.json()] == ["editor", "viewer"]
@@ -0,0 +1,199 @@
+import pytest
+from starlette.requests import Request
+
+from project.core.exceptions import BackendException
+from project.core.security import (
+    Authorization,
+    AuthorizationContext,
+    HasPermission,
+    HasRole,
+    Policy,
+    _AllPolicy,
+    _AnyPolicy,
+    _CheckPolicy,
+    _PermissionPolicy,
+    _RolePolicy,
+)
+from project.schemas.auth import AccessToken
+
+pytestmark = pytest.mark.anyio
+
+
+def make_token(role: str = "user", permissions: tuple[str, ...] = ()) -> AccessToken:
+    return AccessToken(
+        sub="1", email="user@example.com", role=role, permissions=list(permissions)
+    )
+
+
+def make_request() -> Request:
+    return Request({"type": "http", "headers": []})
+
+
+class CountingCheck(Authorization):
+    def __init__(self, result: bool):
+        self.result = result
+        self.calls = 0
+
+    async def check(self, token: AccessToken) -> bool:
+        self.calls += 1
+        return self.result
+
+
+class FakeAuthService:
+    def __init__(self, token: AccessToken):
+        self.token = token
+
+    def decode_token(self, token: str) -> AccessToken:
+        return self.token
+
+
+async def evaluate(authorization: Authorization, token: AccessToken) -> bool:
+    return await authorization.bind("users")._policy(AuthorizationContext(token))
+
+
+async def test_and_of_permissions_compiles_to_one_set_check():
+    policy = (HasPermission("read") & HasPermission("update")).compile("users")
+
+    assert isinstance(policy, _PermissionPolicy)
+    assert policy.require_all
+    assert policy.permissions == {"users:read", "users:update"}
+
+
+async def test_or_of_roles_compiles_to_one_set_check():
+    policy = (HasRole("Admin") | HasRole("staff") | HasRole("owner")).compile()
+
+    assert isinstance(policy, _RolePolicy)
+    assert policy.roles == {"admin", "staff", "owner"}
+
+
+async def test_custom_checks_run_after_set_checks():
+    custom = CountingCheck(True)
+    policy = (custom & HasPermission("read")).compile("users")
+
+    assert isinstance(policy, _AllPolicy)
+    assert isinstance(policy.policies[0], _PermissionPolicy)
+    assert isinstance(policy.policies[-1], _CheckPolicy)
+
+
+async def test_or_merges_set_checks_and_keeps_nested_and():
+    custom = CountingCheck(True)
+    both = HasPermission("read") & HasPermission("update")
+    policy = (
+        (HasPermission("delete") | custom) | (HasRole("admin") | both)
+    ).compile("users")
+
+    assert isinstance(policy, _AnyPolicy)
+    permissions, roles, nested, check = policy.policies
+    assert isinstance(permissions, _PermissionPolicy)
+    assert not permissions.require_all
+    assert permissions.permissions == {"users:delete"}
+    assert isinstance(roles, _RolePolicy)
+    assert roles.roles == {"admin"}
+    assert isinstance(nested, _PermissionPolicy)
+    assert nested.require_all
+    assert isinstance(check, _CheckPolicy)
+
+
+async def test_or_short_circuits_before_custom_check():
+    custom = CountingCheck(False)
+    authorization = HasRole("admin") | custom
+
+    assert await evaluate(authorization, make_token(role="admin"))
+    assert custom.calls == 0
+
+    assert await evaluate(authorization, make_token()) is False
+    assert custom.calls == 1
+
+
+async def test_always_allowed_branch_short_circuits_or():
+    policy = (HasRole("admin") | Authorization()).compile()
+
+    assert type(policy) is Policy
+
+
+@pytest.mark.parametrize(
+    ("token", "allowed"),
+    [
+        (make_token(permissions=("users:read", "users:update")), True),
+        (make_token(permissions=("users:read",)), False),
+        (make_token(role="admin"), True),
+        (make_token(role="ADMIN "), True),
+        (make_token(role="guest", permissions=("roles:read",)), False),
+    ],
+)
+async def test_and_or_combination(token, allowed):
+    authorization = (HasPermission("read") & HasPermission("update")) | HasRole(
+        "admin"
+    )
+
+    assert await evaluate(authorization, token) is allowed
+
+
+async def test_and_short_circuits_before_custom_check():
+    custom = CountingCheck(True)
+    authorization = HasPermission("delete") & custom
+
+    assert await evaluate(authorization, make_token()) is False
+    assert custom.calls == 0
+
+    assert await evaluate(authorization, make_token(permissions=("users:delete",)))
+    assert custom.calls == 1
+
+
+async def test_check_result_is_memoized_per_context():
+    custom = CountingCheck(False)
+    context = AuthorizationContext(make_token())
+
+    first = (custom | HasRole("admin")).bind("users")
+    second = (HasRole("staff") | custom).bind("users")
+
+    assert await first._policy(context) is False
+    assert await second._policy(context) is False
+    assert custom.calls == 1
+
+    # a new request evaluates it again
+    assert await first._policy(AuthorizationContext(make_token())) is False
+    assert custom.calls == 2
+
+
+async def test_context_is_shared_through_request_state():
+    request = make_request()
+    token = make_token(role="Admin", permissions=("Users:Read",))
+
+    context = AuthorizationContext.from_request(request, token)
+
+    assert request.state.authorization is context
+    assert context.role == "admin"
+    assert context.permissions == {"users:read"}
+    assert AuthorizationContext.from_request(request, token) is context
+
+    other = AuthorizationContext.from_request(request, make_token())
+    assert other is not context
+    assert request.state.authorization is other
+
+
+async def test_dependency_allows_and_returns_token():
+    token = make_token(permissions=("users:read",))
+    authorization = HasPermission("read").bind("users")
+    request = make_request()
+
+    result = await authorization(request, FakeAuthService(token), "raw", None)
+
+    assert result is token
+    assert isinstance(request.state.authorization, AuthorizationContext)
+
+
+async def test_dependency_denies_with_403():
+    authorization = HasPermission("delete").bind("users")
+
+    with pytest.raises(BackendException) as error:
+        await authorization(make_request(), FakeAuthService(make_token()), "raw", None)
+    assert error.value.code == 403
+
+
+async def test_dependency_without_token_is_401():
+    authorization = HasPermission("read").bind("users")
+
+    with pytest.raises(BackendException) as error:
+        await authorization(make_request(), FakeAuthService(make_token()), None, None)
+    assert error.value.code == 401
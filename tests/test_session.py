@@ -0,0 +1,94 @@
+import pytest
+from sqlalchemy import event, func, select
+
+from project.config import settings
+from project.core.session import get_session, session_factory
+from project.models import Permission
+from project.repositories.rbac import PermissionRepository
+
+pytestmark = pytest.mark.anyio
+
+
+class Transactions:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def committed(self, session):
+        self.commits += 1
+
+    def rolled_back(self, session):
+        self.rollbacks += 1
+
+
+async def run_request(view) -> Transactions:
+    """
+    Runs `view(session)` inside `get_session` the way FastAPI drives the
+    dependency, and counts the transactions it ends.
+    """
+
+    transactions = Transactions()
+    dependency = get_session()
+    session = await anext(dependency)
+    event.listen(session.sync_session, "after_commit", transactions.committed)
+    event.listen(session.sync_session, "after_rollback", transactions.rolled_back)
+
+    try:
+        await view(session)
+    except Exception as e:
+        with pytest.raises(type(e)):
+            await dependency.athrow(e)
+    else:
+        with pytest.raises(StopAsyncIteration):
+            await anext(dependency)
+    return transactions
+
+
+async def count_permissions() -> int:
+    async with session_factory() as session:
+        return await session.scalar(select(func.count()).select_from(Permission))
+
+
+async def create_two(session):
+    repo = PermissionRepository(session)
+    await repo.create({"resource": "users", "action": "read"})
+    await repo.create({"resource": "users", "action": "update"})
+
+
+async def test_request_writes_are_committed_once(database):
+    transactions = await run_request(create_two)
+
+    assert transactions.commits == 1
+    assert await count_permissions() == 2
+
+
+async def test_read_only_request_does_not_commit(database):
+    async def view(session):
+        await PermissionRepository(session).get_by_id(1)
+
+    transactions = await run_request(view)
+
+    assert transactions.commits == 0
+
+
+async def test_failed_request_is_rolled_back(database):
+    async def view(session):
+        await create_two(session)
+        raise RuntimeError("view failed")
+
+    transactions = await run_request(view)
+
+    assert transactions.commits == 0
+    assert transactions.rollbacks == 1
+    assert await count_permissions() == 0
+
+
+async def test_repositories_commit_per_call_without_unit_of_work(
+    database, monkeypatch
+):
+    monkeypatch.setattr(settings, "DB_UNIT_OF_WORK", False)
+
+    transactions = await run_request(create_two)
+
+    assert transactions.commits == 2
+    assert await count_permissions() == 2
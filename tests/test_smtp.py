@@ -0,0 +1,93 @@
+import threading
+from email.message import EmailMessage
+
+import pytest
+
+from project.core.smtp import SMTPConnectionPool, SMTPDeliveryError
+
+
+def make_message(idx: int) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "noreply@example.com"
+    message["To"] = f"user{idx}@example.com"
+    message["Subject"] = f"Message {idx}"
+    message.set_content("Hello")
+    return message
+
+
+@pytest.fixture
+def pool(controller):
+    pool = SMTPConnectionPool(
+        controller.hostname, controller.port, use_ssl=False, timeout=5, size=2
+    )
+    yield pool
+    pool.close()
+
+
+def drop_connections(controller, handler):
+    dropped = threading.Event()
+
+    def drop():
+        for server in handler.sessions:
+            server.transport.close()
+        dropped.set()
+
+    controller.loop.call_soon_threadsafe(drop)
+    assert dropped.wait(5)
+
+
+def test_messages_share_one_connection(pool, handler):
+    assert pool.send_many([make_message(idx) for idx in range(3)]) == []
+    assert pool.send_many([make_message(3)]) == []
+
+    assert len(handler.messages) == 4
+    assert len({peer for peer, _ in handler.messages}) == 1
+    assert pool._opened == 1
+
+
+def test_connection_replaced_after_max_messages(controller, handler):
+    pool = SMTPConnectionPool(
+        controller.hostname, controller.port, use_ssl=False, max_messages=2
+    )
+
+    pool.send_many([make_message(idx) for idx in range(5)])
+    pool.close()
+
+    assert len(handler.messages) == 5
+    assert len({peer for peer, _ in handler.messages}) == 3
+
+
+def test_reconnects_when_server_drops_the_session(pool, controller, handler):
+    pool.send_many([make_message(0)])
+    drop_connections(controller, handler)
+
+    assert pool.send_many([make_message(1), make_message(2)]) == []
+
+    assert len(handler.messages) == 3
+    first, *rest = [peer for peer, _ in handler.messages]
+    assert first not in rest
+    assert pool._opened == 1
+
+
+def test_idle_connection_checked_before_reuse(controller, handler):
+    pool = SMTPConnectionPool(
+        controller.hostname, controller.port, use_ssl=False, idle_check=0
+    )
+    pool.send_many([make_message(0)])
+    drop_connections(controller, handler)
+
+    pool.send_many([make_message(1)])
+    pool.close()
+
+    assert len({peer for peer, _ in handler.messages}) == 2
+
+
+def test_unreachable_server_raises_delivery_error(closed_port):
+    pool = SMTPConnectionPool(
+        "127.0.0.1", closed_port, use_ssl=False, timeout=1, max_reconnects=1
+    )
+
+    with pytest.raises(SMTPDeliveryError) as error:
+        pool.send_many([make_message(0)])
+    assert error.value.sent == 0
+    assert pool._opened == 0
@@ -0,0 +1,180 @@
+import pytest
+from typer.testing import CliRunner
+
+from project.config import settings
+from project.core.cli.server import server_cli
+from project.core.exceptions import BackendException
+from project.core.throttling import (
+    LoginThrottle,
+    MemoryThrottleBackend,
+    RedisThrottleBackend,
+    login_throttle,
+)
+
+pytestmark = pytest.mark.anyio
+
+WINDOW = 60.0
+START = 6000.0  # start of a window
+
+
+class Clock:
+    def __init__(self, now: float = START):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values: dict[str, int] = {}
+
+    async def incr(self, key: str) -> int:
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+    async def expire(self, key: str, seconds: int) -> None:
+        pass
+
+    async def get(self, key: str) -> int | None:
+        return self.values.get(key)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.values.pop(key, None)
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request, clock):
+    if request.param == "memory":
+        return MemoryThrottleBackend(clock=clock)
+    return RedisThrottleBackend(FakeRedis(), clock=clock)
+
+
+async def test_sliding_window(backend, clock):
+    for _ in range(3):
+        assert await backend.hit("key", 3, WINDOW) == 0
+    # over the limit within the first window, free again when it ends
+    assert await backend.hit("key", 3, WINDOW) == WINDOW
+
+    # half way through the next window the previous one weighs half: 4 * 0.5
+    clock.now = START + WINDOW * 1.5
+    assert await backend.hit("key", 3, WINDOW) == 0
+    # 4 * 0.5 + 2 > 3 until the previous window weighs 1 / 4 at 45s
+    assert await backend.hit("key", 3, WINDOW) == pytest.approx(15)
+
+    clock.now = START + WINDOW * 3
+    assert await backend.hit("key", 3, WINDOW) == 0
+
+
+async def test_keys_are_counted_separately(backend):
+    assert await backend.hit("a", 1, WINDOW) == 0
+    assert await backend.hit("b", 1, WINDOW) == 0
+    assert await backend.hit("a", 1, WINDOW) > 0
+
+
+async def test_reset(backend, clock):
+    await backend.hit("key", 1, WINDOW)
+    clock.now = START + WINDOW + 1
+    await backend.hit("key", 1, WINDOW)
+
+    await backend.reset("key", WINDOW)
+
+    assert await backend.hit("key", 1, WINDOW) == 0
+
+
+async def test_memory_backend_keeps_max_keys(clock):
+    backend = MemoryThrottleBackend(max_keys=2, clock=clock)
+    await backend.hit("a", 1, WINDOW)
+    await backend.hit("b", 1, WINDOW)
+    await backend.hit("c", 1, WINDOW)
+
+    # the least recently used key was dropped
+    assert await backend.hit("a", 1, WINDOW) == 0
+    assert await backend.hit("c", 1, WINDOW) > 0
+
+
+@pytest.fixture
+def throttle(clock):
+    return LoginThrottle(
+        MemoryThrottleBackend(clock=clock), username_limit=2, ip_limit=3, window=WINDOW
+    )
+
+
+async def check_rejected(throttle: LoginThrottle, username: str, ip: str) -> str:
+    with pytest.raises(BackendException) as error:
+        await throttle.check(username, ip)
+    assert error.value.code == 429
+    return error.value.headers["Retry-After"]
+
+
+async def test_username_limit(throttle):
+    await throttle.check("alice@example.com", "10.0.0.1")
+    await throttle.check("Alice@Example.com ", "10.0.0.2")
+
+    assert await check_rejected(throttle, "alice@example.com", "10.0.0.3") == "60"
+    await throttle.check("bob@example.com", "10.0.0.1")
+
+
+async def test_ip_limit(throttle):
+    for idx in range(3):
+        await throttle.check(f"user{idx}@example.com", "10.0.0.1")
+
+    assert await check_rejected(throttle, "user3@example.com", "10.0.0.1") == "60"
+    await throttle.check("user3@example.com", "10.0.0.2")
+
+
+async def test_retry_after_is_rounded_up(throttle, clock):
+    await throttle.check("alice@example.com")
+    await throttle.check("alice@example.com")
+    clock.now = START + 0.5
+
+    assert await check_rejected(throttle, "alice@example.com", None) == "60"
+
+
+async def test_reset_after_success(throttle):
+    await throttle.check("alice@example.com")
+    await throttle.check("alice@example.com")
+
+    await throttle.reset("alice@example.com")
+
+    await throttle.check("alice@example.com")
+    await throttle.check("alice@example.com")
+
+
+async def test_login_route_is_throttled(client, admin):
+    credentials = {"username": "admin@example.com", "password": "wrong"}
+    try:
+        for _ in range(login_throttle.username_limit - 1):
+            response = await client.post("/api/v1/auth/login", data=credentials)
+            assert response.status_code == 401
+
+        # a successful login clears the failures before it
+        response = await client.post(
+            "/api/v1/auth/login", data={**credentials, "password": "password"}
+        )
+        assert response.status_code == 200
+
+        for _ in range(login_throttle.username_limit):
+            response = await client.post("/api/v1/auth/login", data=credentials)
+            assert response.status_code == 401
+
+        response = await client.post("/api/v1/auth/login", data=credentials)
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) > 0
+    finally:
+        await login_throttle.reset("admin@example.com")
+
+
+def test_prod_refuses_several_workers_with_memory_counters(monkeypatch):
+    monkeypatch.setattr(settings, "THROTTLE_BACKEND", "memory")
+
+    result = CliRunner().invoke(server_cli, ["prod", "--workers", "2"])
+
+    assert result.exit_code == 1
+    assert "THROTTLE_BACKEND=redis" in result.output
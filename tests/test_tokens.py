@@ -0,0 +1,156 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from project.models import RefreshToken, RevokedToken, User
+from project.repositories.auth import RefreshTokenRepository, RevokedTokenRepository
+from project.config import settings
+from project.core.exceptions import BackendException
+from project.schemas.auth import AccessToken
+from project.services import auth
+from project.services.auth import AuthService, purge_expired_tokens
+from project.utils.jwts import RevocationList, TokenCache, now, to_jwt_token
+
+pytestmark = pytest.mark.anyio
+
+
+async def login(client) -> dict:
+    response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": "admin@example.com", "password": "password"},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def refresh(client, token: str):
+    return await client.post("/api/v1/auth/refresh", json={"refresh_token": token})
+
+
+async def me(client, tokens: dict) -> int:
+    response = await client.get(
+        "/api/v1/users/me",
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+    return response.status_code
+
+
+@pytest.fixture
+def auth_state(monkeypatch):
+    monkeypatch.setattr(auth, "access_token_cache", TokenCache())
+    monkeypatch.setattr(auth, "revoked_tokens", RevocationList())
+    return auth.access_token_cache, auth.revoked_tokens
+
+
+@pytest.mark.parametrize("revoked", ["jti", "sid"])
+async def test_revocation_bypasses_cached_decode(auth_state, revoked):
+    cache, revoked_tokens = auth_state
+    payload = AccessToken(
+        sub=str(uuid.uuid4()),
+        email="user@example.com",
+        role="user",
+        aud=settings.ACCESS_TOKEN_AUDIENCE,
+        expires_in=60,
+        jti=str(uuid.uuid4()),
+        sid=str(uuid.uuid4()),
+    )
+    token = to_jwt_token(payload)
+    service = AuthService(None, None, None, None)  # type: ignore
+
+    assert service.decode_token(token).jti == payload.jti
+    assert service.decode_token(token).jti == payload.jti
+    assert cache.stats()["hits"] == 1
+
+    revoked_tokens.add(getattr(payload, revoked), now().timestamp() + 60)
+    with pytest.raises(BackendException) as error:
+        service.decode_token(token)
+    assert error.value.code == 401
+    assert cache.stats()["hits"] == 2
+
+
+async def test_refresh_rotates_the_pair(client, admin):
+    first = await login(client)
+
+    response = await refresh(client, first["refresh_token"])
+    assert response.status_code == 200
+    second = response.json()
+    assert second["refresh_token"] != first["refresh_token"]
+    assert await me(client, second) == 200
+
+    response = await refresh(client, second["refresh_token"])
+    assert response.status_code == 200
+
+
+async def test_reused_refresh_token_revokes_the_session(client, admin):
+    first = await login(client)
+    second = (await refresh(client, first["refresh_token"])).json()
+    other_session = await login(client)
+
+    # the spent token comes back: the whole session ends
+    response = await refresh(client, first["refresh_token"])
+    assert response.status_code == 401
+
+    assert (await refresh(client, second["refresh_token"])).status_code == 401
+    assert await me(client, second) == 401
+    assert await me(client, first) == 401
+
+    assert await me(client, other_session) == 200
+    assert (await refresh(client, other_session["refresh_token"])).status_code == 200
+
+
+async def test_reuse_revocation_is_committed(client, admin, session):
+    first = await login(client)
+    await refresh(client, first["refresh_token"])
+    await refresh(client, first["refresh_token"])
+
+    # only the admin fixture's own session is left
+    live = select(func.count()).where(RefreshToken.revoked_at.is_(None))
+    assert await session.scalar(live) == 1
+    assert await session.scalar(select(func.count()).select_from(RevokedToken)) == 1
+
+
+async def test_logout_revokes_the_session(client, admin):
+    tokens = await login(client)
+
+    response = await client.post(
+        "/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 204
+
+    assert (await refresh(client, tokens["refresh_token"])).status_code == 401
+    assert await me(client, tokens) == 401
+
+
+async def test_purge_expired_tokens(admin, session):
+    user_id = await session.scalar(select(User.id))
+    current = now()
+    session.add_all(
+        [
+            RefreshToken(
+                family_id=uuid.uuid4(),
+                user_id=user_id,
+                expires_at=current - timedelta(seconds=1),
+            ),
+            RefreshToken(
+                family_id=uuid.uuid4(),
+                user_id=user_id,
+                expires_at=current + timedelta(days=1),
+                revoked_at=current,
+            ),
+            RevokedToken(id=uuid.uuid4(), expires_at=current - timedelta(seconds=1)),
+            RevokedToken(id=uuid.uuid4(), expires_at=current + timedelta(minutes=5)),
+        ]
+    )
+    await session.commit()
+    # the admin fixture's login left one live refresh token
+    assert await session.scalar(select(func.count()).select_from(RefreshToken)) == 3
+
+    purged = await purge_expired_tokens(
+        RefreshTokenRepository(session), RevokedTokenRepository(session)
+    )
+
+    assert purged == 2
+    assert await session.scalar(select(func.count()).select_from(RefreshToken)) == 2
+    assert await session.scalar(select(func.count()).select_from(RevokedToken)) == 1